@@ -0,0 +1,112 @@
+"""
+Benchmark de la búsqueda con el índice invertido: construcción del índice, consultas
+(exacta, sin mayúsculas y por prefijo), buscar siguiente/anterior desde el cursor,
+reemplazar todo (con su deshacer) y la conciliación del índice después de teclear.
+
+Uso: python -m benchmarks.busqueda [--palabras 1000000] [--vocabulario 50000] [--consultas 200]
+Las palabras siguen una distribución de Zipf sobre el vocabulario (como un texto real:
+pocas palabras muy frecuentes y muchas raras), con algunas en mayúscula y con signos.
+"""
+import argparse
+import gc
+import json
+import random
+import time
+from typing import Callable, Dict, List
+from src.composite.documento import Documento
+from src.composite.parrafo import parrafo_desde_palabras
+from src.editor_consola import EditorConsola
+from benchmarks.sinteticos import palabras_aleatorias, ubicar_cursor
+
+
+def _ms(funcion: Callable[[], object]) -> float:
+    gc.disable()
+    try:
+        inicio = time.perf_counter()
+        funcion()
+        return (time.perf_counter() - inicio) * 1000
+    finally:
+        gc.enable()
+
+
+def _percentil(valores: List[float], percentil: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * percentil / 100))]
+
+
+def documento_zipf(cantidad: int, vocabulario: List[str], ancho: int, semilla: int = 11) -> Documento:
+    """Documento de 'cantidad' palabras tomadas del vocabulario con frecuencias de Zipf."""
+    azar = random.Random(semilla)
+    pesos = [1 / rango for rango in range(1, len(vocabulario) + 1)]
+    palabras = azar.choices(vocabulario, weights=pesos, k=cantidad)
+    for i in range(0, cantidad, 7):
+        palabras[i] = palabras[i].capitalize()
+    for i in range(3, cantidad, 11):
+        palabras[i] += ","
+    documento = Documento()
+    for i in range(0, cantidad, 200):
+        documento.agregar_parrafo(parrafo_desde_palabras(palabras[i:i + 200], ancho))
+    documento.actualizar_paginas()
+    return documento
+
+
+def medir_busqueda(cantidad: int, tamanio_vocabulario: int, ancho: int, consultas: int) -> Dict[str, float]:
+    vocabulario = palabras_aleatorias(tamanio_vocabulario, semilla=3)
+    editor = EditorConsola(ancho_linea=ancho)
+    editor.usar_documento(documento_zipf(cantidad, vocabulario, ancho))
+    documento = editor.documento
+    resultados: Dict[str, float] = {"construccion_indice_ms": _ms(documento.indice_palabras)}
+    indice = documento.indice_palabras()
+
+    azar = random.Random(5)
+    # Consultas repartidas entre palabras frecuentes, intermedias y raras
+    muestras = [vocabulario[min(len(vocabulario) - 1, int(azar.paretovariate(0.5)) - 1)] for _ in range(consultas)]
+    modos = {"exacta": (False, False), "sin_mayusculas": (False, True), "prefijo": (True, True)}
+    for nombre, (prefijo, ignorar) in modos.items():
+        consultas_modo = [q[:3] for q in muestras] if prefijo else muestras
+        tiempos = [_ms(lambda: indice.contar(q, prefijo, ignorar)) for q in consultas_modo]
+        resultados[f"contar_{nombre}_p50_ms"] = _percentil(tiempos, 50)
+        resultados[f"contar_{nombre}_p95_ms"] = _percentil(tiempos, 95)
+
+    ubicar_cursor(editor, "medio")
+    for nombre, atras in (("siguiente", False), ("anterior", True)):
+        tiempos = [_ms(lambda: editor.buscar(q, ignorar_mayusculas=True, hacia_atras=atras)) for q in muestras]
+        resultados[f"buscar_{nombre}_p50_ms"] = _percentil(tiempos, 50)
+        resultados[f"buscar_{nombre}_p95_ms"] = _percentil(tiempos, 95)
+
+    # Tecleo con el índice vivo: el costo de mantenerlo se paga en la consulta siguiente
+    ubicar_cursor(editor, "medio")
+    editor.cancelar_seleccion() # La última búsqueda dejó su coincidencia seleccionada
+    for caracter in "abc def ghi ":
+        editor.insertar_caracter(caracter)
+    resultados["conciliar_tras_teclear_ms"] = _ms(indice.actualizar)
+
+    frecuente = vocabulario[0]
+    resultados["ocurrencias_frecuente"] = indice.contar(frecuente, ignorar_mayusculas=True)
+    resultados["reemplazar_todo_ms"] = _ms(lambda: editor.reemplazar_todo(frecuente, "REEMPLAZO",
+                                                                          ignorar_mayusculas=True))
+    resultados["deshacer_reemplazo_ms"] = _ms(editor.deshacer)
+    resultados["conciliar_tras_reemplazo_ms"] = _ms(indice.actualizar)
+    return resultados
+
+
+def main() -> None:
+    analizador = argparse.ArgumentParser(description="Búsqueda con el índice invertido de palabras.")
+    analizador.add_argument("--palabras", type=int, default=1_000_000)
+    analizador.add_argument("--vocabulario", type=int, default=50_000)
+    analizador.add_argument("--ancho", type=int, default=80)
+    analizador.add_argument("--consultas", type=int, default=200)
+    analizador.add_argument("--salida", help="archivo JSON donde escribir los resultados")
+    opciones = analizador.parse_args()
+
+    resultados = medir_busqueda(opciones.palabras, opciones.vocabulario, opciones.ancho, opciones.consultas)
+    print(f"📊 {opciones.palabras} palabras, vocabulario de {opciones.vocabulario}")
+    for metrica, valor in resultados.items():
+        print(f"   {metrica:<30} {valor:10.3f}" if metrica.endswith("_ms") else f"   {metrica:<30} {valor:10.0f}")
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as salida:
+            json.dump(resultados, salida, indent=2)
+
+
+if __name__ == "__main__":
+    main()
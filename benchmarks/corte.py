@@ -0,0 +1,88 @@
+"""
+Benchmark del corte de líneas: primer ajuste contra corte óptimo (mínima irregularidad) en un
+párrafo grande. Mide el reflow completo, la latencia por tecla (edición + reflow incremental
++ paginación) con el cursor al inicio, en el medio y al final del párrafo, y la irregularidad
+del resultado (suma de los cuadrados del espacio libre de cada línea, salvo la última).
+
+Uso: python -m benchmarks.corte [--palabras 10000] [--ancho 80] [--teclas 200] [--presupuesto 16]
+"""
+import argparse
+import gc
+import json
+import time
+from typing import Dict, List
+from src.composite.parrafo import Parrafo
+from src.editor_consola import EditorConsola, ESTRATEGIAS_CORTE
+from benchmarks.sinteticos import documento_sintetico
+
+# Posición del cursor en el párrafo (fracción de sus palabras) para medir el tecleo
+POSICIONES = {"inicio": 0.01, "medio": 0.5, "fin": 0.99}
+
+
+def _ms(funcion) -> float:
+    gc.disable()
+    try:
+        inicio = time.perf_counter()
+        funcion()
+        return (time.perf_counter() - inicio) * 1000
+    finally:
+        gc.enable()
+
+
+def irregularidad(parrafo: Parrafo) -> int:
+    """Suma de los cuadrados del espacio libre de cada línea (sin la última)."""
+    total = 0
+    for linea in parrafo.hijos[:-1]:
+        libre = parrafo.ancho_linea - len(" ".join(p.texto for p in linea.hijos if p.texto))
+        total += max(0, libre) ** 2
+    return total
+
+
+def medir_corte(nombre: str, cantidad: int, ancho: int, teclas: int) -> Dict[str, float]:
+    """Un párrafo de 'cantidad' palabras con el corte indicado: reflow, tecleo e irregularidad."""
+    documento = documento_sintetico(cantidad, ancho, palabras_por_parrafo=cantidad, maquetar=False)
+    parrafo = documento.parrafos[0]
+    parrafo.cambiar_corte(ESTRATEGIAS_CORTE[nombre])
+    resultados = {"reflow_completo_ms": _ms(documento.actualizar_paginas),
+                  "irregularidad": irregularidad(parrafo), "lineas": len(parrafo.hijos)}
+
+    editor = EditorConsola(ancho_linea=ancho)
+    editor.usar_documento(documento)
+    texto = "abcdefg "
+    for zona, fraccion in POSICIONES.items():
+        palabras = [p for p in parrafo.palabras() if p.texto]
+        palabra = palabras[int(len(palabras) * fraccion)]
+        editor.cursor.mover_a(palabra, len(palabra.texto))
+        tiempos = sorted(_ms(lambda: editor.insertar_caracter(texto[i % len(texto)])) for i in range(teclas))
+        resultados[f"tecla_{zona}_p50_ms"] = tiempos[len(tiempos) // 2]
+        resultados[f"tecla_{zona}_p95_ms"] = tiempos[min(len(tiempos) - 1, len(tiempos) * 95 // 100)]
+    return resultados
+
+
+def main() -> None:
+    analizador = argparse.ArgumentParser(description="Primer ajuste contra corte óptimo de líneas.")
+    analizador.add_argument("--palabras", type=int, default=10_000, help="palabras del párrafo")
+    analizador.add_argument("--ancho", type=int, default=80)
+    analizador.add_argument("--teclas", type=int, default=200, help="teclas medidas en cada posición")
+    analizador.add_argument("--presupuesto", type=float, default=16.0, help="ms por tecla (p95)")
+    analizador.add_argument("--salida", help="archivo JSON donde escribir los resultados")
+    opciones = analizador.parse_args()
+
+    print(f"📊 Párrafo de {opciones.palabras} palabras, ancho {opciones.ancho}")
+    resultados: Dict[str, Dict[str, float]] = {}
+    for nombre in ESTRATEGIAS_CORTE:
+        medicion = resultados[nombre] = medir_corte(nombre, opciones.palabras, opciones.ancho, opciones.teclas)
+        peor = max(medicion[f"tecla_{zona}_p95_ms"] for zona in POSICIONES)
+        teclas: List[str] = [f"{zona} {medicion[f'tecla_{zona}_p50_ms']:.2f}/{medicion[f'tecla_{zona}_p95_ms']:.2f}"
+                             for zona in POSICIONES]
+        estado = "✅" if peor <= opciones.presupuesto else "⚠️"
+        print(f"   {nombre:<14} reflow {medicion['reflow_completo_ms']:8.1f} ms | "
+              f"tecla p50/p95 ms: {', '.join(teclas)} {estado} | "
+              f"{medicion['lineas']:.0f} líneas, irregularidad {medicion['irregularidad']:.0f}")
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as salida:
+            json.dump(resultados, salida, indent=2)
+
+
+if __name__ == "__main__":
+    main()
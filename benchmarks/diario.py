@@ -0,0 +1,137 @@
+"""
+Benchmark del diario de recuperación: cuánto le agrega a cada tecla, cuánto cuesta escribir
+un grupo de teclas con su fsync, recuperar la sesión y compactar.
+
+Uso: python -m benchmarks.diario [--palabras 100000] [--teclas 2000] [--dir /tmp]
+- Latencia por tecla (edición + vista) sin diario y con diario (el grupo se codifica al escribirlo).
+- sincronizar: codificar el grupo con las teclas de un intervalo (--teclas-por-grupo) y
+  escribirlo con fsync en el ejecutor.
+- Recuperar: abrir la base y reaplicar todas las teclas del diario.
+- Compactar: la pausa del bucle para tomar la instantánea y la escritura en segundo plano.
+"""
+import argparse
+import asyncio
+import gc
+import glob
+import json
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List
+from src.diario import abrir_diario
+from src.editor_consola import EditorConsola
+from benchmarks.sinteticos import documento_sintetico, ubicar_cursor
+
+ALTO_VIEWPORT = 40
+TEXTO = "abcdefg " # Palabras cortas: el espacio también se mide
+
+
+def _ms(funcion: Callable[[], object]) -> float:
+    gc.disable()
+    try:
+        inicio = time.perf_counter()
+        funcion()
+        return (time.perf_counter() - inicio) * 1000
+    finally:
+        gc.enable()
+
+
+def _percentil(valores: List[float], percentil: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * percentil / 100))]
+
+
+def _teclear(editor: EditorConsola, teclas: int) -> List[float]:
+    tiempos = []
+    for i in range(teclas):
+        caracter = TEXTO[i % len(TEXTO)]
+        tiempos.append(_ms(lambda: (editor.insertar_caracter(caracter), editor.lineas_documento(alto=ALTO_VIEWPORT))))
+    return tiempos
+
+
+def _editor_abierto(ruta: str, ancho: int) -> EditorConsola:
+    editor = EditorConsola(ancho_linea=ancho)
+    editor.abrir(ruta)
+    ubicar_cursor(editor, "inicio")
+    editor.lineas_documento(alto=ALTO_VIEWPORT)
+    return editor
+
+
+async def medir(directorio: str, palabras: int, teclas: int, por_grupo: int, ancho: int) -> Dict[str, float]:
+    base = os.path.join(directorio, "diario_base.edb")
+    prefijo = os.path.join(directorio, "diario_bench.diario")
+    for ruta in glob.glob(glob.escape(prefijo) + "*"):
+        os.remove(ruta)
+    creador = EditorConsola(ancho_linea=ancho)
+    creador.usar_documento(documento_sintetico(palabras, ancho))
+    creador.guardar(base)
+    resultados: Dict[str, float] = {}
+
+    tiempos = _teclear(_editor_abierto(base, ancho), teclas)
+    resultados["tecla_sin_diario_p50_ms"] = _percentil(tiempos, 50)
+    resultados["tecla_sin_diario_p95_ms"] = _percentil(tiempos, 95)
+
+    editor = EditorConsola(ancho_linea=ancho)
+    diario, _ = abrir_diario(editor, base, prefijo)
+    ubicar_cursor(editor, "inicio")
+    editor.lineas_documento(alto=ALTO_VIEWPORT)
+    tiempos, escrituras = [], []
+    for inicio in range(0, teclas, por_grupo):
+        tiempos.extend(_teclear(editor, min(por_grupo, teclas - inicio)))
+        instante = time.perf_counter()
+        await diario.sincronizar()
+        escrituras.append((time.perf_counter() - instante) * 1000)
+    resultados["tecla_con_diario_p50_ms"] = _percentil(tiempos, 50)
+    resultados["tecla_con_diario_p95_ms"] = _percentil(tiempos, 95)
+    resultados["sincronizar_p50_ms"] = _percentil(escrituras, 50)
+    resultados["sincronizar_p95_ms"] = _percentil(escrituras, 95)
+    resultados["bytes_por_tecla"] = diario._bytes_segmento / teclas
+    # Corte sin cerrar: el diario queda como lo dejaría un proceso terminado a la fuerza
+    diario._archivo.close()
+
+    recuperado = EditorConsola(ancho_linea=ancho)
+    inicio = time.perf_counter()
+    diario, grupos = abrir_diario(recuperado, base, prefijo)
+    resultados["recuperar_ms"] = (time.perf_counter() - inicio) * 1000
+    resultados["grupos_recuperados"] = grupos
+
+    recuperado.documento.cargar_todo()
+    diario.umbral_compactacion = 0
+    inicio = time.perf_counter()
+    recuperado.insertar_caracter("x")
+    await diario.sincronizar() # Escribe una tecla y, con el umbral en 0, compacta
+    resultados["compactar_pausa_ms"] = (time.perf_counter() - inicio) * 1000
+    if diario._compactacion is not None:
+        await diario._compactacion
+    resultados["compactar_total_ms"] = (time.perf_counter() - inicio) * 1000
+    diario.umbral_compactacion = 1 << 62
+    await diario.cerrar()
+    recuperado.documento.diario = None
+    for ruta in glob.glob(glob.escape(prefijo) + "*") + [base]:
+        os.remove(ruta)
+    return resultados
+
+
+def main() -> None:
+    analizador = argparse.ArgumentParser(description="Costo del diario de recuperación.")
+    analizador.add_argument("--palabras", type=int, default=100_000)
+    analizador.add_argument("--teclas", type=int, default=2000)
+    analizador.add_argument("--teclas-por-grupo", type=int, default=20,
+                            help="teclas entre escrituras (unas 0,2 s de tecleo rápido)")
+    analizador.add_argument("--ancho", type=int, default=80)
+    analizador.add_argument("--dir", default=tempfile.gettempdir(), help="directorio para los archivos temporales")
+    analizador.add_argument("--salida", help="archivo JSON donde escribir los resultados")
+    opciones = analizador.parse_args()
+
+    resultados = asyncio.run(medir(opciones.dir, opciones.palabras, opciones.teclas,
+                                   opciones.teclas_por_grupo, opciones.ancho))
+    print(f"📊 {opciones.palabras} palabras, {opciones.teclas} teclas de a {opciones.teclas_por_grupo}")
+    for metrica, valor in resultados.items():
+        print(f"   {metrica:<30} {valor:10.3f}")
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as salida:
+            json.dump(resultados, salida, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark de la exportación a texto paginado, Markdown y HTML.
+
+Uso: python -m benchmarks.exportacion [--megabytes 50] [--palabras 200000] [--dir /tmp]
+- Rendimiento (MB/s de texto de entrada) de cada formato sobre un archivo de --megabytes MB
+  abierto sin cargar y sobre un documento de --palabras palabras cargado en memoria.
+- Pico de memoria (tracemalloc) al exportar un archivo de un cuarto del tamaño y del tamaño
+  completo: con la memoria acotada los dos picos son parecidos.
+- En segundo plano, mientras se teclea: la pausa más larga del bucle de eventos (la
+  instantánea se toma en el hilo del editor) y la duración total.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict
+from src.editor_consola import EditorConsola
+from src.exportacion import exportar_archivo, exportar_en_segundo_plano
+from src.strategy.exportacion_strategy import FORMATOS_EXPORTACION
+from benchmarks.formato import escribir_texto_grande
+from benchmarks.sinteticos import documento_sintetico, ubicar_cursor
+
+
+def _segundos(funcion: Callable[[], object]) -> float:
+    gc.collect()
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def medir_archivo(directorio: str, megabytes: int, ancho: int) -> Dict[str, float]:
+    texto = os.path.join(directorio, "exportacion.txt")
+    salida = os.path.join(directorio, "exportacion.salida")
+    tamanio = escribir_texto_grande(texto, megabytes) / 2**20
+    resultados: Dict[str, float] = {}
+    for formato in FORMATOS_EXPORTACION:
+        segundos = _segundos(lambda: exportar_archivo(texto, salida, formato, ancho))
+        resultados[f"archivo_{formato}_mb_s"] = tamanio / segundos
+        resultados[f"archivo_{formato}_salida_mb"] = os.path.getsize(salida) / 2**20
+
+    chico = os.path.join(directorio, "exportacion_chico.txt")
+    escribir_texto_grande(chico, max(1, megabytes // 4))
+    for nombre, ruta in (("cuarto", chico), ("completo", texto)):
+        tracemalloc.start()
+        exportar_archivo(ruta, salida, "html", ancho)
+        resultados[f"memoria_pico_{nombre}_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    for ruta in (texto, chico, salida):
+        os.remove(ruta)
+    return resultados
+
+
+def medir_cargado(directorio: str, palabras: int, ancho: int) -> Dict[str, float]:
+    salida = os.path.join(directorio, "exportacion.salida")
+    editor = EditorConsola(ancho_linea=ancho)
+    editor.usar_documento(documento_sintetico(palabras, ancho))
+    tamanio = sum(len(p.texto) + 1 for parrafo in editor.documento.parrafos for p in parrafo.palabras()) / 2**20
+    resultados: Dict[str, float] = {}
+    for formato in FORMATOS_EXPORTACION:
+        resultados[f"cargado_{formato}_mb_s"] = tamanio / _segundos(lambda: editor.exportar(salida, formato))
+    os.remove(salida)
+    return resultados
+
+
+async def _medir_segundo_plano(editor: EditorConsola, salida: str) -> Dict[str, float]:
+    pausas = []
+    terminado = False
+
+    async def teclear():
+        ultimo = time.perf_counter()
+        while not terminado:
+            editor.insertar_caracter("a")
+            await asyncio.sleep(0.001)
+            ahora = time.perf_counter()
+            pausas.append(ahora - ultimo)
+            ultimo = ahora
+
+    tecleo = asyncio.create_task(teclear())
+    inicio = time.perf_counter()
+    await exportar_en_segundo_plano(editor.documento, salida, "html", editor.ancho_linea)
+    total = time.perf_counter() - inicio
+    terminado = True
+    await tecleo
+    return {"segundo_plano_total_ms": total * 1000, "segundo_plano_pausa_max_ms": max(pausas) * 1000,
+            "segundo_plano_teclas": len(pausas)}
+
+
+def medir_segundo_plano(directorio: str, palabras: int, ancho: int) -> Dict[str, float]:
+    salida = os.path.join(directorio, "exportacion_fondo.html")
+    editor = EditorConsola(ancho_linea=ancho)
+    editor.usar_documento(documento_sintetico(palabras, ancho))
+    ubicar_cursor(editor, "medio")
+    resultados = asyncio.run(_medir_segundo_plano(editor, salida))
+    os.remove(salida)
+    return resultados
+
+
+def main() -> None:
+    analizador = argparse.ArgumentParser(description="Rendimiento y memoria de la exportación.")
+    analizador.add_argument("--megabytes", type=int, default=50)
+    analizador.add_argument("--palabras", type=int, default=200_000)
+    analizador.add_argument("--ancho", type=int, default=80)
+    analizador.add_argument("--dir", default=tempfile.gettempdir(), help="directorio para los archivos temporales")
+    analizador.add_argument("--salida", help="archivo JSON donde escribir los resultados")
+    opciones = analizador.parse_args()
+
+    resultados = medir_archivo(opciones.dir, opciones.megabytes, opciones.ancho)
+    resultados.update(medir_cargado(opciones.dir, opciones.palabras, opciones.ancho))
+    resultados.update(medir_segundo_plano(opciones.dir, opciones.palabras, opciones.ancho))
+    print(f"📊 {opciones.megabytes} MB de texto, {opciones.palabras} palabras cargadas")
+    for metrica, valor in resultados.items():
+        print(f"   {metrica:<30} {valor:10.2f}")
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as salida:
+            json.dump(resultados, salida, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark del formato binario: guardar y abrir un documento grande.
+
+Uso: python -m benchmarks.formato [--megabytes 100] [--palabras-cargadas 1000000] [--dir /tmp]
+- Texto -> binario y binario -> binario sin cargar el documento (la copia en bloque desde el mapa).
+- Abrir el binario (hasta la primera página) y volver a guardarlo: la ida y vuelta.
+- Un documento de --palabras-cargadas palabras construido en memoria: guardarlo y volver a
+  cargarlo entero con las líneas guardadas (sin reflow) y sin ellas (con reflow).
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Dict
+from src.editor_consola import EditorConsola
+from benchmarks.sinteticos import documento_sintetico, palabras_aleatorias
+
+
+def _ms(funcion: Callable[[], object]) -> float:
+    gc.collect()
+    gc.disable()
+    try:
+        inicio = time.perf_counter()
+        funcion()
+        return (time.perf_counter() - inicio) * 1000
+    finally:
+        gc.enable()
+
+
+def escribir_texto_grande(ruta: str, megabytes: int, semilla: int = 5) -> int:
+    """Archivo de texto de ~megabytes MB (párrafos de 20 a 400 palabras). Retorna los bytes."""
+    azar = random.Random(semilla)
+    vocabulario = palabras_aleatorias(20_000, semilla=semilla)
+    bloque = "\n\n".join(" ".join(azar.choices(vocabulario, k=azar.randint(20, 400))) for _ in range(500))
+    datos = (bloque + "\n\n").encode("utf-8")
+    with open(ruta, "wb") as salida:
+        for _ in range(max(1, megabytes * 1024 * 1024 // len(datos))):
+            salida.write(datos)
+    return os.path.getsize(ruta)
+
+
+def medir_archivo(directorio: str, megabytes: int, ancho: int) -> Dict[str, float]:
+    texto = os.path.join(directorio, "formato.txt")
+    binario = os.path.join(directorio, "formato.edb")
+    copia = os.path.join(directorio, "formato_copia.edb")
+    resultados: Dict[str, float] = {"megabytes_texto": escribir_texto_grande(texto, megabytes) / 2**20}
+
+    editor = EditorConsola(ancho_linea=ancho)
+    resultados["abrir_texto_ms"] = _ms(lambda: editor.abrir(texto))
+    resultados["texto_a_binario_ms"] = _ms(lambda: editor.guardar(binario))
+    resultados["megabytes_binario"] = os.path.getsize(binario) / 2**20
+
+    abierto = EditorConsola(ancho_linea=ancho)
+    resultados["abrir_binario_ms"] = _ms(lambda: abierto.abrir(binario))
+    resultados["binario_a_binario_ms"] = _ms(lambda: abierto.guardar(copia))
+    resultados["ida_y_vuelta_ms"] = resultados["abrir_binario_ms"] + resultados["binario_a_binario_ms"]
+    for ruta in (texto, binario, copia):
+        os.remove(ruta)
+    return resultados
+
+
+def medir_cargado(directorio: str, cantidad: int, ancho: int) -> Dict[str, float]:
+    ruta = os.path.join(directorio, "cargado.edb")
+    editor = EditorConsola(ancho_linea=ancho)
+    editor.usar_documento(documento_sintetico(cantidad, ancho))
+    resultados: Dict[str, float] = {}
+    for nombre, con_cortes in (("con_lineas", True), ("sin_lineas", False)):
+        resultados[f"guardar_{nombre}_ms"] = _ms(lambda: editor.guardar(ruta, con_cortes))
+        otro = EditorConsola(ancho_linea=ancho)
+
+        def cargar_todo():
+            otro.abrir(ruta)
+            otro.documento.cargar_todo()
+            for parrafo in otro.documento.parrafos:
+                parrafo.aplicar_reflow()
+            otro.documento.actualizar_paginas()
+        resultados[f"cargar_todo_{nombre}_ms"] = _ms(cargar_todo)
+    os.remove(ruta)
+    return resultados
+
+
+def main() -> None:
+    analizador = argparse.ArgumentParser(description="Guardar y abrir en el formato binario.")
+    analizador.add_argument("--megabytes", type=int, default=100)
+    analizador.add_argument("--palabras-cargadas", type=int, default=1_000_000)
+    analizador.add_argument("--ancho", type=int, default=80)
+    analizador.add_argument("--dir", default=tempfile.gettempdir(), help="directorio para los archivos temporales")
+    analizador.add_argument("--salida", help="archivo JSON donde escribir los resultados")
+    opciones = analizador.parse_args()
+
+    resultados = medir_archivo(opciones.dir, opciones.megabytes, opciones.ancho)
+    resultados.update(medir_cargado(opciones.dir, opciones.palabras_cargadas, opciones.ancho))
+    print(f"📊 {opciones.megabytes} MB de texto, {opciones.palabras_cargadas} palabras cargadas")
+    for metrica, valor in resultados.items():
+        print(f"   {metrica:<30} {valor:10.1f}")
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as salida:
+            json.dump(resultados, salida, indent=2)
+
+
+if __name__ == "__main__":
+    main()
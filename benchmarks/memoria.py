@@ -0,0 +1,85 @@
+"""
+Benchmark de memoria: bytes por palabra de un documento construido con el modelo del editor.
+
+Uso: python -m benchmarks.memoria [--palabras N] [--tecleadas N] [--ancho N]
+Se mide un documento cargado y uno tecleado carácter a carácter, este último sin y con el
+historial de deshacer, y se comparan con las cifras del modelo anterior (ver ANTES).
+"""
+import argparse
+import gc
+import tracemalloc
+from typing import Tuple
+from src.command.invoke import CommandInvoker
+from src.composite.documento import Documento
+from src.composite.parrafo import parrafo_desde_palabras
+from src.editor_consola import EditorConsola
+from benchmarks.sinteticos import palabras_aleatorias
+
+# Bytes por palabra del modelo previo a la serie de optimizaciones (commit "baseline"),
+# medidos con este mismo procedimiento: 200000 palabras cargadas y 2000 tecleadas (ese modelo
+# rehace el reflow y la paginación de todo el documento en cada tecla). Su historial no tenía
+# límite y guardaba un comando por carácter.
+ANTES = {
+    "cargado": 119.3,
+    "tecleado": 167.1,
+    "tecleado_historial": 3241.6,
+}
+
+
+def medir_documento(cantidad: int, ancho: int, palabras_por_parrafo: int = 200) -> float:
+    """Bytes por palabra de un documento cargado (párrafos construidos y paginados)."""
+    palabras = palabras_aleatorias(cantidad)
+    tracemalloc.start()
+    documento = Documento()
+    for i in range(0, cantidad, palabras_por_parrafo):
+        documento.agregar_parrafo(parrafo_desde_palabras(palabras[i:i + palabras_por_parrafo], ancho))
+    documento.actualizar_paginas()
+    usados, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # El texto de las palabras se crea antes de medir: se cuenta solo la estructura
+    return usados / cantidad
+
+
+def medir_edicion(cantidad: int, ancho: int) -> Tuple[float, float]:
+    """
+    Bytes por palabra de un documento tecleado carácter a carácter: (sin historial, con
+    historial). El primero se mide tras descartar el historial de deshacer.
+    """
+    texto = " ".join(palabras_aleatorias(cantidad))
+    tracemalloc.start()
+    editor = EditorConsola(ancho_linea=ancho)
+    for caracter in texto:
+        editor.insertar_caracter(caracter)
+    con_historial, _ = tracemalloc.get_traced_memory()
+    editor.invoker = CommandInvoker()
+    gc.collect()
+    sin_historial, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sin_historial / cantidad, con_historial / cantidad
+
+
+def main():
+    analizador = argparse.ArgumentParser(description="Bytes por palabra del modelo del documento.")
+    analizador.add_argument("--palabras", type=int, default=200_000, help="palabras del documento cargado")
+    analizador.add_argument("--tecleadas", type=int, default=2000, help="palabras del documento tecleado")
+    analizador.add_argument("--ancho", type=int, default=80)
+    opciones = analizador.parse_args()
+
+    tecleado, tecleado_historial = medir_edicion(opciones.tecleadas, opciones.ancho)
+    ahora = {
+        "cargado": medir_documento(opciones.palabras, opciones.ancho),
+        "tecleado": tecleado,
+        "tecleado_historial": tecleado_historial,
+    }
+    titulos = {
+        "cargado": f"Documento cargado ({opciones.palabras} palabras)",
+        "tecleado": f"Documento tecleado ({opciones.tecleadas} palabras)",
+        "tecleado_historial": "  con historial de deshacer",
+    }
+    print(f"📊 {'bytes/palabra':<38} {'antes':>9} {'ahora':>9}")
+    for clave, titulo in titulos.items():
+        print(f"   {titulo:<38} {ANTES[clave]:>9.1f} {ahora[clave]:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
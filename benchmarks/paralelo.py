@@ -0,0 +1,47 @@
+"""
+Benchmark del maquetado masivo en paralelo: reflow completo, paginación y render de todas
+las líneas de un documento sintético, en este proceso y repartido entre N procesos.
+
+Uso: python -m benchmarks.paralelo [--palabras 1000000] [--procesos 1,2,4,8] [--ancho 80]
+La aceleración se informa respecto del maquetado en un solo proceso (sin pool).
+"""
+import argparse
+import os
+import time
+from src.maquetado_paralelo import MaquetadorParalelo
+from src.render.cache_lineas import CACHE_RENDER
+from benchmarks.sinteticos import documento_sintetico
+
+
+def maquetar_y_renderizar(cantidad: int, ancho: int, maquetador=None) -> float:
+    """Segundos para maquetar (reflow + paginación) y renderizar un documento sin maquetar."""
+    documento = documento_sintetico(cantidad, ancho, maquetar=False)
+    documento.maquetador = maquetador
+    CACHE_RENDER.limpiar()
+    inicio = time.perf_counter()
+    documento.actualizar_paginas()
+    documento.mostrar()
+    return time.perf_counter() - inicio
+
+
+def main() -> None:
+    analizador = argparse.ArgumentParser(description="Escalado del maquetado masivo en paralelo.")
+    analizador.add_argument("--palabras", type=int, default=1_000_000)
+    analizador.add_argument("--procesos", default="1,2,4,8", help="cantidades de procesos separadas por coma")
+    analizador.add_argument("--ancho", type=int, default=80)
+    opciones = analizador.parse_args()
+
+    print(f"📊 {opciones.palabras} palabras | {os.cpu_count()} núcleos disponibles")
+    base = maquetar_y_renderizar(opciones.palabras, opciones.ancho)
+    print(f"   secuencial: {base:.2f} s")
+    for procesos in [int(p) for p in opciones.procesos.split(",") if p]:
+        with MaquetadorParalelo(procesos=procesos, umbral=0) as maquetador:
+            maquetar_y_renderizar(1000, opciones.ancho, maquetador) # Arranca el pool fuera de la medición
+            segundos = maquetar_y_renderizar(opciones.palabras, opciones.ancho, maquetador)
+        aceleracion = base / segundos
+        print(f"   {procesos:>2} procesos: {segundos:.2f} s | aceleración x{aceleracion:.2f} | "
+              f"eficiencia {aceleracion / procesos:.0%}")
+
+
+if __name__ == "__main__":
+    main()
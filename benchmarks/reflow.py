@@ -0,0 +1,113 @@
+"""
+Comprobación del reflow incremental contra el reflow completo, con ediciones aleatorias.
+
+Uso: python -m benchmarks.reflow [--semillas 20] [--ediciones 400] [--ancho 30]
+Para cada estrategia de corte y cada semilla se edita un documento sintético con una
+secuencia aleatoria (letras, espacios, palabras más largas que el ancho, borrados, saltos
+del cursor, deshacer y rehacer). Tras cada edición, el maquetado que dejó el reflow
+incremental de cada párrafo se compara con el de aplicar_reflow(completo=True) sobre las
+mismas palabras. Las selecciones (borrar o reemplazar por texto con saltos de párrafo)
+cubren el empalme de rangos de InsertarTextoCommand. También se informa el tiempo medio de ambos. El proceso termina con
+código 1 si algún maquetado difiere.
+"""
+import argparse
+import random
+import sys
+import time
+from typing import Dict, List, Tuple
+from src.composite.parrafo import Parrafo
+from src.editor_consola import EditorConsola, ESTRATEGIAS_CORTE
+from benchmarks.sinteticos import documento_sintetico
+
+LETRAS = "abcdefghij"
+
+
+def maquetado(parrafo: Parrafo) -> List[Tuple[str, ...]]:
+    """
+    Texto de las palabras de cada línea. Las palabras vacías (donde espera el cursor) no se
+    muestran y el reflow completo las descarta o las vuelve a crear: no se comparan, pero una
+    línea que solo tiene una vacía sigue contando como línea.
+    """
+    return [tuple(palabra.texto for palabra in linea.hijos if palabra.texto) for linea in parrafo.hijos]
+
+
+def editar(editor: EditorConsola, azar: random.Random) -> None:
+    """Una edición aleatoria en el cursor (o un salto del cursor a otra palabra, o una selección)."""
+    r = azar.random()
+    if r < 0.45:
+        editor.insertar_caracter(azar.choice(LETRAS))
+    elif r < 0.60:
+        editor.insertar_caracter(" ")
+    elif r < 0.65:
+        editor.insertar_texto(azar.choice(LETRAS) * (editor.ancho_linea + azar.randint(1, 10)))
+    elif r < 0.80:
+        editor.eliminar_caracter()
+    elif r < 0.84:
+        palabras = [p for p in azar.choice(editor.documento.parrafos).palabras() if p.texto]
+        if palabras:
+            palabra = azar.choice(palabras)
+            editor.cursor.mover_a(palabra, azar.randint(0, len(palabra.texto)))
+    elif r < 0.88:
+        # Selección desde el cursor hasta una palabra de su párrafo o del siguiente
+        parrafos = editor.documento.parrafos
+        indice = editor.current_parrafo().indice + azar.randint(0, 1)
+        palabras = [p for p in parrafos[min(indice, len(parrafos) - 1)].palabras() if p.texto]
+        if palabras:
+            editor.iniciar_seleccion()
+            palabra = azar.choice(palabras)
+            editor.cursor.mover_a(palabra, azar.randint(0, len(palabra.texto)))
+            editor.reemplazar_seleccion(azar.choice(["", "", "ab cd", "ab\n\ncd ef", " gh\n\n"]))
+    elif r < 0.95:
+        editor.deshacer()
+    else:
+        editor.rehacer()
+
+
+def comprobar(corte: str, semilla: int, ediciones: int, ancho: int) -> Dict[str, float]:
+    azar = random.Random(semilla)
+    editor = EditorConsola(ancho_linea=ancho)
+    editor.usar_documento(documento_sintetico(600, ancho, palabras_por_parrafo=150))
+    editor.cambiar_corte(corte)
+    for parrafo in editor.documento.parrafos:
+        parrafo.cambiar_corte(ESTRATEGIAS_CORTE[corte])
+        parrafo.aplicar_reflow(completo=True)
+    diferencias, incremental, completo = 0, 0.0, 0.0
+    for _ in range(ediciones):
+        inicio = time.perf_counter()
+        editar(editor, azar)
+        incremental += time.perf_counter() - inicio
+        for parrafo in editor.documento.parrafos:
+            previo = maquetado(parrafo)
+            inicio = time.perf_counter()
+            parrafo.aplicar_reflow(completo=True)
+            completo += time.perf_counter() - inicio
+            if maquetado(parrafo) != previo:
+                diferencias += 1
+    return {"diferencias": diferencias, "edicion_ms": incremental * 1000 / ediciones,
+            "reflow_completo_ms": completo * 1000 / ediciones}
+
+
+def main() -> None:
+    analizador = argparse.ArgumentParser(description="Reflow incremental contra reflow completo.")
+    analizador.add_argument("--semillas", type=int, default=20)
+    analizador.add_argument("--ediciones", type=int, default=400, help="ediciones por semilla")
+    analizador.add_argument("--ancho", type=int, default=30)
+    opciones = analizador.parse_args()
+
+    fallos = 0
+    for corte in ESTRATEGIAS_CORTE:
+        mediciones = [comprobar(corte, semilla, opciones.ediciones, opciones.ancho)
+                      for semilla in range(opciones.semillas)]
+        diferencias = sum(m["diferencias"] for m in mediciones)
+        edicion = sum(m["edicion_ms"] for m in mediciones) / len(mediciones)
+        completo = sum(m["reflow_completo_ms"] for m in mediciones) / len(mediciones)
+        fallos += diferencias
+        estado = "✅" if diferencias == 0 else "❌"
+        print(f"   {corte:<14} {opciones.semillas} semillas x {opciones.ediciones} ediciones: "
+              f"{diferencias} diferencias {estado} | edición {edicion:.3f} ms, "
+              f"reflow completo del documento {completo:.3f} ms")
+    sys.exit(1 if fallos else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Documentos sintéticos y reproducibles (semilla fija) para los benchmarks.
+"""
+import random
+from typing import List
+from src.composite.documento import Documento
+from src.composite.parrafo import parrafo_desde_palabras
+from src.editor_consola import EditorConsola
+
+# Zonas del documento donde se ubica el cursor para medir
+ZONAS = ("inicio", "medio", "fin")
+
+
+def palabras_aleatorias(cantidad: int, semilla: int = 7) -> List[str]:
+    azar = random.Random(semilla)
+    return ["".join(azar.choice("abcdefghij") for _ in range(azar.randint(1, 10))) for _ in range(cantidad)]
+
+
+def documento_sintetico(cantidad: int, ancho: int, palabras_por_parrafo: int = 200,
+                        maquetar: bool = True) -> Documento:
+    """
+    Documento de 'cantidad' palabras en párrafos de palabras_por_parrafo palabras.
+    Con maquetar=True queda con reflow y paginación hechos; si no, los párrafos quedan
+    en una sola línea (para medir el reflow y la paginación por separado).
+    """
+    palabras = palabras_aleatorias(cantidad)
+    documento = Documento()
+    for i in range(0, cantidad, palabras_por_parrafo):
+        documento.agregar_parrafo(parrafo_desde_palabras(palabras[i:i + palabras_por_parrafo], ancho))
+    if maquetar:
+        documento.actualizar_paginas()
+    return documento
+
+
+def ubicar_cursor(editor: EditorConsola, zona: str) -> None:
+    """
+    Pone el cursor al final de una palabra central del primer párrafo, del párrafo del
+    medio o del último párrafo (de los cargados) según la zona.
+    """
+    parrafos = editor.documento.parrafos
+    parrafo = {"inicio": parrafos[0], "medio": parrafos[len(parrafos) // 2], "fin": parrafos[-1]}[zona]
+    palabras = [p for p in parrafo.palabras() if p.texto] or parrafo.palabras()
+    palabra = palabras[len(palabras) // 2]
+    editor.cursor.mover_a(palabra, len(palabra.texto))
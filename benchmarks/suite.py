@@ -0,0 +1,244 @@
+"""
+Suite de benchmarks de los caminos críticos del editor: tecleo (al inicio, en el medio y al
+final del documento), reflow completo, paginación, render completo y del viewport, cada
+estrategia de alineación y deshacer/rehacer. Usa documentos sintéticos reproducibles.
+
+Uso: python -m benchmarks.suite [--palabras 1000,100000,1000000] [--salida resultados.json]
+                                [--base base.json] [--umbral 0.25]
+Las métricas terminadas en _ms son tiempos (menos es mejor) y las terminadas en _ops son
+operaciones por segundo (más es mejor). Con --base se comparan con un resultado guardado
+y el proceso termina con código 1 si alguna métrica empeoró más que el umbral.
+
+benchmarks/base.json es la base versionada, generada con
+    python -m benchmarks.suite --palabras 1000,100000 --salida benchmarks/base.json
+y se compara con
+    python -m benchmarks.suite --palabras 1000,100000 --base benchmarks/base.json
+Los tiempos dependen de la máquina (la base registra Python y plataforma): antes de comparar
+en otra máquina conviene regenerarla ahí, sobre el commit de referencia, con el mismo comando.
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+from src.composite.documento import Documento
+from src.editor_consola import EditorConsola, ESTRATEGIAS_ALINEACION
+from src.render.cache_lineas import CACHE_RENDER
+from benchmarks.sinteticos import ZONAS, documento_sintetico, ubicar_cursor
+
+# Filas del documento en el viewport (un frame típico de terminal)
+ALTO_VIEWPORT = 40
+VERSION_FORMATO = 1
+# Veces que se deshace y rehace todo el historial medido (se toma la mejor)
+CICLOS_DESHACER = 3
+
+
+def _cronometrar(funcion: Callable[[], object]) -> float:
+    """Milisegundos de una llamada, sin recolector de basura durante la medición."""
+    gc.disable()
+    try:
+        inicio = time.perf_counter()
+        funcion()
+        return (time.perf_counter() - inicio) * 1000
+    finally:
+        gc.enable()
+
+
+def _mejor(funcion: Callable[[], object], veces: int) -> float:
+    """El menor tiempo de varias llamadas: descarta interferencias del sistema."""
+    return min(_cronometrar(funcion) for _ in range(max(1, veces)))
+
+
+def _percentil(valores: List[float], percentil: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * percentil / 100))]
+
+
+def medir_maquetado(documento: Documento) -> Dict[str, float]:
+    """Reflow completo de todos los párrafos y paginación completa (documento sin maquetar)."""
+    def reflow():
+        for parrafo in documento.parrafos:
+            parrafo.aplicar_reflow(completo=True)
+    return {
+        "reflow_completo_ms": _cronometrar(reflow),
+        # Los párrafos ya están maquetados: actualizar_paginas solo pagina
+        "paginacion_completa_ms": _cronometrar(documento.actualizar_paginas),
+    }
+
+
+def medir_render(editor: EditorConsola, repeticiones: int) -> Dict[str, float]:
+    """Render del documento completo (sin cachés y con cachés) y del viewport."""
+    documento = editor.documento
+    CACHE_RENDER.limpiar()
+    for parrafo in documento.parrafos:
+        for linea in parrafo.hijos:
+            linea.version += 1 # Invalida el render guardado en cada línea
+    frio = _cronometrar(documento.mostrar)
+    caliente = _mejor(documento.mostrar, repeticiones // 10)
+    editor.lineas_documento(alto=ALTO_VIEWPORT)
+    viewport = [_cronometrar(lambda: editor.lineas_documento(alto=ALTO_VIEWPORT)) for _ in range(repeticiones)]
+    return {
+        "render_completo_frio_ms": frio,
+        "render_completo_ms": caliente,
+        "render_viewport_p50_ms": _percentil(viewport, 50),
+    }
+
+
+def medir_alineaciones(documento: Documento, repeticiones: int, max_lineas: int = 20_000) -> Dict[str, float]:
+    """Cada Strategy sobre las mismas líneas (sin cachés): milisegundos cada 1000 líneas."""
+    lineas: List[List[str]] = []
+    for parrafo in documento.parrafos:
+        for linea in parrafo.hijos:
+            lineas.append([p.texto for p in linea.hijos if p.texto])
+        if len(lineas) >= max_lineas:
+            break
+    ancho = documento.parrafos[0].ancho_linea
+    resultados = {}
+    for nombre, estrategia in ESTRATEGIAS_ALINEACION.items():
+        def alinear():
+            for palabras in lineas:
+                estrategia.aplicar_alineacion(palabras, ancho)
+        resultados[f"alinear_{nombre}_1k_lineas_ms"] = _mejor(alinear, repeticiones // 10) * 1000 / len(lineas)
+    return resultados
+
+
+def medir_tecleo(editor: EditorConsola, teclas: int) -> Dict[str, float]:
+    """
+    Latencia por tecla (edición + reflow + paginación + filas del viewport) con el cursor
+    al inicio, en el medio y al final del documento.
+    """
+    texto = "abcdefg " # Palabras cortas: el espacio también se mide
+    resultados = {}
+    for zona in ZONAS:
+        ubicar_cursor(editor, zona)
+        editor.lineas_documento(alto=ALTO_VIEWPORT)
+        tiempos = []
+        for i in range(teclas):
+            caracter = texto[i % len(texto)]
+            tiempos.append(_cronometrar(lambda: (editor.insertar_caracter(caracter),
+                                                 editor.lineas_documento(alto=ALTO_VIEWPORT))))
+        resultados[f"tecla_{zona}_p50_ms"] = _percentil(tiempos, 50)
+        resultados[f"tecla_{zona}_p95_ms"] = _percentil(tiempos, 95)
+    return resultados
+
+
+def medir_deshacer(editor: EditorConsola, operaciones: int) -> Dict[str, float]:
+    """Comandos deshechos y rehechos por segundo (cada uno con su reflow y paginación)."""
+    documento = editor.documento
+    parrafo = documento.parrafos[len(documento.parrafos) // 2]
+    palabra = parrafo.palabras()[0]
+    editor.cursor.mover_a(palabra, len(palabra.texto))
+    for _ in range(operaciones):
+        # Cada letra va en una palabra nueva: no se fusiona con la anterior
+        editor.insertar_caracter(" ")
+        editor.insertar_caracter("z")
+    deshacer, rehacer = [], []
+    for _ in range(CICLOS_DESHACER):
+        deshacer.append(_cronometrar(lambda: [editor.deshacer() for _ in range(operaciones)]))
+        rehacer.append(_cronometrar(lambda: [editor.rehacer() for _ in range(operaciones)]))
+    deshacer, rehacer = min(deshacer), min(rehacer)
+    return {
+        "deshacer_ops": operaciones / (deshacer / 1000),
+        "rehacer_ops": operaciones / (rehacer / 1000),
+    }
+
+
+def ejecutar_suite(cantidad: int, ancho: int, teclas: int, repeticiones: int) -> Dict[str, float]:
+    """Todas las mediciones sobre un documento sintético de 'cantidad' palabras."""
+    inicio = time.perf_counter()
+    documento = documento_sintetico(cantidad, ancho, maquetar=False)
+    resultados = {"construccion_ms": (time.perf_counter() - inicio) * 1000}
+    resultados.update(medir_maquetado(documento))
+
+    editor = EditorConsola(ancho_linea=ancho)
+    editor.usar_documento(documento)
+    resultados.update(medir_render(editor, repeticiones))
+    resultados.update(medir_alineaciones(documento, repeticiones))
+    resultados.update(medir_tecleo(editor, teclas))
+    resultados.update(medir_deshacer(editor, teclas))
+    return resultados
+
+
+def comparar(actual: Dict[str, Dict[str, float]], base: Dict[str, Dict[str, float]],
+             umbral: float, minimo_ms: float) -> List[str]:
+    """
+    Compara métrica a métrica y retorna las regresiones (empeoran más que 'umbral').
+    Las diferencias menores a minimo_ms se ignoran: en tiempos muy chicos son ruido.
+    """
+    regresiones = []
+    for tamanio, metricas in actual.items():
+        for nombre, valor in metricas.items():
+            previo = base.get(tamanio, {}).get(nombre)
+            if previo is None or previo <= 0 or valor <= 0:
+                continue
+            if nombre.endswith("_ops"):
+                cambio = previo / valor - 1 # Menos operaciones por segundo es peor
+            else:
+                cambio = valor / previo - 1
+                if abs(valor - previo) < minimo_ms:
+                    cambio = 0.0
+            marca = "⚠️ " if cambio > umbral else "   "
+            print(f"{marca}{tamanio:>8} {nombre:<32} {previo:12.3f} -> {valor:12.3f} ({cambio:+.1%})")
+            if cambio > umbral:
+                regresiones.append(f"{tamanio}/{nombre}")
+    return regresiones
+
+
+def main() -> int:
+    analizador = argparse.ArgumentParser(description="Benchmarks de los caminos críticos del editor.")
+    analizador.add_argument("--palabras", default="1000,100000,1000000",
+                            help="tamaños de documento separados por coma")
+    analizador.add_argument("--ancho", type=int, default=80)
+    analizador.add_argument("--teclas", type=int, default=200, help="teclas (y comandos) medidos por zona")
+    analizador.add_argument("--repeticiones", type=int, default=50)
+    analizador.add_argument("--salida", help="archivo JSON donde escribir los resultados")
+    analizador.add_argument("--base", help="resultados JSON guardados contra los que comparar")
+    analizador.add_argument("--umbral", type=float, default=0.25,
+                            help="empeoramiento relativo tolerado (0.25 = 25%%)")
+    analizador.add_argument("--minimo-ms", type=float, default=0.05,
+                            help="diferencia absoluta mínima (ms) para considerar un cambio")
+    opciones = analizador.parse_args()
+
+    tamanios = [int(t) for t in opciones.palabras.split(",") if t]
+    resultados: Dict[str, Dict[str, float]] = {}
+    for cantidad in tamanios:
+        print(f"📊 {cantidad} palabras...", file=sys.stderr)
+        resultados[str(cantidad)] = ejecutar_suite(cantidad, opciones.ancho, opciones.teclas,
+                                                   opciones.repeticiones)
+
+    informe = {
+        "version": VERSION_FORMATO,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": {"ancho": opciones.ancho, "teclas": opciones.teclas,
+                       "repeticiones": opciones.repeticiones},
+        "resultados": resultados,
+    }
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as salida:
+            json.dump(informe, salida, indent=2, ensure_ascii=False)
+
+    if not opciones.base:
+        for tamanio, metricas in resultados.items():
+            for nombre, valor in metricas.items():
+                print(f"{tamanio:>8} {nombre:<32} {valor:12.3f}")
+        return 0
+
+    with open(opciones.base, encoding="utf-8") as archivo:
+        base = json.load(archivo)
+    if base.get("parametros") != informe["parametros"]:
+        print("⚠️ La base se midió con otros parámetros: la comparación puede no ser válida.")
+    regresiones = comparar(resultados, base.get("resultados", {}), opciones.umbral, opciones.minimo_ms)
+    if regresiones:
+        print(f"❌ {len(regresiones)} regresiones: {', '.join(regresiones)}")
+        return 1
+    print("✅ Sin regresiones respecto de la base.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
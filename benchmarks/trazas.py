@@ -0,0 +1,240 @@
+"""
+Trazas de teclado para medir la latencia de punta a punta (acción -> frame) con sesiones
+realistas: ráfagas de tecleo, borrados largos, tormentas de deshacer y cambios de alineación.
+
+Uso: python -m benchmarks.trazas generar SALIDA [--perfil mixto] [--eventos 5000] [--semilla 1]
+     python -m benchmarks.trazas reproducir TRAZA [--archivo F | --palabras N] [--posicion medio]
+                                 [--tiempo-real] [--velocidad 1.0] [--render nulo|ninguno]
+                                 [--salida informe.json]
+Las sesiones reales se graban con: python -m src archivo.txt --grabar sesion.traza
+Sin --tiempo-real cada evento se aplica y se dibuja solo, lo más rápido posible (mide el
+costo por evento); con --tiempo-real los eventos llegan a su ritmo desde otro hilo, como
+desde el hook de teclado, y se agrupan en frames con PlanificadorFrames.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from src.editor_consola import EditorConsola
+from src.instrumentacion import Histograma
+from src.planificador import PlanificadorFrames
+from src.render.pantalla import RenderizadorDiferencial
+from src.traza import EventoTraza, escribir_traza, leer_traza
+from benchmarks.sinteticos import ZONAS, documento_sintetico, palabras_aleatorias, ubicar_cursor
+
+# Filas del frame fuera del documento (estadísticas y bordes): la terminal nula es más alta
+FILAS_EXTRA = 8
+
+
+class PerfilTecleo:
+    """Parámetros de una sesión de tecleo sintética (tiempos en segundos)."""
+    def __init__(self, pulsaciones_por_segundo: float = 8.0,
+                 prob_pausa: float = 0.05, pausa: Tuple[float, float] = (0.5, 2.0),
+                 prob_borrado: float = 0.05, rafaga_borrado: Tuple[int, int] = (1, 8),
+                 prob_deshacer: float = 0.01, rafaga_deshacer: Tuple[int, int] = (1, 10),
+                 prob_alinear: float = 0.005, repeticion: float = 0.033):
+        self.pulsaciones_por_segundo = pulsaciones_por_segundo
+        self.prob_pausa = prob_pausa # Después de cada palabra
+        self.pausa = pausa
+        self.prob_borrado = prob_borrado # Por palabra: ráfaga de retrocesos
+        self.rafaga_borrado = rafaga_borrado
+        self.prob_deshacer = prob_deshacer # Por palabra: ráfaga de Ctrl+Z (y algunos Ctrl+Y)
+        self.rafaga_deshacer = rafaga_deshacer
+        self.prob_alinear = prob_alinear
+        self.repeticion = repeticion # Separación de una tecla mantenida (autorepetición)
+
+
+PERFILES: Dict[str, PerfilTecleo] = {
+    "constante": PerfilTecleo(pulsaciones_por_segundo=6.0, prob_borrado=0.02, rafaga_borrado=(1, 2),
+                              prob_deshacer=0.0, prob_alinear=0.0),
+    "rafagas": PerfilTecleo(pulsaciones_por_segundo=15.0, prob_pausa=0.2, pausa=(1.0, 4.0)),
+    "correccion": PerfilTecleo(prob_borrado=0.25, rafaga_borrado=(3, 25)),
+    "deshacer": PerfilTecleo(prob_deshacer=0.08, rafaga_deshacer=(5, 40)),
+    "mixto": PerfilTecleo(prob_borrado=0.08, rafaga_borrado=(1, 10), prob_deshacer=0.02,
+                          rafaga_deshacer=(1, 15), prob_alinear=0.01),
+}
+
+
+def generar_traza(perfil: PerfilTecleo, cantidad: int, semilla: int = 1) -> List[EventoTraza]:
+    """Traza sintética reproducible de 'cantidad' eventos con el perfil indicado."""
+    azar = random.Random(semilla)
+    vocabulario = palabras_aleatorias(500, semilla)
+    eventos: List[EventoTraza] = []
+    instante = 0.0
+
+    def emitir(tipo: str, dato: str = "", demora: Optional[float] = None):
+        nonlocal instante
+        instante += demora if demora is not None else azar.expovariate(perfil.pulsaciones_por_segundo)
+        eventos.append((round(instante, 6), tipo, dato))
+
+    while len(eventos) < cantidad:
+        sorteo = azar.random()
+        if sorteo < perfil.prob_deshacer:
+            veces = azar.randint(*perfil.rafaga_deshacer)
+            for _ in range(veces):
+                emitir("deshacer", demora=perfil.repeticion)
+            for _ in range(azar.randint(0, veces)):
+                emitir("rehacer", demora=perfil.repeticion)
+        elif sorteo < perfil.prob_deshacer + perfil.prob_alinear:
+            emitir("alinear")
+        elif sorteo < perfil.prob_deshacer + perfil.prob_alinear + perfil.prob_borrado:
+            for _ in range(azar.randint(*perfil.rafaga_borrado)):
+                emitir("borrar", demora=perfil.repeticion)
+        else:
+            for caracter in azar.choice(vocabulario):
+                emitir("texto", caracter)
+            emitir("texto", " ")
+            if azar.random() < perfil.prob_pausa:
+                instante += azar.uniform(*perfil.pausa)
+    return eventos[:cantidad]
+
+
+class ReproductorTraza:
+    """
+    Reproduce una traza sobre un EditorConsola sin teclado ni terminal. Con render "nulo"
+    cada frame arma las filas del documento y las pasa por el renderizador diferencial
+    hacia os.devnull; con "ninguno" solo se completa el maquetado diferido.
+    """
+    def __init__(self, editor: EditorConsola, render: str = "nulo", alto: int = 40):
+        self.editor = editor
+        self.alto = alto
+        self._renderizador: Optional[RenderizadorDiferencial] = None
+        if render == "nulo":
+            self._renderizador = RenderizadorDiferencial(salida=open(os.devnull, "wb"), alto=alto + FILAS_EXTRA)
+
+    def dibujar(self) -> None:
+        if self._renderizador is None:
+            self.editor.documento.actualizar_paginas()
+        else:
+            self._renderizador.dibujar(self.editor.lineas_documento(alto=self.alto))
+
+    def reproducir_rapido(self, eventos: List[EventoTraza]) -> Dict[str, float]:
+        """Cada evento es un frame (aplicar + dibujar) y se encadenan sin esperas."""
+        self.dibujar()
+        latencias = Histograma(max(1, len(eventos)))
+        inicio = time.perf_counter()
+        for _, tipo, dato in eventos:
+            antes = time.perf_counter()
+            self.editor.aplicar_acciones([(tipo, dato)])
+            self.dibujar()
+            latencias.agregar((time.perf_counter() - antes) * 1000)
+        return _informe(latencias, time.perf_counter() - inicio, len(eventos))
+
+    def reproducir_tiempo_real(self, eventos: List[EventoTraza], velocidad: float = 1.0,
+                               fps: float = 60.0) -> Dict[str, float]:
+        """Los eventos llegan a su ritmo (dividido por 'velocidad') y se procesan por frames."""
+        return asyncio.run(self._tiempo_real(eventos, velocidad, fps))
+
+    async def _tiempo_real(self, eventos: List[EventoTraza], velocidad: float, fps: float) -> Dict[str, float]:
+        self.dibujar()
+        latencias = Histograma(max(1, len(eventos)))
+        if not eventos:
+            return _informe(latencias, 0.0, 0)
+        terminado = asyncio.Event()
+
+        def observar(llegadas: List[float], fin: float):
+            for llegada in llegadas:
+                latencias.agregar((fin - llegada) * 1000)
+            if latencias.cantidad >= len(eventos):
+                terminado.set()
+
+        planificador = PlanificadorFrames(self.editor.aplicar_acciones, self.dibujar, fps, observador=observar)
+        planificador.conectar(asyncio.get_running_loop())
+        consumidor = asyncio.create_task(planificador.ejecutar())
+
+        def producir():
+            # Hilo aparte, como el hook de teclado: encola aunque el bucle esté dibujando
+            origen, base = time.perf_counter(), eventos[0][0]
+            for instante, tipo, dato in eventos:
+                espera = origen + (instante - base) / velocidad - time.perf_counter()
+                if espera > 0:
+                    time.sleep(espera)
+                planificador.encolar((tipo, dato))
+
+        inicio = time.perf_counter()
+        threading.Thread(target=producir, daemon=True).start()
+        await terminado.wait()
+        segundos = time.perf_counter() - inicio
+        consumidor.cancel()
+        await asyncio.gather(consumidor, return_exceptions=True)
+        return _informe(latencias, segundos, planificador.frames)
+
+
+def _informe(latencias: Histograma, segundos: float, frames: int) -> Dict[str, float]:
+    resumen = latencias.resumen()
+    return {
+        "eventos": latencias.cantidad,
+        "frames": frames,
+        "segundos": segundos,
+        "eventos_por_segundo": latencias.cantidad / segundos if segundos > 0 else 0.0,
+        "latencia_p50_ms": resumen["p50"],
+        "latencia_p95_ms": resumen["p95"],
+        "latencia_p99_ms": resumen["p99"],
+        "latencia_maxima_ms": resumen["maximo"],
+    }
+
+
+def main() -> int:
+    analizador = argparse.ArgumentParser(description="Genera y reproduce trazas de teclado.")
+    subcomandos = analizador.add_subparsers(dest="comando", required=True)
+
+    generar = subcomandos.add_parser("generar", help="genera una traza sintética")
+    generar.add_argument("salida")
+    generar.add_argument("--perfil", choices=list(PERFILES), default="mixto")
+    generar.add_argument("--eventos", type=int, default=5000)
+    generar.add_argument("--semilla", type=int, default=1)
+
+    reproducir = subcomandos.add_parser("reproducir", help="reproduce una traza sin terminal")
+    reproducir.add_argument("traza")
+    documento = reproducir.add_mutually_exclusive_group()
+    documento.add_argument("--archivo", help="abre este archivo antes de reproducir")
+    documento.add_argument("--palabras", type=int, default=100_000,
+                           help="tamaño del documento sintético (por defecto 100000)")
+    reproducir.add_argument("--ancho", type=int, default=80)
+    reproducir.add_argument("--posicion", choices=ZONAS, default="inicio", help="dónde empieza el cursor")
+    reproducir.add_argument("--tiempo-real", action="store_true", help="respeta los instantes de la traza")
+    reproducir.add_argument("--velocidad", type=float, default=1.0, help="factor de aceleración en tiempo real")
+    reproducir.add_argument("--render", choices=["nulo", "ninguno"], default="nulo")
+    reproducir.add_argument("--alto", type=int, default=40, help="filas del documento en la terminal nula")
+    reproducir.add_argument("--salida", help="archivo JSON donde escribir el informe")
+    opciones = analizador.parse_args()
+
+    if opciones.comando == "generar":
+        cantidad = escribir_traza(opciones.salida,
+                                  generar_traza(PERFILES[opciones.perfil], opciones.eventos, opciones.semilla))
+        print(f"📝 {cantidad} eventos ({opciones.perfil}) en {opciones.salida}")
+        return 0
+
+    eventos = leer_traza(opciones.traza)
+    editor = EditorConsola(ancho_linea=opciones.ancho)
+    if opciones.archivo:
+        if not editor.abrir(opciones.archivo):
+            print(f"❌ {opciones.archivo} no tiene texto", file=sys.stderr)
+            return 1
+    else:
+        editor.usar_documento(documento_sintetico(opciones.palabras, opciones.ancho))
+    ubicar_cursor(editor, opciones.posicion)
+
+    reproductor = ReproductorTraza(editor, opciones.render, opciones.alto)
+    if opciones.tiempo_real:
+        informe = reproductor.reproducir_tiempo_real(eventos, opciones.velocidad)
+    else:
+        informe = reproductor.reproducir_rapido(eventos)
+
+    print(f"📊 {informe['eventos']} eventos en {informe['segundos']:.2f} s "
+          f"({informe['eventos_por_segundo']:.0f} eventos/s, {informe['frames']} frames) | "
+          f"Latencia p50 {informe['latencia_p50_ms']:.2f} ms, p95 {informe['latencia_p95_ms']:.2f} ms, "
+          f"p99 {informe['latencia_p99_ms']:.2f} ms, máx. {informe['latencia_maxima_ms']:.2f} ms")
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as salida:
+            json.dump(informe, salida, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,88 +1,84 @@
+import argparse
+import asyncio
 import os
 import sys
-import time
-import keyboard 
-from typing import List
+try:
+    import keyboard
+except ImportError: # Solo el editor interactivo lo necesita (no el subcomando 'formatear')
+    keyboard = None
+from typing import List, Optional, Tuple
 from .editor_consola import EditorConsola
-
-from .strategy.alineacion_strategy import (
-    AlineacionIzquierda, 
-    AlineacionCentrada, 
-    AlineacionDerecha, 
-    AlineacionJustificada,
-    IStrategyAlineacion
-)
+from .formato_binario import ruta_binaria
+from .planificador import PlanificadorFrames
+from .autoguardado import Autoguardado
+from .diario import Diario, abrir_diario
+from .exportacion import exportar_en_segundo_plano, main_exportar
+from .instrumentacion import INSTRUMENTACION
+from .traza import GrabadorTraza
+from .render.pantalla import RenderizadorDiferencial
+from .formateador import main_formatear
 
 ANCHO_CONSOLA: int = 80
 EDITOR_GLOBAL: EditorConsola = EditorConsola(ancho_linea=ANCHO_CONSOLA)
 
-def limpiar_consola() -> None:
-    if os.name == 'nt':
-        os.system('cls')
-    else:
-        os.system('clear')
+RENDERIZADOR: RenderizadorDiferencial = RenderizadorDiferencial()
+# Filas del frame que no son contenido del documento (encabezado, estadísticas y pie)
+FILAS_FIJAS: int = 18
 
 def dibujar_hoja() -> None:
-    limpiar_consola()
-    
+    """Arma el frame completo y lo entrega al renderizador, que solo reescribe las filas cambiadas."""
+    with INSTRUMENTACION.medir("frame"):
+        _dibujar_hoja()
+
+def _dibujar_hoja() -> None:
     estrategia = EDITOR_GLOBAL.alineacion_actual
     
-    print("="*ANCHO_CONSOLA)
-    print(" " * ((ANCHO_CONSOLA-30)//2) + "PROCESADOR DE TEXTO CONSOLA")
-    print("="*ANCHO_CONSOLA)
-    print(" COMANDOS RÁPIDOS: Ctrl+Z (Retroceder) | Ctrl+Y (Rehacer) | Ctrl+L (Formato) | Ctrl+S (Cerrar)")
-    print("="*ANCHO_CONSOLA)
+    filas: List[str] = []
+    filas.append("="*ANCHO_CONSOLA)
+    filas.append(" " * ((ANCHO_CONSOLA-30)//2) + "PROCESADOR DE TEXTO CONSOLA")
+    filas.append("="*ANCHO_CONSOLA)
+    # Atajos en dos filas: cada fila del frame debe entrar en una fila de una terminal de 80 columnas
+    filas.append(" Ctrl+Z Retroceder | Ctrl+Y Rehacer | Ctrl+S Guardar | Ctrl+E Exportar")
+    filas.append(" Ctrl+L Formato | Ctrl+K Corte | Ctrl+F/B Buscar | Ctrl+P Perfil | Ctrl+Q Salir")
+    filas.append("="*ANCHO_CONSOLA)
     
     nombre_estrategia = estrategia.__class__.__name__ 
     if nombre_estrategia.startswith("Alineacion"):
         nombre_estrategia = nombre_estrategia[10:]
         
-    print(f" Alineación actual: {nombre_estrategia.upper()}")
-    print("="*ANCHO_CONSOLA)
+    corte = "ÓPTIMO" if not EDITOR_GLOBAL.current_parrafo().corte.local else "PRIMER AJUSTE"
+    filas.append(f" Alineación actual: {nombre_estrategia.upper()} | Corte de líneas: {corte}")
+    filas.append("="*ANCHO_CONSOLA)
     
-    EDITOR_GLOBAL.mostrar_documento()
+    # El documento ocupa solo el alto libre de la terminal (el frame debe entrar sin scroll)
+    alto_documento = max(1, RENDERIZADOR.alto_terminal() - FILAS_FIJAS - 1)
+    with INSTRUMENTACION.medir("vista"):
+        filas.extend(EDITOR_GLOBAL.lineas_documento(alto=alto_documento))
     
-    print("\n" + "="*ANCHO_CONSOLA)
-    print("Comience a usar el editor cuando quiera...")
+    filas.append("")
+    filas.append("="*ANCHO_CONSOLA)
+    # Con la instrumentación activa la fila de ayuda muestra los tiempos por fase
+    filas.append(INSTRUMENTACION.fila_estado() if INSTRUMENTACION.activa
+                 else MENSAJE or "Comience a usar el editor cuando quiera...")
+    filas.append(f" Bytes escritos en el último frame: {RENDERIZADOR.bytes_ultimo_frame} | "
+                 f"Latencia p95: {PLANIFICADOR.latencia_percentil() * 1000:.1f} ms")
 
-def manejar_tecla(event) -> None:
-    
-    if event.event_type != keyboard.KEY_DOWN:
-        return
+    with INSTRUMENTACION.medir("terminal"):
+        RENDERIZADOR.dibujar(filas)
 
-    
-    if event.name == 'z' and keyboard.is_pressed('ctrl'):
-        EDITOR_GLOBAL.deshacer()
-        dibujar_hoja()
-        return
-
-    if event.name == 'y' and keyboard.is_pressed('ctrl'):
-        EDITOR_GLOBAL.rehacer()
-        dibujar_hoja()
-        return
-        
-    if event.name == 's' and keyboard.is_pressed('ctrl'):
-        print("\nGracias por usar nuestro editor. Vuelva pronto")
-        
-        keyboard.unhook_all()
-        
-        sys.stdout.flush()
-        
-        os._exit(0)
-        
-    
-    if event.name == 'l' and keyboard.is_pressed('ctrl'):
-        alineaciones = [AlineacionIzquierda(), AlineacionCentrada(), AlineacionDerecha(), AlineacionJustificada()]
-        estrategia_actual = EDITOR_GLOBAL.alineacion_actual
-        
-        estrategia_actual_index = next((i for i, a in enumerate(alineaciones) if type(a).__name__ == type(estrategia_actual).__name__), 0)
-        nueva_estrategia_nombre = alineaciones[(estrategia_actual_index + 1) % len(alineaciones)].__class__.__name__[10:].lower()
+def traducir_tecla(event) -> Optional[Tuple[str, str]]:
+    """
+    Convierte un evento de teclado en una acción (tipo, dato) para la cola de entrada, o None
+    si la tecla no hace nada. Corre en el hilo del hook: el estado de Ctrl se lee acá,
+    en el momento de la pulsación, y no cuando se aplica la acción.
+    """
+    if event.event_type != keyboard.KEY_DOWN:
+        return None
 
-        EDITOR_GLOBAL.cambiar_alineacion(nueva_estrategia_nombre)
-        dibujar_hoja()
-        return
+    if keyboard.is_pressed('ctrl'):
+        accion = ATAJOS_CTRL.get(event.name)
+        return (accion, "") if accion else None
 
-    
     if len(event.name) == 1 or event.name in ['space', 'enter']:
         char = event.name
         
@@ -91,31 +87,162 @@ def manejar_tecla(event) -> None:
         elif char == 'space':
             char = ' '
         
-        EDITOR_GLOBAL.insertar_caracter(char)
-        dibujar_hoja()
+        return ("texto", char)
+
+    if event.name == 'backspace':
+        return ("borrar", "")
+    return None
+
+ATAJOS_CTRL = {'z': "deshacer", 'y': "rehacer", 's': "guardar", 'e': "exportar", 'q': "salir", 'l': "alinear", 'k': "corte", 'f': "buscar", 'b': "buscar_atras", 'p': "perfil"}
+
+def manejar_tecla(event) -> None:
+    accion = traducir_tecla(event)
+    if accion is not None:
+        grabador = GRABADOR # Se lee una vez: el bucle principal lo anula al salir
+        if grabador is not None:
+            grabador.registrar(accion)
+        PLANIFICADOR.encolar(accion)
+
+def aplicar_acciones(acciones: List[Tuple[str, str]]) -> None:
+    """Aplica el lote de acciones de un frame (las del editor las resuelve EditorConsola)."""
+    EDITOR_GLOBAL.aplicar_acciones(acciones, aplicar_accion)
+
+def aplicar_accion(tipo: str) -> None:
+    """Acciones del bucle interactivo (no del documento)."""
+    global MENSAJE, EXPORTACION
+    if tipo == "salir":
+        # El cierre (tareas, autoguardado final, hook) lo hace ejecutar_editor
+        SALIR.set()
         return
 
-    
-    elif event.name == 'backspace':
-        EDITOR_GLOBAL.eliminar_caracter()
-        dibujar_hoja()
+    if tipo == "perfil":
+        INSTRUMENTACION.alternar()
+        return
+
+    if tipo == "guardar":
+        escritos = EDITOR_GLOBAL.guardar(RUTA_GUARDADO)
+        if DIARIO is not None:
+            DIARIO.guardado(RUTA_GUARDADO)
+        MENSAJE = f" 💾 Guardado en {RUTA_GUARDADO} ({escritos} bytes)"
+        return
+
+    if tipo == "exportar":
+        # Se exporta el documento de este momento en otro proceso; mientras, se sigue editando
+        if EXPORTACION is None or EXPORTACION.done():
+            EXPORTACION = asyncio.ensure_future(exportar_en_segundo_plano(
+                EDITOR_GLOBAL.documento, RUTA_EXPORTACION, "html", EDITOR_GLOBAL.ancho_linea))
+            EXPORTACION.add_done_callback(exportacion_terminada)
+            MENSAJE = f" ⏳ Exportando a {RUTA_EXPORTACION}..."
         return
 
-def main_live_editor():
+def exportacion_terminada(tarea: asyncio.Future) -> None:
+    global MENSAJE
+    if tarea.cancelled():
+        return
+    error = tarea.exception()
+    MENSAJE = (f" ⚠️ No se pudo exportar: {error}" if error is not None
+               else f" 📄 Exportado a {RUTA_EXPORTACION} ({tarea.result()} bytes)")
+    PLANIFICADOR.encolar(("redibujar", ""))
+
+# Las teclas se encolan desde el hook y se aplican de a lotes, a lo sumo un frame cada 1/60 s
+PLANIFICADOR: PlanificadorFrames = PlanificadorFrames(aplicar_acciones, dibujar_hoja)
+SALIR: Optional[asyncio.Event] = None
+# Con --grabar, cada acción del teclado se guarda con su instante (ver benchmarks/trazas.py)
+GRABADOR: Optional[GrabadorTraza] = None
+# Párrafos del archivo de origen que se indexan por paso en segundo plano (entre paso y paso
+# el bucle atiende teclas y frames)
+PARRAFOS_POR_PASO: int = 2000
+INTERVALO_AUTOGUARDADO: float = 30.0
+# Ctrl+S guarda en binario: en el mismo archivo si se abrió uno binario, si no en un .edb al lado
+RUTA_GUARDADO: str = ruta_binaria(None)
+# Aviso de la fila de ayuda (p. ej. el último guardado)
+MENSAJE: Optional[str] = None
+# Diario de recuperación: cada comando queda en disco (en grupos) y se reaplica al volver a abrir
+DIARIO: Optional[Diario] = None
+# Ctrl+E exporta a HTML junto al archivo abierto, en segundo plano
+RUTA_EXPORTACION: str = "documento.html"
+EXPORTACION: Optional[asyncio.Future] = None
+
+async def indexar_en_segundo_plano() -> None:
+    """Completa el índice del archivo abierto de a tramos, para que los totales sean exactos."""
+    while EDITOR_GLOBAL.documento.indexar_fuente(PARRAFOS_POR_PASO):
+        await asyncio.sleep(0)
+    PLANIFICADOR.encolar(("redibujar", "")) # Las estadísticas cambiaron
+
+def exportar_perfil(base: str) -> None:
+    """Escribe el resumen de la instrumentación (JSON) y la traza (formato de Chrome) junto al archivo."""
+    INSTRUMENTACION.exportar_json(base + ".perfil.json")
+    eventos = INSTRUMENTACION.exportar_chrome(base + ".traza.json")
+    print(f"\n📊 Perfil en {base}.perfil.json | Traza ({eventos} eventos) en {base}.traza.json")
+
+async def ejecutar_editor(ruta: Optional[str] = None, grabar: Optional[str] = None) -> None:
+    """
+    Bucle de eventos del editor: un solo hilo toca el documento. El hook de teclado solo
+    pasa acciones a la cola; los frames, el diario, el autoguardado y la indexación son
+    tareas, y las escrituras del diario y del autoguardado corren en un ejecutor.
+    """
+    global SALIR, GRABADOR, RUTA_GUARDADO, RUTA_EXPORTACION, DIARIO, MENSAJE
+    SALIR = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    PLANIFICADOR.conectar(loop)
+
+    # Abre 'ruta' o, si quedó un diario de una sesión anterior, la recupera
+    DIARIO, recuperados = abrir_diario(EDITOR_GLOBAL, ruta, (ruta if ruta is not None else "documento.txt") + ".diario")
+    if recuperados:
+        MENSAJE = f" ♻️ Sesión anterior recuperada del diario ({recuperados} grupos de cambios)"
+    RUTA_GUARDADO = ruta_binaria(ruta)
+    RUTA_EXPORTACION = os.path.splitext(ruta if ruta is not None else "documento.txt")[0] + ".html"
+    destino = (ruta if ruta is not None else "documento.txt") + ".autoguardado"
+    autoguardado = Autoguardado(EDITOR_GLOBAL, destino, INTERVALO_AUTOGUARDADO)
     
     EDITOR_GLOBAL.ensure_word_exists(0) 
     dibujar_hoja() 
-    
+
+    if grabar is not None:
+        GRABADOR = GrabadorTraza(grabar)
+    tareas = [asyncio.create_task(PLANIFICADOR.ejecutar()),
+              asyncio.create_task(autoguardado.ejecutar()),
+              asyncio.create_task(DIARIO.ejecutar()),
+              asyncio.create_task(indexar_en_segundo_plano())]
     keyboard.hook(manejar_tecla)
-    
     try:
-        while True:
-            time.sleep(0.1) 
+        await SALIR.wait()
+    finally:
+        keyboard.unhook_all()
+        if GRABADOR is not None:
+            GRABADOR.cerrar()
+            GRABADOR = None
+        for tarea in tareas:
+            tarea.cancel()
+        await asyncio.gather(*tareas, return_exceptions=True)
+        if EXPORTACION is not None:
+            await asyncio.gather(EXPORTACION, return_exceptions=True) # No dejar la exportación a medias
+        await DIARIO.cerrar()
+        await autoguardado.guardar()
+        if INSTRUMENTACION.hay_datos():
+            exportar_perfil(ruta if ruta is not None else "documento.txt")
+
+def main_live_editor(ruta: Optional[str] = None, grabar: Optional[str] = None):
+    if keyboard is None:
+        print("El editor interactivo requiere el paquete 'keyboard' (pip install keyboard).", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        asyncio.run(ejecutar_editor(ruta, grabar))
+        print("\nGracias por usar nuestro editor. Vuelva pronto")
     except KeyboardInterrupt:
         print("\nSaliendo por interrupción (Ctrl+C).")
-        keyboard.unhook_all()
-        sys.exit(0)
+    sys.stdout.flush()
 
 
 if __name__ == '__main__':
-    main_live_editor()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == 'formatear':
+        sys.exit(main_formatear(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == 'exportar':
+        sys.exit(main_exportar(sys.argv[2:]))
+    analizador = argparse.ArgumentParser(prog="python -m src", description="Editor de texto de consola.")
+    analizador.add_argument("archivo", nargs="?", help="archivo de texto o documento binario (.edb) a abrir")
+    analizador.add_argument("--grabar", metavar="TRAZA",
+                            help="graba las teclas con su instante (python -m benchmarks.trazas reproducir)")
+    opciones = analizador.parse_args()
+    main_live_editor(opciones.archivo, opciones.grabar)
\ No newline at end of file
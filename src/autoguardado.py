@@ -0,0 +1,65 @@
+import asyncio
+import os
+from typing import List, Optional, Tuple
+from src.composite.fuente_archivo import FuenteArchivo
+from src.editor_consola import EditorConsola
+
+
+def escribir_texto(destino: str, parrafos: List[str], resto: Optional[Tuple[FuenteArchivo, int, int]]) -> int:
+    """
+    Escribe el texto plano del documento (párrafos separados por una línea en blanco) y
+    agrega, copiándola del archivo de origen, la parte que todavía no se cargó.
+    Escribe a un archivo temporal y lo renombra: un corte a mitad de camino no deja
+    el destino incompleto. Retorna los bytes escritos.
+    """
+    temporal = destino + ".tmp"
+    with open(temporal, "wb") as salida:
+        salida.write("\n\n".join(parrafos).encode("utf-8"))
+        if resto is not None:
+            fuente, desde, hasta = resto
+            if parrafos:
+                salida.write(b"\n\n")
+            # Del mapa ya abierto: el archivo pudo haberse reemplazado (p. ej. al guardar encima)
+            fuente.copiar(desde, hasta, salida)
+        escritos = salida.tell()
+    os.replace(temporal, destino)
+    return escritos
+
+
+class Autoguardado:
+    """
+    Guarda periódicamente una copia en texto plano del documento del editor.
+    Patrón de Diseño: Memento (la instantánea se toma en el hilo del editor y se escribe aparte).
+    Ítem de Cambio Oculto: Cuándo y dónde se guarda la copia de seguridad.
+
+    La instantánea (el texto de los párrafos cargados) se toma en el bucle de eventos, que es
+    el único que toca el documento; la escritura del archivo corre en un ejecutor.
+    Solo se guarda si el historial registró cambios desde el último guardado.
+    """
+    def __init__(self, editor: EditorConsola, destino: str, intervalo: float = 30.0):
+        self.editor = editor
+        self.destino = destino
+        self.intervalo = intervalo
+        self._version_guardada = editor.invoker.version
+        self.guardados = 0
+
+    def hay_cambios(self) -> bool:
+        return self.editor.invoker.version != self._version_guardada
+
+    async def guardar(self) -> bool:
+        """Guarda si hubo cambios. Retorna si escribió el archivo."""
+        if not self.hay_cambios():
+            return False
+        version = self.editor.invoker.version
+        parrafos, resto = self.editor.documento.instantanea_texto()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, escribir_texto, self.destino, parrafos, resto)
+        self._version_guardada = version
+        self.guardados += 1
+        return True
+
+    async def ejecutar(self) -> None:
+        """Tarea periódica: se cancela al cerrar el editor."""
+        while True:
+            await asyncio.sleep(self.intervalo)
+            await self.guardar()
@@ -1,13 +1,20 @@
+from typing import List
 from ..composite.linea import Linea
 from ..composite.palabra import Palabra
+from ..composite.tabla_piezas import Pieza
 from src.command.command_base import CommandBase
 
 
 class AgregarCaracterCommand(CommandBase):
-    """Comando para agregar un carácter en una palabra específica."""
+    """
+    Comando para agregar un carácter en una palabra específica.
+    Las inserciones consecutivas en la misma palabra se fusionan en un único comando,
+    de modo que deshacer elimina el tramo tecleado completo.
+    """
+    __slots__ = ("palabra_idx", "char_idx", "caracter", "cursor_pos_antes", "cursor_pos_despues",
+                 "_palabra_receptora", "_piezas", "_longitud", "_anterior", "_parrafo")
     
     def __init__(self, linea: Linea, palabra_idx: int, char_idx: int, caracter: str):
-        self.linea = linea
         self.palabra_idx = palabra_idx
         self.char_idx = char_idx
         self.caracter = caracter
@@ -16,13 +23,41 @@ class AgregarCaracterCommand(CommandBase):
 
         # Se accede a la palabra mediante get_palabra() para compatibilidad
         self._palabra_receptora: Palabra = linea.get_palabra(palabra_idx)
+        self._anclar(self._palabra_receptora)
+        # Piezas insertadas: rehacer las reutiliza en lugar de copiar texto
+        self._piezas: List[Pieza] = []
+        self._longitud = 0
 
     def ejecutar(self):
-        texto = self._palabra_receptora.texto
-        # Insertamos el carácter en la posición indicada
-        self._palabra_receptora.texto = texto[:self.char_idx] + self.caracter + texto[self.char_idx:]
+        if not self._piezas:
+            self._piezas = [self._palabra_vigente().insertar_caracter(self.char_idx, self.caracter)]
+            self._longitud = self._piezas[0].longitud
+        else:
+            self._palabra_vigente().insertar_piezas(self.char_idx, self._piezas)
 
     def deshacer(self):
-        texto = self._palabra_receptora.texto
-        # Eliminamos el carácter insertado
-        self._palabra_receptora.texto = texto[:self.char_idx] + texto[self.char_idx+1:]
+        # Eliminamos el tramo insertado
+        self._palabra_vigente().eliminar_tramo(self.char_idx, self._longitud)
+
+    def puede_fusionar(self, otro) -> bool:
+        # Se sigue escribiendo en la misma palabra, justo al final del tramo insertado
+        return (isinstance(otro, AgregarCaracterCommand)
+                and otro._palabra_receptora is self._palabra_receptora
+                and otro.char_idx == self.char_idx + self._longitud)
+
+    def fusionar(self, otro: "AgregarCaracterCommand"):
+        for pieza in otro._piezas:
+            ultima = self._piezas[-1]
+            if ultima.fuente is pieza.fuente and ultima.fin == pieza.inicio:
+                # Caracteres contiguos en el búfer de agregados: una sola pieza
+                self._piezas[-1] = Pieza(ultima.fuente, ultima.inicio, ultima.longitud + pieza.longitud)
+            else:
+                self._piezas.append(pieza)
+        self._longitud += otro._longitud
+
+    def cerrar(self):
+        # Terminó la edición de la palabra: su tabla de piezas ya no hace falta
+        self._palabra_receptora.compactar()
+
+    def tamanio_estimado(self) -> int:
+        return self.TAMANIO_BASE + 56 * len(self._piezas) + 8 * self._longitud
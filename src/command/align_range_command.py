@@ -0,0 +1,30 @@
+from typing import List, Tuple
+from ..composite.parrafo import Parrafo
+from ..strategy.alineacion_strategy import IStrategyAlineacion
+from .command_base import CommandBase
+
+class AlinearRangoCommand(CommandBase):
+    """
+    Comando para cambiar la alineación de los párrafos de un rango.
+    Guarda la alineación previa de cada párrafo para deshacer.
+    """
+    __slots__ = ("alineacion", "cursor_pos_antes", "cursor_pos_despues", "_previas")
+
+    def __init__(self, parrafos: List[Parrafo], alineacion: IStrategyAlineacion):
+        self.alineacion = alineacion
+        self.cursor_pos_antes = None
+        self.cursor_pos_despues = None
+        self._previas: List[Tuple[Parrafo, IStrategyAlineacion]] = [
+            (p, p.hijos[0].alineacion) for p in parrafos if p.hijos
+        ]
+
+    def ejecutar(self):
+        for parrafo, _ in self._previas:
+            parrafo.cambiar_alineacion(self.alineacion)
+
+    def deshacer(self):
+        for parrafo, previa in self._previas:
+            parrafo.cambiar_alineacion(previa)
+
+    def tamanio_estimado(self) -> int:
+        return self.TAMANIO_BASE + 16 * len(self._previas)
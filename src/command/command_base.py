@@ -1,8 +1,13 @@
 # src/command/command_base.py
-from abc import ABC, abstractmethod
+from abc import abstractmethod
+from .command_interface import ICommand
 
-class CommandBase(ABC):
+class CommandBase(ICommand):
     """Interfaz base para los comandos del patrón Command."""
+    __slots__ = ()
+
+    # Costo aproximado del comando y de sus dos cursores (antes/después) en el historial
+    TAMANIO_BASE = 300
 
     @abstractmethod
     def ejecutar(self) -> None:
@@ -11,3 +16,34 @@ class CommandBase(ABC):
     @abstractmethod
     def deshacer(self) -> None:
         pass
+
+    def _anclar(self, palabra) -> None:
+        """
+        Guarda la palabra anterior dentro del párrafo (aunque esté en la línea previa):
+        es un ancla estable frente al reflow, que reutiliza los objetos Linea.
+        """
+        linea = palabra.parent
+        self._parrafo = linea.parent
+        self._anterior = None
+        indice = linea.indice_de(palabra)
+        if indice > 0:
+            self._anterior = linea.hijos[indice - 1]
+        elif self._parrafo is not None and linea.indice > 0:
+            self._anterior = self._parrafo.hijos[linea.indice - 1].hijos[-1]
+
+    def _palabra_vigente(self):
+        """
+        Palabra sobre la que actúa el comando. Si el reflow la descartó (una palabra que
+        quedó vacía al deshacer o borrar), se la vuelve a insertar a continuación de su
+        palabra anterior, para que rehacer/deshacer no escriban en una palabra suelta.
+        """
+        palabra = self._palabra_receptora
+        if palabra.parent is not None:
+            return palabra
+        anterior = self._anterior
+        if anterior is not None and anterior.parent is not None and anterior.parent.parent is self._parrafo:
+            linea = anterior.parent
+            linea.insertar_palabra(linea.indice_de(anterior) + 1, palabra)
+        elif self._parrafo is not None and self._parrafo.parent is not None and self._parrafo.hijos:
+            self._parrafo.hijos[0].insertar_palabra(0, palabra)
+        return palabra
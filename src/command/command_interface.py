@@ -2,10 +2,27 @@ from abc import ABC, abstractmethod
 
 class ICommand(ABC):
     """Interfaz del patrón Command."""
+    __slots__ = ()
+
     @abstractmethod
     def ejecutar(self) -> None:
         pass
 
     @abstractmethod
     def deshacer(self) -> None:
-        pass
\ No newline at end of file
+        pass
+
+    def puede_fusionar(self, otro: "ICommand") -> bool:
+        """True si 'otro' (recién ejecutado) continúa a este comando y pueden deshacerse juntos."""
+        return False
+
+    def fusionar(self, otro: "ICommand") -> None:
+        """Absorbe a 'otro' (ya ejecutado); solo se llama si puede_fusionar(otro) es True."""
+        raise NotImplementedError
+
+    def cerrar(self) -> None:
+        """Se llama cuando el comando ya no puede fusionarse: suelta lo que solo servía para seguir editando."""
+
+    def tamanio_estimado(self) -> int:
+        """Bytes aproximados que retiene el comando en el historial."""
+        return 200
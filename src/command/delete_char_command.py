@@ -1,12 +1,19 @@
+from typing import List
 from ..composite.linea import Linea
 from ..composite.palabra import Palabra
+from ..composite.tabla_piezas import Pieza
 from .command_base import CommandBase
 
 class EliminarCaracterCommand(CommandBase):
-    """Comando para eliminar un carácter de una palabra específica."""
+    """
+    Comando para eliminar un carácter de una palabra específica.
+    Los borrados consecutivos en la misma palabra (retroceso o supresión) se fusionan
+    en un único comando.
+    """
+    __slots__ = ("palabra_idx", "char_idx", "cursor_pos_antes", "cursor_pos_despues",
+                 "_palabra_receptora", "_piezas_eliminadas", "_cantidad", "_anterior", "_parrafo")
 
     def __init__(self, linea: Linea, palabra_idx: int, char_idx: int):
-        self.linea = linea
         self.palabra_idx = palabra_idx
         self.char_idx = char_idx
         self.cursor_pos_antes = None
@@ -14,15 +21,37 @@ class EliminarCaracterCommand(CommandBase):
 
         # Se accede a la palabra mediante get_palabra() para compatibilidad
         self._palabra_receptora: Palabra = linea.get_palabra(palabra_idx)
-        self._caracter_eliminado = ""
+        self._anclar(self._palabra_receptora)
+        # Piezas quitadas de la palabra: deshacer las reinserta sin copiar el texto
+        self._piezas_eliminadas: List[Pieza] = []
+        self._cantidad = 1
 
     def ejecutar(self):
-        texto = self._palabra_receptora.texto
-        if self.char_idx < len(texto):
-            self._caracter_eliminado = texto[self.char_idx]
-            self._palabra_receptora.texto = texto[:self.char_idx] + texto[self.char_idx+1:]
+        self._piezas_eliminadas = self._palabra_vigente().eliminar_tramo(self.char_idx, self._cantidad)
+        self._cantidad = sum(p.longitud for p in self._piezas_eliminadas)
 
     def deshacer(self):
-        texto = self._palabra_receptora.texto
-        # Reinsertamos el carácter eliminado
-        self._palabra_receptora.texto = texto[:self.char_idx] + self._caracter_eliminado + texto[self.char_idx:]
+        # Reinsertamos el tramo eliminado
+        self._palabra_vigente().insertar_piezas(self.char_idx, self._piezas_eliminadas)
+
+    def puede_fusionar(self, otro) -> bool:
+        if (not isinstance(otro, EliminarCaracterCommand)
+                or otro._palabra_receptora is not self._palabra_receptora or not otro._cantidad):
+            return False
+        # Retroceso: borra justo antes del tramo; supresión: borra en la misma posición
+        return otro.char_idx + otro._cantidad == self.char_idx or otro.char_idx == self.char_idx
+
+    def fusionar(self, otro: "EliminarCaracterCommand"):
+        if otro.char_idx < self.char_idx:
+            self._piezas_eliminadas = otro._piezas_eliminadas + self._piezas_eliminadas
+            self.char_idx = otro.char_idx
+        else:
+            self._piezas_eliminadas = self._piezas_eliminadas + otro._piezas_eliminadas
+        self._cantidad += otro._cantidad
+
+    def cerrar(self):
+        # Terminó la edición de la palabra: su tabla de piezas ya no hace falta
+        self._palabra_receptora.compactar()
+
+    def tamanio_estimado(self) -> int:
+        return self.TAMANIO_BASE + 56 * len(self._piezas_eliminadas)
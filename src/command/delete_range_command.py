@@ -0,0 +1,15 @@
+from ..composite.documento import Documento
+from ..composite.palabra import Palabra
+from .replace_range_command import ReemplazarRangoCommand
+
+class EliminarRangoCommand(ReemplazarRangoCommand):
+    """
+    Comando para eliminar el rango [inicio, fin): el texto previo al inicio y el
+    posterior al fin quedan unidos en la palabra de inicio. Es un reemplazo por un bloque
+    vacío: guarda solo las palabras del rango.
+    """
+    __slots__ = ()
+
+    def __init__(self, documento: Documento, palabra_inicio: Palabra, char_inicio: int,
+                 palabra_fin: Palabra, char_fin: int):
+        super().__init__(documento, palabra_inicio, char_inicio, palabra_fin, char_fin, "")
@@ -0,0 +1,246 @@
+import re
+from typing import List, Optional, Tuple
+from ..composite.documento import Documento
+from ..composite.linea import Linea
+from ..composite.parrafo import Parrafo
+from ..composite.palabra import Palabra
+from .command_base import CommandBase
+
+# Una línea en blanco separa párrafos (mismo criterio que FuenteArchivo y el formateador)
+_SEPARADOR_PARRAFOS = re.compile(r"\n[ \t\r]*\n")
+
+
+def tokenizar_bloque(texto: str) -> Tuple[List[List[str]], bool, bool]:
+    """
+    Divide un bloque de texto en párrafos de palabras en una sola pasada.
+    Retorna (párrafos, une_inicio, une_fin): une_inicio/une_fin indican si el bloque
+    empieza/termina pegado a una palabra (sin espacio), y por lo tanto se une con el
+    texto que está antes/después del cursor. Un bloque vacío une ambos lados.
+    """
+    parrafos = [bloque.split() for bloque in _SEPARADOR_PARRAFOS.split(texto)]
+    une_inicio = not texto[:1].isspace()
+    une_fin = not texto[-1:].isspace()
+    return parrafos, une_inicio, une_fin
+
+
+class InsertarTextoCommand(CommandBase):
+    """
+    Comando para insertar un bloque de texto (p. ej. pegado) en la posición del cursor.
+    Las palabras y párrafos del bloque se empalman en el árbol en una sola operación;
+    el reflow y la paginación se hacen una vez y deshacer/rehacer lo tratan como una unidad.
+
+    El bloque se empalma a continuación de la palabra del cursor: solo se tocan la línea del
+    cursor y las del rango, que quedan sucias para que el reflow incremental retome desde
+    ahí, y los párrafos nuevos entran con Documento.insertar_parrafos. Se guardan solo las
+    palabras insertadas y las quitadas (referencias, no copias): deshacer es el mismo empalme
+    con los papeles invertidos y rehacer reutiliza los mismos objetos Palabra y Parrafo.
+    Cuesta O(palabras del rango + líneas movidas), no O(párrafo).
+
+    Con una posición final (palabra_fin, char_fin) el bloque reemplaza el rango
+    [inicio, fin), que puede abarcar varios párrafos: los párrafos siguientes al inicial
+    se quitan del documento y deshacer los vuelve a insertar con sus palabras.
+    """
+    __slots__ = ("documento", "texto", "char_idx", "cursor_pos_antes", "cursor_pos_despues",
+                 "_palabra_receptora", "_anterior", "_parrafo", "_texto_antes", "_texto_despues",
+                 "_grupos_nuevos", "_parrafos_nuevos", "_grupos_quitados", "_parrafos_quitados",
+                 "_palabra_fin", "_char_fin", "palabra_final", "offset_final")
+
+    def __init__(self, documento: Documento, palabra: Palabra, char_idx: int, texto: str,
+                 palabra_fin: Optional[Palabra] = None, char_fin: Optional[int] = None):
+        self.documento = documento
+        self.texto = texto
+        self.char_idx = char_idx
+        self.cursor_pos_antes = None
+        self.cursor_pos_despues = None
+
+        self._palabra_receptora = palabra
+        self._anclar(palabra)
+        # Fin del rango reemplazado (sin fin: inserción en el cursor)
+        self._palabra_fin = palabra if palabra_fin is None else palabra_fin
+        self._char_fin = char_idx if char_fin is None else char_fin
+        self._texto_antes = ""
+        self._texto_despues = ""
+        # Palabras del bloque por párrafo: la primera lista sigue a la palabra receptora y
+        # cada una de las siguientes forma uno de los párrafos nuevos
+        self._grupos_nuevos: List[List[Palabra]] = []
+        self._parrafos_nuevos: List[Parrafo] = []
+        # Lo que abarcaba el rango, agrupado igual (se captura al ejecutar por primera vez)
+        self._grupos_quitados: List[List[Palabra]] = []
+        self._parrafos_quitados: List[Parrafo] = []
+        # Posición donde termina el texto insertado (para ubicar el cursor)
+        self.palabra_final: Optional[Palabra] = None
+        self.offset_final = 0
+
+    def ejecutar(self):
+        palabra = self._palabra_vigente()
+        primera_vez = self.palabra_final is None
+        if primera_vez:
+            self._preparar(palabra)
+            ultima = self._palabra_fin
+        else:
+            ultima = self._ultima(palabra, self._grupos_quitados, self._parrafos_quitados)
+        palabra.texto = self._texto_despues
+        quitadas, quitados = self._empalmar(palabra, ultima, self._grupos_nuevos, self._parrafos_nuevos)
+        if primera_vez:
+            self._grupos_quitados, self._parrafos_quitados = quitadas, quitados
+
+    def deshacer(self):
+        palabra = self._palabra_vigente()
+        ultima = self._ultima(palabra, self._grupos_nuevos, self._parrafos_nuevos)
+        palabra.texto = self._texto_antes
+        self._empalmar(palabra, ultima, self._grupos_quitados, self._parrafos_quitados)
+
+    def _preparar(self, palabra: Palabra):
+        """Calcula (una sola vez) el texto de la palabra receptora y las palabras y párrafos del bloque."""
+        parrafos, une_inicio, une_fin = tokenizar_bloque(self.texto)
+        texto = palabra.texto
+        previo, resto = texto[:self.char_idx], self._palabra_fin.texto[self._char_fin:]
+        self._texto_antes = texto
+
+        # Unir el comienzo del bloque con el texto previo al cursor dentro de la palabra
+        primeras = parrafos[0]
+        if une_inicio and primeras:
+            self._texto_despues = previo + primeras[0]
+            primeras = primeras[1:]
+        else:
+            self._texto_despues = previo
+
+        # Las palabras del bloque se crean en orden; 'palabra' conserva su identidad
+        grupos: List[List[Palabra]] = [[Palabra(t) for t in primeras]]
+        for tokens in parrafos[1:]:
+            grupos.append([Palabra(t) for t in tokens])
+
+        # Unir el final del bloque con el texto posterior al cursor
+        ultimo = grupos[-1]
+        if une_fin and (ultimo or len(grupos) == 1):
+            if not ultimo:
+                final = palabra
+                self._texto_despues += resto
+                self.offset_final = len(self._texto_despues) - len(resto)
+            else:
+                final = ultimo[-1]
+                final.texto = final.texto + resto
+                self.offset_final = len(final.texto) - len(resto)
+        else:
+            # El resto queda como palabra propia (vacía si no había resto: lleva el cursor)
+            final = Palabra(resto)
+            ultimo.append(final)
+            self.offset_final = 0
+        self.palabra_final = final
+        self._grupos_nuevos = grupos
+
+        parrafo = palabra.parent.parent
+        for _ in grupos[1:]:
+            nuevo = Parrafo(ancho_linea=parrafo.ancho_linea)
+            nuevo.cambiar_corte(parrafo.corte)
+            self._parrafos_nuevos.append(nuevo)
+
+    def _ultima(self, palabra: Palabra, grupos: List[List[Palabra]], parrafos: List[Parrafo]) -> Palabra:
+        """
+        Última palabra del tramo que sigue a 'palabra' (la de 'grupos', o 'palabra' si no hay
+        ninguna). Si el reflow la descartó por vacía, se la vuelve a insertar a continuación
+        de la anterior del tramo que siga en el árbol (o al comienzo de su párrafo).
+        """
+        grupo = grupos[-1]
+        if not grupo:
+            return palabra
+        ultima = grupo[-1]
+        if ultima.parent is None:
+            previa = next((p for p in reversed(grupo) if p.parent is not None), None)
+            if previa is None and len(grupos) == 1:
+                previa = palabra
+            if previa is not None:
+                linea = previa.parent
+                linea.insertar_palabra(linea.indice_de(previa) + 1, ultima)
+            else:
+                parrafos[-1].hijos[0].insertar_palabra(0, ultima)
+        return ultima
+
+    def _empalmar(self, palabra: Palabra, ultima: Palabra, grupos: List[List[Palabra]],
+                  parrafos: List[Parrafo]) -> Tuple[List[List[Palabra]], List[Parrafo]]:
+        """
+        Reemplaza las palabras que siguen a 'palabra' hasta 'ultima' (inclusive) por 'grupos':
+        el primero continúa la línea de 'palabra' y cada uno de los siguientes forma uno de
+        los 'parrafos'. Las palabras posteriores a 'ultima' en su línea y las líneas que la
+        siguen en su párrafo pasan a continuación del último grupo.
+        Retorna las palabras quitadas (agrupadas por párrafo) y los párrafos quitados.
+        """
+        documento = self.documento
+        linea, linea_fin = palabra.parent, ultima.parent
+        parrafo, parrafo_fin = linea.parent, linea_fin.parent
+        i, j = linea.indice_de(palabra), linea_fin.indice_de(ultima)
+        a, b = parrafo.indice_de(linea), parrafo_fin.indice_de(linea_fin)
+        cola = linea_fin.hijos[j + 1:]
+        lineas_cola = parrafo_fin.hijos[b + 1:]
+
+        # Palabras del rango, agrupadas por párrafo
+        if linea is linea_fin:
+            quitadas = [linea.hijos[i + 1:j + 1]]
+        elif parrafo is parrafo_fin:
+            quitadas = [linea.hijos[i + 1:] + _palabras_de(parrafo.hijos[a + 1:b]) + linea_fin.hijos[:j + 1]]
+        else:
+            quitadas = [linea.hijos[i + 1:] + _palabras_de(parrafo.hijos[a + 1:])]
+            quitadas.extend(p.palabras() for p in documento.parrafos[parrafo.indice + 1:parrafo_fin.indice])
+            quitadas.append(_palabras_de(parrafo_fin.hijos[:b]) + linea_fin.hijos[:j + 1])
+
+        alineacion = parrafo.alineacion_vigente()
+        if len(grupos) == 1:
+            if linea is linea_fin:
+                linea.empalmar(i + 1, j + 1, grupos[0])
+            else:
+                linea.empalmar(i + 1, len(linea.hijos), grupos[0] + cola)
+                if parrafo is parrafo_fin:
+                    parrafo.empalmar_lineas(a + 1, b + 1, [])
+                else:
+                    # Las líneas que siguen al rango pasan enteras al párrafo inicial
+                    parrafo_fin.empalmar_lineas(b + 1, len(parrafo_fin.hijos), [])
+                    for movida in lineas_cola:
+                        movida.cambiar_alineacion(alineacion)
+                    parrafo.empalmar_lineas(a + 1, len(parrafo.hijos), lineas_cola)
+        else:
+            linea.empalmar(i + 1, len(linea.hijos), grupos[0])
+            if parrafo is not parrafo_fin:
+                parrafo_fin.empalmar_lineas(b + 1, len(parrafo_fin.hijos), [])
+            parrafo.empalmar_lineas(a + 1, len(parrafo.hijos), [])
+        quitados = documento.eliminar_parrafos(parrafo.indice + 1, parrafo_fin.indice + 1)
+        for quitado in quitados:
+            # Sus líneas quedan sin padre: un cursor anclado en ellas no debe resolverse ahí
+            for sobrante in quitado.hijos:
+                sobrante.parent = None
+
+        if parrafos:
+            for nuevo, palabras in zip(parrafos, grupos[1:]):
+                # Un párrafo que vuelve (deshacer/rehacer) reutiliza su primera línea y su alineación
+                previas = nuevo.empalmar_lineas(0, len(nuevo.hijos), [])
+                if previas:
+                    contenido = previas[0]
+                else:
+                    contenido = Linea(ancho=nuevo.ancho_linea)
+                    contenido.cambiar_alineacion(alineacion)
+                contenido.reemplazar_palabras(palabras + cola if nuevo is parrafos[-1] else list(palabras))
+                # Solo la primera línea está sin maquetar: el reflow incremental empieza ahí
+                nuevo.marcar_maquetado()
+                nuevo.empalmar_lineas(0, 0, [contenido])
+            documento.insertar_parrafos(parrafo.indice + 1, parrafos)
+            ultimo = parrafos[-1]
+            propia = ultimo.alineacion_vigente()
+            if lineas_cola:
+                for movida in lineas_cola:
+                    movida.cambiar_alineacion(propia)
+                ultimo.empalmar_lineas(1, 1, lineas_cola)
+
+        for grupo in quitadas:
+            for quitada in grupo:
+                quitada.parent = None
+        for grupo in quitadas + grupos:
+            documento.palabras_modificadas(grupo)
+        return quitadas, quitados
+
+    def tamanio_estimado(self) -> int:
+        palabras = sum(len(g) for g in self._grupos_nuevos) + sum(len(g) for g in self._grupos_quitados)
+        return self.TAMANIO_BASE + len(self.texto) + 8 * palabras
+
+
+def _palabras_de(lineas: List[Linea]) -> List[Palabra]:
+    """Palabras de una secuencia de líneas, en orden."""
+    return [p for linea in lineas for p in linea.hijos]
@@ -1,32 +1,109 @@
-from typing import List
+from collections import deque
+from typing import Deque, Dict, List, Optional, TYPE_CHECKING
 from .command_interface import ICommand
 
+if TYPE_CHECKING:
+    from ..diario import Diario
+
 class CommandInvoker:
-    """Invoker - Gestiona la ejecución y el historial de comandos."""
-    def __init__(self):
-        self._historial: List[ICommand] = []
+    """
+    Invoker - Gestiona la ejecución y el historial de comandos.
+    Los comandos que continúan al último ejecutado (p. ej. caracteres tecleados seguidos
+    en la misma palabra) se fusionan con él. El historial está acotado por cantidad de
+    entradas y por bytes estimados: al superar un límite se descartan las más antiguas.
+    Una entrada se cierra (ICommand.cerrar) cuando ya no puede fusionarse: al abrirse la
+    siguiente o al deshacerla/rehacerla.
+    """
+    def __init__(self, max_entradas: int = 1000, max_bytes: int = 8 * 1024 * 1024):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._historial: Deque[ICommand] = deque()
         self._historial_deshacer: List[ICommand] = [] 
+        self._bytes = 0 # Bytes estimados del historial (deshacer)
+        # Tras deshacer/rehacer no se fusiona: el próximo comando abre una entrada nueva
+        self._fusion_permitida = False
+        self._fusionados = 0
+        self._descartados = 0
+        # Aumenta con cada cambio aplicado al documento (ejecutar, deshacer o rehacer)
+        self.version = 0
+        # Observador que confirma cada cambio en el diario de recuperación (ver src/diario.py)
+        self.diario: Optional['Diario'] = None
 
-    def ejecutar(self, command: ICommand) -> None:
-        """Ejecuta el comando y lo añade al historial. Borra el historial de rehacer."""
+    def ejecutar(self, command: ICommand) -> ICommand:
+        """
+        Ejecuta el comando y lo añade al historial (o lo fusiona con el último).
+        Borra el historial de rehacer. Retorna la entrada del historial que lo contiene.
+        """
         command.ejecutar()
-        self._historial.append(command)
-        self._historial_deshacer = [] 
+        self._aplicado()
+        if self._historial_deshacer:
+            self._historial_deshacer.clear()
+
+        ultimo = self._historial[-1] if self._historial else None
+        if self._fusion_permitida and ultimo is not None and ultimo.puede_fusionar(command):
+            self._bytes -= ultimo.tamanio_estimado()
+            ultimo.fusionar(command)
+            self._bytes += ultimo.tamanio_estimado()
+            self._fusionados += 1
+            entrada = ultimo
+        else:
+            if ultimo is not None:
+                ultimo.cerrar()
+            self._historial.append(command)
+            self._bytes += command.tamanio_estimado()
+            entrada = command
+        self._fusion_permitida = True
+        self._recortar()
+        return entrada
+
+    def _aplicado(self) -> None:
+        self.version += 1
+        if self.diario is not None:
+            self.diario.confirmar()
+
+    def _recortar(self) -> None:
+        """Descarta las entradas más antiguas mientras se supere algún límite (se conserva la última)."""
+        while len(self._historial) > 1 and (len(self._historial) > self.max_entradas
+                                            or self._bytes > self.max_bytes):
+            self._bytes -= self._historial.popleft().tamanio_estimado()
+            self._descartados += 1
 
     def deshacer(self) -> ICommand | None:
         """Deshace el último comando ejecutado (CTRL+Z) y lo retorna."""
+        self._fusion_permitida = False
         if self._historial:
             command = self._historial.pop()
+            self._bytes -= command.tamanio_estimado()
             command.deshacer()
+            command.cerrar()
+            self._aplicado()
             self._historial_deshacer.append(command)
             return command
         return None
 
     def rehacer(self) -> ICommand | None: 
         """Rehace el último comando deshecho (CTRL+Y) y lo retorna."""
+        self._fusion_permitida = False
         if self._historial_deshacer: 
             command = self._historial_deshacer.pop()
             command.ejecutar()
+            command.cerrar()
+            self._aplicado()
             self._historial.append(command)
+            self._bytes += command.tamanio_estimado()
+            self._recortar()
             return command
-        return None
\ No newline at end of file
+        return None
+
+    def __len__(self) -> int:
+        return len(self._historial)
+
+    def estadisticas(self) -> Dict[str, int]:
+        """Tamaño y memoria estimada del historial."""
+        return {
+            "entradas": len(self._historial),
+            "rehacer": len(self._historial_deshacer),
+            "bytes_estimados": self._bytes,
+            "fusionados": self._fusionados,
+            "descartados": self._descartados,
+        }
@@ -0,0 +1,16 @@
+from ..composite.documento import Documento
+from ..composite.palabra import Palabra
+from .insert_text_command import InsertarTextoCommand
+
+class ReemplazarRangoCommand(InsertarTextoCommand):
+    """
+    Comando para reemplazar el rango [inicio, fin) por un bloque de texto.
+    El rango puede abarcar varios párrafos. Se empalma igual que una inserción: solo se
+    guardan las palabras quitadas del rango (para deshacer) y las insertadas, y solo quedan
+    sucias las líneas tocadas. Cuesta O(rango), no O(párrafos del inicio y del fin).
+    """
+    __slots__ = ()
+
+    def __init__(self, documento: Documento, palabra_inicio: Palabra, char_inicio: int,
+                 palabra_fin: Palabra, char_fin: int, texto: str):
+        super().__init__(documento, palabra_inicio, char_inicio, texto, palabra_fin, char_fin)
@@ -0,0 +1,36 @@
+from typing import List, Tuple
+from ..composite.palabra import Palabra
+from ..composite.parrafo import Parrafo
+from .command_base import CommandBase
+
+class ReemplazarPalabrasCommand(CommandBase):
+    """
+    Comando para cambiar el texto de muchas palabras de una vez (p. ej. reemplazar todo).
+    Solo cambian los textos: el reflow posterior es incremental en cada párrafo tocado y
+    deshacer/rehacer lo tratan como una unidad. Si una palabra queda vacía el reflow la
+    descarta; para deshacer se guardan las palabras de su párrafo y se lo restituye entero.
+    """
+    __slots__ = ("cursor_pos_antes", "cursor_pos_despues", "_cambios", "_parrafos")
+
+    def __init__(self, cambios: List[Tuple[Palabra, str]]):
+        self.cursor_pos_antes = None
+        self.cursor_pos_despues = None
+        # (palabra, texto previo, texto nuevo)
+        self._cambios: List[Tuple[Palabra, str, str]] = [(p, p.texto, nuevo) for p, nuevo in cambios]
+        vaciados = {p.parent.parent: None for p, _, nuevo in self._cambios if not nuevo.strip()}
+        self._parrafos: List[Tuple[Parrafo, List[Palabra]]] = [(p, p.palabras()) for p in vaciados]
+
+    def ejecutar(self):
+        for palabra, _, nuevo in self._cambios:
+            palabra.texto = nuevo
+
+    def deshacer(self):
+        for palabra, previo, _ in self._cambios:
+            palabra.texto = previo
+        for parrafo, palabras in self._parrafos:
+            if any(p.parent is None for p in palabras):
+                parrafo.reemplazar_contenido(palabras)
+
+    def tamanio_estimado(self) -> int:
+        return (self.TAMANIO_BASE + sum(24 + len(previo) + len(nuevo) for _, previo, nuevo in self._cambios)
+                + 8 * sum(len(palabras) for _, palabras in self._parrafos))
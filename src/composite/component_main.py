@@ -5,7 +5,10 @@ class ComponenteDocumento(ABC):
     Componente - Define la interfaz común para todos los elementos estructurales.
     Patrón de Diseño: Composite (Component).
     Ítem de Cambio Oculto: La estructura y las operaciones comunes (mostrar, contar).
+    Todas las subclases declaran __slots__ (sin __dict__ por instancia).
     """
+    __slots__ = ()
+
     @abstractmethod
     def contar_palabras(self) -> int:
         """Cuenta el número de palabras en el componente."""
@@ -1,8 +1,17 @@
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
 from src.composite.pagina import Pagina # Asegurado para acceder a MAX_LINEAS_POR_PAGINA
 from src.composite.component_main import ComponenteDocumento
 from src.composite.parrafo import Parrafo
+from src.composite.fuente_archivo import FuenteArchivo
+from src.composite.segmento_parrafo import SegmentoParrafo
 from src.composite.linea import Linea
+from src.composite.palabra import Palabra
+from src.indice_palabras import IndicePalabras
+from src.instrumentacion import INSTRUMENTACION
+
+if TYPE_CHECKING:
+    from src.diario import Diario
+    from src.maquetado_paralelo import MaquetadorParalelo
 
 
 class Documento(ComponenteDocumento):
@@ -10,100 +19,414 @@ class Documento(ComponenteDocumento):
     Raíz del documento. Contenedor principal de Paginas.
     Patrón de Diseño: Composite (Root/Component).
     Ítem de Cambio Oculto: Lógica de paginación global y estadísticas totales.
+
+    Los párrafos lógicos viven en self.parrafos; cada Pagina contiene SegmentoParrafo,
+    vistas sobre las líneas de un párrafo, por lo que partir un párrafo entre páginas
+    no copia ningún Parrafo.
+
+    Un documento abierto desde un archivo (abrir_fuente) crea sus párrafos de forma
+    perezosa y en orden: un Parrafo (con sus Linea y Palabra) se construye recién cuando
+    se pagina la zona del documento que lo contiene; el resto sigue en el archivo mapeado.
     """
+    __slots__ = ("hijos", "parrafos", "_parrafos_sucios", "_desde_parrafo", "_hasta_parrafo",
+                 "_palabras", "_lineas", "_fuente", "_siguiente_fuente", "_ancho_fuente",
+                 "maquetador", "_indice_palabras", "diario")
     def __init__(self):
         self.hijos: List[Pagina] = []
+        self.parrafos: List[Parrafo] = []
+        # Párrafos editados desde la última paginación
+        self._parrafos_sucios: Set[Parrafo] = set()
+        # Rango de párrafos afectados por cambios estructurales (alta/baja de párrafos)
+        self._desde_parrafo: Optional[int] = None
+        self._hasta_parrafo: Optional[int] = None
+        # Estadísticas cacheadas: los párrafos informan variaciones (deltas) hacia arriba
+        self._palabras = 0
+        self._lineas = 0
+        # Archivo de origen de los párrafos aún no cargados (None: documento en memoria)
+        self._fuente: Optional[FuenteArchivo] = None
+        self._siguiente_fuente = 0
+        self._ancho_fuente = 40
+        # Maquetado masivo: si está, los párrafos que requieren reflow completo se reparten
+        # entre procesos (ver MaquetadorParalelo); si no, se maquetan uno tras otro
+        self.maquetador: Optional['MaquetadorParalelo'] = None
+        # Índice invertido de palabras (se construye con la primera búsqueda)
+        self._indice_palabras: Optional[IndicePalabras] = None
+        # Observador de los cambios de párrafos para el diario de recuperación (ver src/diario.py)
+        self.diario: Optional['Diario'] = None
+
+    def abrir_fuente(self, fuente: FuenteArchivo, ancho_linea: int = 40):
+        """Usa el archivo como origen de los párrafos que siguen a los ya cargados."""
+        self._fuente = fuente
+        self._siguiente_fuente = 0
+        self._ancho_fuente = ancho_linea
+
+    def cargado_completo(self) -> bool:
+        """True si todos los párrafos del origen ya son objetos Parrafo."""
+        return self._fuente is None or (self._fuente.completo()
+                                        and self._siguiente_fuente >= len(self._fuente))
+
+    def indice_completo(self) -> bool:
+        """True si ya se conoce la cantidad total de párrafos (el origen está indexado)."""
+        return self._fuente is None or self._fuente.completo()
+
+    def indexar_fuente(self, cantidad: int) -> bool:
+        """
+        Avanza el índice del archivo de origen en 'cantidad' párrafos, sin construirlos.
+        Permite completar el índice de a tramos. Retorna True si todavía falta indexar.
+        """
+        if self._fuente is None:
+            return False
+        self._fuente.indexar_hasta(len(self._fuente) + cantidad)
+        return not self._fuente.completo()
+
+    def parrafos_pendientes(self) -> Optional[Tuple[FuenteArchivo, int, int]]:
+        """
+        (archivo de origen, índice de su primer párrafo sin cargar, ancho con que se cargaría)
+        si quedan párrafos sin cargar; None si el documento está completo en memoria.
+        """
+        if self.cargado_completo():
+            return None
+        return self._fuente, self._siguiente_fuente, self._ancho_fuente
+
+    def instantanea_texto(self) -> Tuple[List[str], Optional[Tuple[FuenteArchivo, int, int]]]:
+        """
+        Texto plano del documento: los párrafos cargados (palabras separadas por un espacio)
+        y, si quedan párrafos sin cargar, (archivo de origen, bytes [inicio, fin) de su texto).
+        """
+        parrafos = [" ".join(p.texto for p in parrafo.palabras() if p.texto) for parrafo in self.parrafos]
+        resto = None
+        if not self.cargado_completo():
+            resto = (self._fuente, self._fuente.posicion(self._siguiente_fuente), self._fuente.fin_texto)
+        return parrafos, resto
 
+    def _cargar_siguiente_parrafo(self) -> bool:
+        """Construye el próximo párrafo del archivo y lo agrega al final. Retorna si había uno."""
+        if self._fuente is None or not self._fuente.indexar_hasta(self._siguiente_fuente + 1):
+            return False
+        parrafo = self._fuente.parrafo(self._siguiente_fuente, self._ancho_fuente)
+        self._siguiente_fuente += 1
+        self._insertar_parrafos(len(self.parrafos), [parrafo]) # Cargar no es editar: no va al diario
+        return True
+
+    def cargar_todo(self):
+        """Construye y pagina todos los párrafos que quedan en el archivo de origen."""
+        if self.cargado_completo():
+            return
+        while self._cargar_siguiente_parrafo():
+            pass
+        self.actualizar_paginas()
+
+    def indice_palabras(self) -> IndicePalabras:
+        """
+        Índice invertido de las palabras del documento. Se construye la primera vez (cargando
+        el resto del archivo de origen) y desde entonces se mantiene con palabras_modificadas.
+        """
+        if self._indice_palabras is None:
+            self.cargar_todo()
+            self._indice_palabras = IndicePalabras(self)
+        return self._indice_palabras
+
+    def palabras_modificadas(self, palabras: Iterable[Palabra]):
+        """Avisa al índice de palabras (si existe) que el texto o la ubicación de estas palabras cambió."""
+        if self._indice_palabras is not None:
+            self._indice_palabras.marcar_todas(palabras)
+
+    def asegurar_parrafo(self, indice: int):
+        """Carga (y pagina) párrafos del archivo hasta que exista el párrafo indicado."""
+        if indice >= len(self.parrafos):
+            while indice >= len(self.parrafos) and self._cargar_siguiente_parrafo():
+                pass
+            self.actualizar_paginas()
+
+    def asegurar_paginas(self, num_pagina: int):
+        """
+        Carga párrafos del archivo hasta que la página num_pagina esté completa
+        (existe la página siguiente) o hasta agotar el archivo.
+        """
+        while len(self.hijos) <= num_pagina + 1 and self._cargar_siguiente_parrafo():
+            self.actualizar_paginas()
 
     def agregar_pagina(self, pagina: Pagina):
-        self.hijos.append(pagina)
+        """Compatibilidad: registra los párrafos de la página como párrafos lógicos."""
+        for parrafo in pagina.hijos:
+            if isinstance(parrafo, SegmentoParrafo):
+                parrafo = parrafo.parrafo
+            if parrafo.parent is not self:
+                self.agregar_parrafo(parrafo)
+
+    def agregar_parrafo(self, parrafo: Parrafo):
+        self.insertar_parrafo(len(self.parrafos), parrafo)
+
+    def insertar_parrafo(self, indice: int, parrafo: Parrafo):
+        """Inserta un párrafo lógico en la posición indicada."""
+        self.insertar_parrafos(indice, [parrafo])
+
+    def insertar_parrafos(self, indice: int, parrafos: List[Parrafo]):
+        """Inserta varios párrafos consecutivos; los posteriores se renumeran una sola vez."""
+        if parrafos and self.diario is not None:
+            self.diario.parrafos_insertados(indice, parrafos)
+        self._insertar_parrafos(indice, parrafos)
+
+    def _insertar_parrafos(self, indice: int, parrafos: List[Parrafo]):
+        if not parrafos:
+            return
+        for parrafo in parrafos:
+            parrafo.parent = self
+            parrafo.linea_global = None
+            self.parrafo_modificado(parrafo.contar_palabras(), parrafo.contar_lineas())
+            self._parrafos_sucios.add(parrafo)
+            if self._indice_palabras is not None:
+                self._indice_palabras.marcar_todas(parrafo.palabras())
+        self.parrafos[indice:indice] = parrafos
+        if self._hasta_parrafo is not None and self._hasta_parrafo >= indice:
+            self._hasta_parrafo += len(parrafos)
+        self._cambio_estructural(indice)
+
+    def eliminar_parrafo(self, parrafo: Parrafo):
+        """Quita un párrafo lógico del documento."""
+        indice = parrafo.indice
+        if indice >= len(self.parrafos) or self.parrafos[indice] is not parrafo:
+            indice = self.parrafos.index(parrafo)
+        self.eliminar_parrafos(indice, indice + 1)
+
+    def eliminar_parrafos(self, desde: int, hasta: int) -> List[Parrafo]:
+        """Quita los párrafos [desde, hasta) y los retorna; los posteriores se renumeran una vez."""
+        eliminados = self.parrafos[desde:hasta]
+        if not eliminados:
+            return eliminados
+        if self.diario is not None:
+            self.diario.parrafos_eliminados(desde, desde + len(eliminados))
+        del self.parrafos[desde:hasta]
+        for parrafo in eliminados:
+            parrafo.parent = None
+            self.parrafo_modificado(-parrafo.contar_palabras(), -parrafo.contar_lineas())
+            self._parrafos_sucios.discard(parrafo)
+            if self._indice_palabras is not None:
+                self._indice_palabras.marcar_todas(parrafo.palabras())
+        if self._hasta_parrafo is not None and self._hasta_parrafo > desde:
+            self._hasta_parrafo = max(desde, self._hasta_parrafo - len(eliminados))
+        self._cambio_estructural(desde)
+        return eliminados
+
+    def _cambio_estructural(self, indice: int):
+        for i in range(indice, len(self.parrafos)):
+            self.parrafos[i].indice = i
+        if self._desde_parrafo is None or indice < self._desde_parrafo:
+            self._desde_parrafo = indice
+        if self._hasta_parrafo is None or indice > self._hasta_parrafo:
+            self._hasta_parrafo = indice
+
+    def marcar_parrafo_sucio(self, parrafo: Parrafo):
+        self._parrafos_sucios.add(parrafo)
+
+    def parrafo_editado(self, parrafo: Parrafo):
+        """Avisa al diario (si hay) que el texto o el formato del párrafo cambió (el reflow no avisa)."""
+        if self.diario is not None:
+            self.diario.parrafo_editado(parrafo)
+
+    def parrafo_modificado(self, delta_palabras: int, delta_lineas: int):
+        """Recibe la variación de conteos de un párrafo lógico."""
+        self._palabras += delta_palabras
+        self._lineas += delta_lineas
 
 
     def actualizar_paginas(self):
         """
-        Aplica reflow a todos los párrafos y recalcula la división en páginas.
-        Solución robusta que itera línea por línea.
+        Aplica reflow a los párrafos editados y recalcula la división en páginas de forma
+        incremental: solo se repagina desde la página donde cambió la cantidad de líneas,
+        y se detiene cuando un párrafo posterior vuelve a empezar en la misma línea global
+        que en el maquetado anterior (a partir de ahí las páginas viejas siguen siendo válidas).
         """
-        
-        # 1. Consolidar TODOS los párrafos existentes
-        todos_los_parrafos: List[Parrafo] = []
-        for pagina in self.hijos:
-            todos_los_parrafos.extend(pagina.hijos)
+        maximo = Pagina.MAX_LINEAS_POR_PAGINA
+
+        # 1. Reflow de los párrafos editados y detección de cambios en su cantidad de líneas
+        sucios = list(self._parrafos_sucios)
+        if sucios:
+            with INSTRUMENTACION.medir("reflow"):
+                if self.maquetador is not None:
+                    self.maquetador.maquetar([p for p in sucios if p.requiere_reflow_completo()])
+                for parrafo in sucios:
+                    parrafo.aplicar_reflow()
+        self._parrafos_sucios.clear()
+
+        desde_parrafo = self._desde_parrafo
+        ultimo_sucio = -1 if self._hasta_parrafo is None else self._hasta_parrafo
+        primer_sucio = len(self.parrafos) if desde_parrafo is None else desde_parrafo
+        linea_inicio: Optional[int] = None
+        for parrafo in sucios:
+            cambiada = parrafo.primera_linea_cambiada
+            parrafo.primera_linea_cambiada = None
+            if parrafo.parent is not self or parrafo.linea_global is None:
+                continue
+            if len(parrafo.hijos) == parrafo.lineas_paginadas:
+                continue # Mismas líneas: los segmentos (vistas en vivo) siguen siendo válidos
+            global_cambio = parrafo.linea_global + (cambiada or 0)
+            if linea_inicio is None or global_cambio < linea_inicio:
+                linea_inicio = global_cambio
+            ultimo_sucio = max(ultimo_sucio, parrafo.indice)
+            primer_sucio = min(primer_sucio, parrafo.indice)
+
+        if desde_parrafo is not None:
+            # Un cambio estructural arranca desde el final del párrafo previo
+            global_estructural = 0
+            if desde_parrafo > 0:
+                previo = self.parrafos[desde_parrafo - 1]
+                global_estructural = previo.linea_global + previo.lineas_paginadas
+            if linea_inicio is None or global_estructural < linea_inicio:
+                linea_inicio = global_estructural
+        self._desde_parrafo = self._hasta_parrafo = None
+
+        if linea_inicio is None:
+            return
 
-        # 2. Aplicar reflow a todos los párrafos existentes
-        for parrafo in todos_los_parrafos:
-            parrafo.aplicar_reflow()
-            
-        # 3. Recalcular la división de páginas línea por línea
+        # 2. Ubicar el párrafo y la línea donde empieza la primera página a rehacer
+        num_pagina = min(linea_inicio // maximo, len(self.hijos))
+        global_actual = num_pagina * maximo
+        idx = self._parrafo_en_linea_global(global_actual, primer_sucio)
+        primero = idx
+        desde_linea = 0
+        if idx < len(self.parrafos):
+            linea_previa = self.parrafos[idx].linea_global
+            if linea_previa is not None and linea_previa <= global_actual:
+                desde_linea = global_actual - linea_previa
+
+        # 3. Repaginar línea por línea hasta recuperar el maquetado anterior
         paginas_nuevas: List[Pagina] = []
         pagina_actual = Pagina()
         lineas_en_pagina = 0
-        
-
-        for parrafo_original in todos_los_parrafos:
-            
-            # Inicializamos el párrafo recreado y mantenemos la alineación
-            parrafo_recreado = Parrafo(ancho_linea=parrafo_original.ancho_linea)
-            # 🚨 FIX STABILITY: Necesitamos acceder a la alineación de la primera línea (si existe)
-            alineacion_parrafo = parrafo_original.hijos[0].alineacion if parrafo_original.hijos else None
-            if alineacion_parrafo:
-                 parrafo_recreado.cambiar_alineacion(alineacion_parrafo)
-            
-            # Recorremos cada línea del párrafo ya formateado
-            for linea in parrafo_original.hijos:
-                linea_count = 1 
-                
-                # A) Lógica de Cambio de Página (utiliza la constante MAX_LINEAS_POR_PAGINA de Pagina)
-                if lineas_en_pagina + linea_count > Pagina.MAX_LINEAS_POR_PAGINA:
-                    # 1. Finalizamos y agregamos el párrafo actual a la página actual.
-                    if parrafo_recreado.hijos:
-                        pagina_actual.agregar_parrafo(parrafo_recreado)
-
-                    # 2. Finalizamos la página actual e iniciamos una nueva.
-                    if pagina_actual.hijos:
-                        paginas_nuevas.append(pagina_actual)
-                    
-                    pagina_actual = Pagina()
-                    lineas_en_pagina = 0
-                    
-                    # 3. Creamos un NUEVO párrafo recreado para la nueva página
-                    parrafo_recreado = Parrafo(ancho_linea=parrafo_original.ancho_linea)
-                    if alineacion_parrafo:
-                         parrafo_recreado.cambiar_alineacion(alineacion_parrafo)
 
+        while idx < len(self.parrafos):
+            parrafo = self.parrafos[idx]
 
-                # B) Agregamos la línea al párrafo recreado
-                parrafo_recreado.agregar_linea(linea)
-                lineas_en_pagina += linea_count
-            
-            # C) Una vez que se terminaron las líneas del párrafo original, 
-            # agregamos el último segmento de párrafo recreado a la página.
-            if parrafo_recreado.hijos and parrafo_recreado not in pagina_actual.hijos:
-                pagina_actual.agregar_parrafo(parrafo_recreado)
+            if desde_linea == 0:
+                # Punto de parada: párrafo limpio que empieza donde empezaba antes
+                if idx > ultimo_sucio and parrafo.linea_global == global_actual:
+                    if INSTRUMENTACION.activa:
+                        INSTRUMENTACION.contar("parrafos_paginados", idx - primero)
+                    self._empalmar(num_pagina, paginas_nuevas, pagina_actual, parrafo, global_actual)
+                    return
+                parrafo.indice = idx
+                parrafo.linea_global = global_actual
 
+            total = len(parrafo.hijos)
+            parrafo.lineas_paginadas = total
+            while desde_linea < total:
+                # Lógica de Cambio de Página (utiliza la constante MAX_LINEAS_POR_PAGINA de Pagina)
+                if lineas_en_pagina == maximo:
+                    paginas_nuevas.append(pagina_actual)
+                    pagina_actual = Pagina()
+                    lineas_en_pagina = 0
+                toma = min(total - desde_linea, maximo - lineas_en_pagina)
+                pagina_actual.agregar_parrafo(SegmentoParrafo(parrafo, desde_linea, desde_linea + toma))
+                lineas_en_pagina += toma
+                desde_linea += toma
+                global_actual += toma
+
+            idx += 1
+            desde_linea = 0
 
+        if INSTRUMENTACION.activa:
+            INSTRUMENTACION.contar("parrafos_paginados", idx - primero)
         # Añadir la última página
         if pagina_actual.hijos:
             paginas_nuevas.append(pagina_actual)
-            
-        self.hijos = paginas_nuevas
+        self.hijos[num_pagina:] = paginas_nuevas
 
+    def _parrafo_en_linea_global(self, global_linea: int, primer_sucio: int) -> int:
+        """
+        Índice del párrafo que contiene la línea global indicada. Los párrafos anteriores
+        al primer párrafo modificado conservan su posición, así que se retrocede desde él
+        (cada párrafo ocupa al menos una línea: son pocos pasos).
+        """
+        idx = min(primer_sucio, len(self.parrafos) - 1)
+        while idx > 0 and (self.parrafos[idx].linea_global is None
+                           or self.parrafos[idx].linea_global > global_linea):
+            idx -= 1
+        return max(idx, 0)
+
+    def _empalmar(self, num_pagina: int, paginas_nuevas: List[Pagina], pagina_actual: Pagina,
+                  parrafo: Parrafo, global_actual: int):
+        """Une las páginas rehechas con las páginas viejas a partir de 'parrafo'."""
+        pagina_vieja = global_actual // Pagina.MAX_LINEAS_POR_PAGINA
+        if global_actual % Pagina.MAX_LINEAS_POR_PAGINA == 0:
+            if pagina_actual.hijos:
+                paginas_nuevas.append(pagina_actual)
+            self.hijos[num_pagina:pagina_vieja] = paginas_nuevas
+            return
+        # La página del punto de empalme mezcla segmentos nuevos y viejos
+        vieja = self.hijos[pagina_vieja]
+        inicio = next(i for i, s in enumerate(vieja.hijos) if s.parrafo is parrafo)
+        for segmento in vieja.hijos[inicio:]:
+            pagina_actual.agregar_parrafo(segmento)
+        self.hijos[num_pagina:pagina_vieja + 1] = paginas_nuevas + [pagina_actual]
+
+
+    def posicion_de(self, palabra: Palabra) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Índice de posiciones: retorna (página, segmento en la página, línea en el segmento,
+        palabra en la línea) en O(1) a partir de los índices que mantienen el reflow y la
+        paginación. Retorna None si la palabra no pertenece al documento.
+        """
+        linea = palabra.parent
+        parrafo = linea.parent if linea is not None else None
+        if parrafo is None or parrafo.parent is not self or parrafo.linea_global is None:
+            return None
+        num_linea = parrafo.indice_de(linea)
+        num_pagina = (parrafo.linea_global + num_linea) // Pagina.MAX_LINEAS_POR_PAGINA
+        if num_pagina >= len(self.hijos):
+            return None
+        for num_segmento, segmento in enumerate(self.hijos[num_pagina].hijos):
+            if segmento.parrafo is parrafo and segmento.inicio <= num_linea < segmento.fin:
+                return (num_pagina, num_segmento, num_linea - segmento.inicio, linea.indice_de(palabra))
+        return None
+
+    def palabra_en(self, num_pagina: int, num_segmento: int, num_linea: int, num_palabra: int) -> Palabra:
+        """Búsqueda inversa del índice de posiciones: coordenadas -> Palabra, en O(1)."""
+        segmento = self.hijos[num_pagina].hijos[num_segmento]
+        linea = segmento.parrafo.hijos[segmento.inicio + num_linea]
+        return linea.get_palabra(num_palabra)
 
     def contar_palabras(self) -> int:
-        return sum(p.contar_palabras() for p in self.hijos)
+        """O(1): valor mantenido por deltas desde las palabras."""
+        return self._palabras
 
     def contar_lineas(self) -> int:
-        return sum(p.contar_lineas() for p in self.hijos)
+        """O(1): suma de las líneas visuales de los párrafos lógicos."""
+        return self._lineas
 
     def contar_paginas(self) -> int:
         return len(self.hijos)
 
     def contar_parrafos(self) -> int:
-        return sum(len(pagina.hijos) for pagina in self.hijos)
+        """
+        Cuenta párrafos lógicos (un párrafo partido entre páginas cuenta una vez), incluidos
+        los ya ubicados en el archivo de origen pero todavía no cargados.
+        """
+        pendientes = len(self._fuente) - self._siguiente_fuente if self._fuente is not None else 0
+        return len(self.parrafos) + pendientes
 
-    def mostrar(self) -> str:
+    def iterar_lineas(self, desde_pagina: int = 0) -> Iterator[Tuple[int, Optional[Linea], str]]:
+        """
+        Recorre de forma perezosa la vista del documento a partir de una página.
+        Produce (página, línea, texto): texto es el render de la línea (que puede ocupar
+        varias filas si una palabra larga se divide) o, con línea None, la decoración
+        entre páginas y segmentos. Concatenar los textos equivale a mostrar().
+        """
         separador = "=" * 40
-        salida = []
-        for i, pagina in enumerate(self.hijos, start=1):
-            salida.append(f"{separador}\n📄 Página {i}\n{separador}\n{pagina.mostrar()}")
-        return "\n\n".join(salida)
\ No newline at end of file
+        num_pagina = desde_pagina
+        while True:
+            self.asegurar_paginas(num_pagina)
+            if num_pagina >= len(self.hijos):
+                return
+            prefijo = "\n\n" if num_pagina > 0 else ""
+            yield num_pagina, None, f"{prefijo}{separador}\n📄 Página {num_pagina + 1}\n{separador}\n"
+            for num_segmento, segmento in enumerate(self.hijos[num_pagina].hijos):
+                if num_segmento > 0:
+                    yield num_pagina, None, "\n\n"
+                for linea in segmento.hijos:
+                    yield num_pagina, linea, linea.mostrar()
+            num_pagina += 1
+
+    def mostrar(self) -> str:
+        with INSTRUMENTACION.medir("mostrar"):
+            return "".join(texto for _, _, texto in self.iterar_lineas())
@@ -0,0 +1,97 @@
+import mmap
+import os
+import re
+from array import array
+from typing import BinaryIO, Optional, Tuple
+from src.composite.parrafo import Parrafo, parrafo_desde_palabras
+
+
+class FuenteArchivo:
+    """
+    Archivo de texto abierto con mmap e índice de posiciones (en bytes) de sus párrafos.
+    Patrón de Diseño: Virtual Proxy (el texto se lee del mapa recién cuando se pide un párrafo).
+    Ítem de Cambio Oculto: Cómo se ubican y se leen los párrafos de un archivo en disco.
+
+    El índice se construye con un único recorrido del archivo que avanza a demanda:
+    abrir no lee nada y cada párrafo se ubica la primera vez que alguien lo necesita.
+    Los párrafos se separan por una línea en blanco: vacía o con solo espacios, con saltos de
+    línea \n o \r\n (el mismo criterio que al pegar un bloque de texto).
+    """
+    SEPARADOR = b"\n\n" # El que se escribe entre párrafos
+    _LINEA_EN_BLANCO = re.compile(rb"\n[ \t\r]*\n")
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        self.tamanio = os.fstat(self._archivo.fileno()).st_size
+        # mmap no admite archivos vacíos
+        self._mapa: Optional[mmap.mmap] = (
+            mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ) if self.tamanio else None
+        )
+        # Índice: [inicio, fin) en bytes de cada párrafo encontrado hasta ahora
+        self._inicios = array("q")
+        self._fines = array("q")
+        self._escaneado = 0 # Bytes ya recorridos por el índice
+        # Fin del texto de los párrafos (un formato con datos después del texto lo adelanta)
+        self.fin_texto = self.tamanio
+
+    def __len__(self) -> int:
+        """Párrafos indexados hasta el momento (ver completo())."""
+        return len(self._inicios)
+
+    def completo(self) -> bool:
+        return self._escaneado >= self.tamanio
+
+    def indexar_hasta(self, cantidad: int) -> bool:
+        """Avanza el recorrido hasta tener 'cantidad' párrafos. Retorna si se alcanzó."""
+        mapa = self._mapa
+        while len(self._inicios) < cantidad and self._escaneado < self.tamanio:
+            inicio = self._escaneado
+            separador = self._LINEA_EN_BLANCO.search(mapa, inicio)
+            fin = self.tamanio if separador is None else separador.start()
+            self._escaneado = self.tamanio if separador is None else separador.end()
+            if mapa[inicio:fin].strip(): # Se saltean los tramos en blanco (varias líneas vacías)
+                self._inicios.append(inicio)
+                self._fines.append(fin)
+        return len(self._inicios) >= cantidad
+
+    def indexar_todo(self) -> int:
+        """Completa el recorrido del archivo y retorna la cantidad total de párrafos."""
+        while not self.completo():
+            self.indexar_hasta(len(self._inicios) + 1)
+        return len(self._inicios)
+
+    def posicion(self, indice: int) -> int:
+        """Byte donde empieza el párrafo indicado (o donde sigue el recorrido si aún no se indexó)."""
+        if indice < len(self._inicios):
+            return self._inicios[indice]
+        return self._escaneado
+
+    def fin(self, indice: int) -> int:
+        """Byte donde termina el párrafo indicado (ya indexado)."""
+        return self._fines[indice]
+
+    def limites(self, desde: int) -> Tuple[array, array]:
+        """Inicios y fines (en bytes) de los párrafos indexados a partir de 'desde'."""
+        return self._inicios[desde:], self._fines[desde:]
+
+    def texto(self, indice: int) -> str:
+        """Texto del párrafo indicado, leído del mapa de memoria."""
+        return self._mapa[self._inicios[indice]:self._fines[indice]].decode("utf-8", errors="replace")
+
+    def parrafo(self, indice: int, ancho_linea: int) -> Parrafo:
+        """Construye el párrafo indicado, pendiente de reflow."""
+        return parrafo_desde_palabras(self.texto(indice).split(), ancho_linea)
+
+    def copiar(self, inicio: int, fin: int, salida: BinaryIO) -> int:
+        """Escribe los bytes [inicio, fin) del archivo en 'salida' sin copiarlos a memoria. Retorna los bytes."""
+        if self._mapa is None or fin <= inicio:
+            return 0
+        with memoryview(self._mapa) as vista:
+            return salida.write(vista[inicio:fin])
+
+    def cerrar(self) -> None:
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+        self._archivo.close()
@@ -1,7 +1,24 @@
-from typing import List
+from typing import List, Optional, TYPE_CHECKING
 from src.composite.palabra import Palabra
 from src.composite.component_main import ComponenteDocumento
 from src.strategy.alineacion_strategy import IStrategyAlineacion, AlineacionIzquierda
+from src.render.cache_lineas import CACHE_RENDER
+
+if TYPE_CHECKING:
+    from src.composite.parrafo import Parrafo
+
+
+def indice_en(hijos: list, hijo) -> int:
+    """
+    Posición de un hijo usando su atributo 'indice' como pista; si la pista quedó
+    desactualizada se recurre a una búsqueda lineal y se corrige.
+    """
+    i = hijo.indice
+    if 0 <= i < len(hijos) and hijos[i] is hijo:
+        return i
+    i = hijos.index(hijo)
+    hijo.indice = i
+    return i
 
 class Linea(ComponenteDocumento):
     """
@@ -9,33 +26,156 @@ class Linea(ComponenteDocumento):
     Patrón de Diseño: Composite (Component) / Strategy (Context).
     Ítem de Cambio Oculto: Lógica de formato y ancho fijo (a través de Strategy).
     """
+    __slots__ = ("hijos", "ancho", "alineacion", "parent", "indice", "_palabras", "_visuales",
+                 "version", "_render", "_render_version")
     def __init__(self, ancho: int = 40):
         self.hijos: List[Palabra] = []
         self.ancho = ancho
         self.alineacion: IStrategyAlineacion = AlineacionIzquierda()
+        self.parent: Optional['Parrafo'] = None # Referencia al padre (Parrafo)
+        self.indice = 0 # Posición dentro del párrafo (la mantiene Parrafo)
+        # Conteos cacheados: se actualizan por deltas cuando cambia una palabra
+        self._palabras = 0
+        self._visuales = 0
+        # Versión del contenido: se incrementa en cada mutación e invalida el render cacheado
+        self.version = 0
+        self._render = ""
+        self._render_version = -1
 
     def agregar_palabra(self, palabra: Palabra):
         """Agrega una palabra a la línea y establece la referencia al padre."""
         palabra.parent = self # Establece la referencia al padre
+        palabra.indice = len(self.hijos)
         self.hijos.append(palabra)
+        self.version += 1
+        self.palabra_modificada(palabra.contar_palabras())
+
+    def insertar_palabra(self, index: int, palabra: Palabra):
+        """Inserta una palabra en la posición index y marca la línea para reflow."""
+        palabra.parent = self
+        self.hijos.insert(index, palabra)
+        for i in range(index, len(self.hijos)):
+            self.hijos[i].indice = i
+        self.marcar_sucia(palabra)
+        self.palabra_modificada(palabra.contar_palabras())
+
+    def empalmar(self, desde: int, hasta: int, palabras: List[Palabra]) -> List[Palabra]:
+        """
+        Reemplaza hijos[desde:hasta] por 'palabras', marca la línea para reflow y retorna las
+        quitadas (quedan sin padre). Cuesta O(palabras de la línea a partir de 'desde').
+        """
+        quitadas = self.hijos[desde:hasta]
+        delta = 0
+        for palabra in quitadas:
+            delta -= palabra.contar_palabras()
+            if palabra.parent is self:
+                palabra.parent = None
+        for palabra in palabras:
+            palabra.parent = self
+            delta += palabra.contar_palabras()
+        self.hijos[desde:hasta] = palabras
+        for i in range(desde, len(self.hijos)):
+            self.hijos[i].indice = i
+        self.marcar_sucia()
+        self.palabra_modificada(delta)
+        return quitadas
+
+    def reemplazar_palabras(self, palabras: List[Palabra], cantidad: Optional[int] = None):
+        """
+        Usado por el reflow: reemplaza el contenido completo y recalcula los conteos.
+        'cantidad' son las palabras que cuentan, si el llamador ya las conoce.
+        """
+        self.hijos = palabras
+        self.version += 1
+        if cantidad is None:
+            nuevo = 0
+            for i, palabra in enumerate(palabras):
+                palabra.parent = self
+                palabra.indice = i
+                nuevo += palabra.contar_palabras()
+        else:
+            nuevo = cantidad
+            for i, palabra in enumerate(palabras):
+                palabra.parent = self
+                palabra.indice = i
+        delta = nuevo - self._palabras
+        self._palabras = nuevo
+        self._actualizar_conteos(delta)
+
+    def palabra_modificada(self, delta_palabras: int):
+        """Recibe la variación del conteo de una palabra hija y la propaga al párrafo."""
+        self._palabras += delta_palabras
+        self._actualizar_conteos(delta_palabras)
+
+    def _actualizar_conteos(self, delta_palabras: int):
+        previo = self._visuales
+        self._visuales = self._calcular_visuales()
+        if self.parent is not None and (delta_palabras or self._visuales != previo):
+            self.parent.linea_modificada(delta_palabras, self._visuales - previo)
+
+    def _calcular_visuales(self) -> int:
+        """
+        Líneas visuales que aporta la línea: 0 si solo tiene la palabra vacía del cursor,
+        varias si tiene una única palabra más larga que el ancho (división visual), o 1.
+        """
+        if self._palabras == 0:
+            return 0
+        if self._palabras == 1:
+            for p in self.hijos:
+                if p.contar_palabras():
+                    if p.longitud() > self.ancho:
+                        largo = len(p.texto.strip())
+                        if largo > self.ancho:
+                            return (largo + self.ancho - 1) // self.ancho
+                    break
+        return 1
+
+    def marcar_sucia(self, palabra: Optional[Palabra] = None):
+        """
+        Avisa al párrafo que el contenido de esta línea cambió y debe reflujarse
+        ('palabra' es la que cambió o se insertó, si se conoce).
+        """
+        self.version += 1
+        if self.parent is not None:
+            self.parent.marcar_linea_sucia(self, palabra)
 
     def get_palabra(self, index: int) -> Palabra:
         """Asegura que exista la palabra en el índice (rellenando con vacías si es necesario)."""
         while len(self.hijos) <= index:
             # Al crear Palabra vacía, asignarle el padre (self)
-            self.hijos.append(Palabra("", parent=self)) 
+            self.agregar_palabra(Palabra("", parent=self))
         return self.hijos[index]
 
+    def indice_de(self, palabra: Palabra) -> int:
+        """Posición de la palabra en la línea: O(1) usando el índice que mantiene la línea."""
+        return indice_en(self.hijos, palabra)
+
     def contar_palabras(self) -> int:
-        return sum(p.contar_palabras() for p in self.hijos)
+        return self._palabras
+
+    def contar_lineas_visuales(self) -> int:
+        """Líneas que la línea ocupa en pantalla (ver _calcular_visuales)."""
+        return self._visuales
     
     def contar_lineas(self) -> int:
         """Una línea cuenta como 1."""
         return 1
 
     def cambiar_alineacion(self, nueva_alineacion: IStrategyAlineacion):
+        if type(nueva_alineacion) is not type(self.alineacion):
+            self.version += 1
         self.alineacion = nueva_alineacion
 
     def mostrar(self) -> str:
-        palabras_texto = [p.texto for p in self.hijos if p.texto]
+        return CACHE_RENDER.render(self)
+
+    def mostrar_con_cursor(self, palabra_cursor: Palabra, offset: int) -> str:
+        """Render de la línea con el cursor '|' dibujado en la palabra indicada (no modifica el modelo)."""
+        palabras_texto = []
+        for p in self.hijos:
+            texto = p.texto
+            if p is palabra_cursor:
+                texto = texto[:offset] + "|" + texto[offset:]
+            if texto:
+                palabras_texto.append(texto)
         return self.alineacion.aplicar_alineacion(palabras_texto, self.ancho)
\ No newline at end of file
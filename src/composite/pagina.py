@@ -1,5 +1,6 @@
-from typing import List
+from typing import List, Union
 from src.composite.parrafo import Parrafo
+from src.composite.segmento_parrafo import SegmentoParrafo
 from src.composite.component_main import ComponenteDocumento
 
 class Pagina(ComponenteDocumento):
@@ -8,13 +9,16 @@ class Pagina(ComponenteDocumento):
     Patrón de Diseño: Composite (Component).
     Ítem de Cambio Oculto: Límite físico de contenido (MAX_LINEAS_POR_PAGINA).
     """
+    __slots__ = ("hijos",)
+
     # 🚨 FIX CRUCIAL: Límite de 8 líneas.
     MAX_LINEAS_POR_PAGINA = 8
 
     def __init__(self):
-        self.hijos: List[Parrafo] = []
+        # Documento llena las páginas con SegmentoParrafo (vistas de párrafos lógicos)
+        self.hijos: List[Union[Parrafo, SegmentoParrafo]] = []
 
-    def agregar_parrafo(self, parrafo: Parrafo):
+    def agregar_parrafo(self, parrafo: Union[Parrafo, SegmentoParrafo]):
         self.hijos.append(parrafo)
 
     def dividir_en_paginas(self) -> List["Pagina"]:
@@ -1,35 +1,107 @@
 from .component_main import ComponenteDocumento
-from typing import TYPE_CHECKING, Any
+from .tabla_piezas import TablaPiezas, Pieza
+from typing import TYPE_CHECKING, Any, List, Optional
 
 # Evita dependencias circulares usando TYPE_CHECKING
 if TYPE_CHECKING:
     from .linea import Linea
 
+
+def _contar_no_blancos(texto: str) -> int:
+    """Cantidad de caracteres que no son espacios en blanco."""
+    return len("".join(texto.split())) if texto else 0
+
 class Palabra(ComponenteDocumento):
     """
     Representa una palabra en el documento. Es el elemento terminal o Hoja.
     Patrón de Diseño: Composite (Leaf).
     Ítem de Cambio Oculto: La representación mínima de texto y su longitud.
+    Mientras se edita, el texto vive en una TablaPiezas y '_texto' es su vista materializada,
+    cacheada hasta la siguiente edición (None si quedó desactualizada). La tabla se crea recién
+    en la primera edición y compactar() la suelta cuando se termina de editar la palabra: una
+    palabra que no se está editando (p. ej. cargada de un archivo) guarda solo su texto.
     """
+    __slots__ = ("_texto", "_tabla", "_no_blancos", "parent", "indice", "_indexada")
 
-    def __init__(self, texto: str = "", parent: 'Linea' | None = None):
-        self.texto = texto
+    def __init__(self, texto: str = "", parent: Optional['Linea'] = None):
+        self._texto: Optional[str] = texto
+        self._tabla: Optional[TablaPiezas] = None
+        # Caracteres no blancos: permite saber si la palabra cuenta sin materializar el texto
+        self._no_blancos = _contar_no_blancos(texto)
         self.parent = parent # Referencia al padre (Linea)
+        self.indice = 0 # Posición dentro de la línea (la mantiene Linea)
+        self._indexada: Optional[str] = None # Forma con la que figura en el IndicePalabras
+
+    @property
+    def texto(self) -> str:
+        texto = self._texto
+        if texto is None:
+            texto = self._texto = self._tabla.texto()
+        return texto
+
+    @texto.setter
+    def texto(self, valor: str):
+        cuenta_previa = self.contar_palabras()
+        self._texto = valor
+        self._tabla = None
+        self._no_blancos = _contar_no_blancos(valor)
+        self._notificar_cambio(cuenta_previa)
+
+    def _tabla_edicion(self) -> TablaPiezas:
+        """Tabla de piezas de la palabra (se crea a partir del texto en la primera edición)."""
+        if self._tabla is None:
+            self._tabla = TablaPiezas(self._texto)
+        return self._tabla
+
+    def compactar(self):
+        """Suelta la tabla de piezas (se terminó de editar la palabra): queda solo el texto."""
+        if self._tabla is not None:
+            self._texto = self.texto
+            self._tabla = None
+
+    def _notificar_cambio(self, cuenta_previa: int):
+        """Marca la línea contenedora como sucia y le propaga la variación del conteo."""
+        if self.parent is not None:
+            self.parent.marcar_sucia(self)
+            self.parent.palabra_modificada(self.contar_palabras() - cuenta_previa)
+
+    def insertar_caracter(self, index: int, char: str) -> Pieza:
+        """Inserta un caracter en la posición index. Retorna la pieza insertada."""
+        tabla = self._tabla_edicion()
+        if index < 0 or index > len(tabla):
+            index = len(tabla)
+        cuenta_previa = self.contar_palabras()
+        pieza = tabla.insertar(index, char)
+        self._texto = None
+        self._no_blancos += _contar_no_blancos(char)
+        self._notificar_cambio(cuenta_previa)
+        return pieza
+
+    def eliminar_caracter(self, index: int) -> List[Pieza]:
+        """Elimina un caracter en la posición index. Retorna las piezas eliminadas."""
+        return self.eliminar_tramo(index, 1)
 
-    def insertar_caracter(self, index: int, char: str):
-        """Inserta un caracter en la posición index."""
-        if index < 0 or index > len(self.texto):
-            index = len(self.texto)
-        self.texto = self.texto[:index] + char + self.texto[index:]
+    def insertar_piezas(self, index: int, piezas: List[Pieza]):
+        """Reinserta piezas ya existentes (usado por deshacer/rehacer, sin copiar texto)."""
+        cuenta_previa = self.contar_palabras()
+        self._tabla_edicion().insertar_piezas(index, piezas)
+        self._texto = None
+        self._no_blancos += sum(_contar_no_blancos(p.texto()) for p in piezas)
+        self._notificar_cambio(cuenta_previa)
 
-    def eliminar_caracter(self, index: int):
-        """Elimina un caracter en la posición index."""
-        if 0 <= index < len(self.texto):
-            self.texto = self.texto[:index] + self.texto[index+1:]
+    def eliminar_tramo(self, index: int, cantidad: int) -> List[Pieza]:
+        """Elimina 'cantidad' caracteres desde index y retorna las piezas eliminadas."""
+        cuenta_previa = self.contar_palabras()
+        piezas = self._tabla_edicion().eliminar(index, cantidad)
+        if piezas:
+            self._texto = None
+            self._no_blancos -= sum(_contar_no_blancos(p.texto()) for p in piezas)
+            self._notificar_cambio(cuenta_previa)
+        return piezas
 
     def contar_palabras(self) -> int:
-        """Cada palabra cuenta como 1 si no está vacía."""
-        return 1 if self.texto.strip() else 0
+        """Cada palabra cuenta como 1 si no está vacía (equivale a texto.strip() != "")."""
+        return 1 if self._no_blancos else 0
 
     def contar_lineas(self) -> int:
         """Una palabra no cuenta como línea por sí misma."""
@@ -39,4 +111,4 @@ class Palabra(ComponenteDocumento):
         return self.texto
 
     def longitud(self) -> int:
-        return len(self.texto)
\ No newline at end of file
+        return len(self._tabla) if self._texto is None else len(self._texto)
@@ -1,8 +1,25 @@
-from typing import List
+from typing import List, Optional, Set, Tuple, TYPE_CHECKING
 from src.composite.component_main import ComponenteDocumento
-from src.composite.linea import Linea
+from src.composite.linea import Linea, indice_en
 from src.composite.palabra import Palabra
 from src.strategy.alineacion_strategy import IStrategyAlineacion, AlineacionIzquierda 
+from src.strategy.corte_strategy import IStrategyCorte, CortePrimerAjuste, EstadoCorteOptimo
+from src.instrumentacion import INSTRUMENTACION
+
+if TYPE_CHECKING:
+    from src.composite.documento import Documento
+
+
+def contar_lineas_visuales(lineas: List[Linea]) -> int:
+    """
+    Cuenta las líneas visuales de una secuencia de líneas (párrafo o segmento de página).
+    Considera la división visual de palabras largas e ignora la línea del cursor vacía;
+    si no queda ninguna línea con contenido, la línea del cursor cuenta 1.
+    """
+    if not lineas:
+        return 0
+    return max(1, sum(l.contar_lineas_visuales() for l in lineas))
+
 
 class Parrafo(ComponenteDocumento):
     """
@@ -10,16 +27,58 @@ class Parrafo(ComponenteDocumento):
     y aplicar reflow.
     Patrón de Diseño: Composite (Component).
     Ítem de Cambio Oculto: Lógica de reflow y ancho máximo de línea.
+    Dónde se corta cada línea lo decide una Strategy de corte (primer ajuste por defecto).
     """
+    __slots__ = ("hijos", "ancho_linea", "_maquetado", "_lineas_sucias", "primera_linea_cambiada",
+                 "parent", "indice", "linea_global", "lineas_paginadas", "_palabras",
+                 "_suma_visuales", "_en_reflow", "corte", "_estado_corte")
     def __init__(self, ancho_linea: int = 40):
         self.hijos: List[Linea] = []
         self.ancho_linea = ancho_linea
+        # Estado del reflow incremental
+        self._maquetado = False
+        self._lineas_sucias: Set[Linea] = set()
+        # Primera línea reconstruida desde la última paginación (None si no cambió nada)
+        self.primera_linea_cambiada: Optional[int] = None
+        # Estado administrado por Documento para la paginación incremental
+        self.parent: Optional['Documento'] = None
+        self.indice = 0
+        self.linea_global: Optional[int] = None
+        self.lineas_paginadas: Optional[int] = None
+        # Conteos cacheados (palabras y suma de líneas visuales de las líneas hijas)
+        self._palabras = 0
+        self._suma_visuales = 0
+        self._en_reflow = False
+        # Criterio de corte de líneas y, si no es local, el estado de su último cálculo
+        self.corte: IStrategyCorte = CortePrimerAjuste()
+        self._estado_corte: Optional[EstadoCorteOptimo] = None
 
     def agregar_linea(self, linea: Linea):
+        lineas_previas = self.contar_lineas()
+        linea.parent = self # Establece la referencia al padre
+        linea.indice = len(self.hijos)
         self.hijos.append(linea)
+        self._palabras += linea.contar_palabras()
+        self._suma_visuales += linea.contar_lineas_visuales()
+        self._propagar_conteos(linea.contar_palabras(), lineas_previas)
+        if self._maquetado:
+            self.marcar_linea_sucia(linea)
+
+    def linea_modificada(self, delta_palabras: int, delta_visuales: int):
+        """Recibe la variación de conteos de una línea hija y la propaga al documento."""
+        lineas_previas = self.contar_lineas()
+        self._palabras += delta_palabras
+        self._suma_visuales += delta_visuales
+        if not self._en_reflow:
+            self._propagar_conteos(delta_palabras, lineas_previas)
+
+    def _propagar_conteos(self, delta_palabras: int, lineas_previas: int):
+        delta_lineas = self.contar_lineas() - lineas_previas
+        if self.parent is not None and (delta_palabras or delta_lineas):
+            self.parent.parrafo_modificado(delta_palabras, delta_lineas)
 
     def contar_palabras(self) -> int:
-        return sum(l.contar_palabras() for l in self.hijos)
+        return self._palabras
 
     def contar_lineas(self) -> int:
         """
@@ -27,40 +86,9 @@ class Parrafo(ComponenteDocumento):
         AJUSTE CLAVE: Considera la división visual de palabras largas y evita contar
         las líneas que solo contienen la palabra vacía del cursor.
         """
-        conteo_lineas = 0
-        ancho = self.ancho_linea
-        
-        # Bandera para saber si el párrafo tiene contenido real (no solo el cursor)
-        tiene_contenido_real = any(p.texto.strip() for linea in self.hijos for p in linea.hijos)
-        
-        for linea in self.hijos:
-            # Palabras con texto significativo en esta línea
-            palabras_con_texto = [p.texto.strip() for p in linea.hijos if p.texto.strip()]
-            
-            # Caso especial: Si el párrafo está esencialmente vacío, la línea del cursor cuenta 1.
-            if not tiene_contenido_real:
-                return 1 if self.hijos else 0
-
-            # Caso 1: La línea solo contiene la palabra vacía del cursor (y hay más contenido en el párrafo)
-            if not palabras_con_texto:
-                continue # Ignoramos esta línea, ya que es solo la línea de trabajo/cursor.
-
-            # Caso 2: Una única palabra que el reflow puso sola porque es demasiado larga (División Visual)
-            if len(palabras_con_texto) == 1 and len(palabras_con_texto[0]) > ancho:
-                largo_palabra = len(palabras_con_texto[0])
-                # Cuenta cuántas líneas visuales ocupa esta palabra
-                lineas_visuales = (largo_palabra + ancho - 1) // ancho 
-                conteo_lineas += lineas_visuales
-                continue
-                
-            # Caso 3: Línea estándar (reflow ya la manejó)
-            conteo_lineas += 1 
-
-        # Si el conteo resultó 0 (solo queda la línea del cursor y se ignoró), lo fijamos a 1
-        if conteo_lineas == 0 and self.hijos:
-            return 1
-            
-        return conteo_lineas
+        if not self.hijos:
+            return 0
+        return max(1, self._suma_visuales)
 
     def mostrar(self) -> str:
         # Usamos "".join() porque cada Linea (vía Strategy) ya devuelve el '\n'.
@@ -69,6 +97,19 @@ class Parrafo(ComponenteDocumento):
     def cambiar_alineacion(self, nueva_alineacion: IStrategyAlineacion):
         for linea in self.hijos:
             linea.cambiar_alineacion(nueva_alineacion)
+        if self.parent is not None:
+            self.parent.parrafo_editado(self)
+
+    def cambiar_corte(self, nuevo_corte: IStrategyCorte):
+        """Cambia el criterio de corte de líneas: el próximo reflow reorganiza el párrafo entero."""
+        if nuevo_corte is self.corte:
+            return
+        self.corte = nuevo_corte
+        self._estado_corte = None
+        self._maquetado = False
+        if self.parent is not None:
+            self.parent.marcar_parrafo_sucio(self)
+            self.parent.parrafo_editado(self)
 
     def _obtener_todas_las_palabras(self) -> List[Palabra]:
         """Extrae todas las palabras del párrafo en orden."""
@@ -78,68 +119,340 @@ class Parrafo(ComponenteDocumento):
             palabras.extend(p for p in linea.hijos if p.texto or (len(linea.hijos) == 1 and not p.texto))
         return palabras
 
-    def aplicar_reflow(self) -> None:
-        """Reorganiza las palabras en líneas respetando el ancho_linea y sin cortar palabras."""
-        todas = self._obtener_todas_las_palabras()
-        
-        # 1. Determinar la alineación actual antes de limpiar las líneas.
-        alineacion_previa = AlineacionIzquierda()
+    def palabras(self) -> List[Palabra]:
+        """Todas las palabras del párrafo en orden (incluidas las vacías)."""
+        return [p for linea in self.hijos for p in linea.hijos]
+
+    def reemplazar_contenido(self, palabras: List[Palabra]) -> None:
+        """
+        Reemplaza todas las palabras del párrafo en O(palabras). Quedan en una sola línea
+        y el próximo aplicar_reflow reorganiza el párrafo completo. Las palabras que salen
+        del párrafo quedan sin padre, igual que las que descarta el reflow.
+        """
+        palabras_previas, lineas_previas = self._palabras, self.contar_lineas()
+        salientes = self.palabras()
+        primera = self.hijos[0] if self.hijos else Linea(ancho=self.ancho_linea)
+        for linea in self.hijos[1:]:
+            linea.parent = None
+        primera.parent = self
+        primera.indice = 0
+        self.hijos = [primera]
+        self._en_reflow = True
+        primera.reemplazar_palabras(palabras)
+        self._en_reflow = False
+        conservadas = set(palabras)
+        for palabra in salientes:
+            # Si ya la tomó otro párrafo, su padre es una línea de ese párrafo
+            if palabra not in conservadas and (palabra.parent is primera or palabra.parent is None
+                                               or palabra.parent.parent is None):
+                palabra.parent = None
+        self._palabras = primera.contar_palabras()
+        self._suma_visuales = primera.contar_lineas_visuales()
+        self._propagar_conteos(self._palabras - palabras_previas, lineas_previas)
+
+        self._maquetado = False
+        self._lineas_sucias.clear()
+        self.primera_linea_cambiada = 0
+        if self.parent is not None:
+            self.parent.marcar_parrafo_sucio(self)
+            self.parent.parrafo_editado(self)
+            self.parent.palabras_modificadas(salientes)
+            self.parent.palabras_modificadas(palabras)
+
+    def empalmar_lineas(self, desde: int, hasta: int, lineas: List[Linea]) -> List[Linea]:
+        """
+        Reemplaza self.hijos[desde:hasta] por 'lineas' (con sus palabras, que no se recorren)
+        y retorna las quitadas. Los conteos se ajustan con los de cada línea. La primera línea
+        agregada (o la anterior al hueco) queda sucia: el reflow incremental retoma desde ahí,
+        así que las líneas agregadas después de ella deben venir ya maquetadas.
+        """
+        palabras_previas, lineas_previas = self._palabras, self.contar_lineas()
+        quitadas = self.hijos[desde:hasta]
+        for linea in quitadas:
+            self._palabras -= linea.contar_palabras()
+            self._suma_visuales -= linea.contar_lineas_visuales()
+            self._lineas_sucias.discard(linea)
+            if linea.parent is self:
+                linea.parent = None
+        for linea in lineas:
+            linea.parent = self
+            self._palabras += linea.contar_palabras()
+            self._suma_visuales += linea.contar_lineas_visuales()
+        self.hijos[desde:hasta] = lineas
+        # Igual que en _volcar: la cola se renumera solo si cambió la cantidad de líneas
+        fin = len(self.hijos) if len(lineas) != len(quitadas) else desde + len(lineas)
+        for i in range(desde, fin):
+            self.hijos[i].indice = i
+        self._propagar_conteos(self._palabras - palabras_previas, lineas_previas)
+
+        if self.primera_linea_cambiada is None or desde < self.primera_linea_cambiada:
+            self.primera_linea_cambiada = desde
+        if self.hijos:
+            sucia = desde if lineas else max(0, desde - 1)
+            self.marcar_linea_sucia(self.hijos[min(sucia, len(self.hijos) - 1)])
+        return quitadas
+
+    def indice_de(self, linea: Linea) -> int:
+        """Posición de la línea en el párrafo: O(1) usando el índice que mantiene el reflow."""
+        return indice_en(self.hijos, linea)
+
+    def marcar_linea_sucia(self, linea: Linea, palabra: Optional[Palabra] = None):
+        """Registra que el contenido de la línea cambió desde el último reflow."""
+        self._lineas_sucias.add(linea)
+        if self.parent is not None:
+            self.parent.marcar_parrafo_sucio(self)
+            self.parent.parrafo_editado(self)
+            if palabra is not None:
+                self.parent.palabras_modificadas((palabra,))
+
+    def marcar_maquetado(self):
+        """Declara que las líneas actuales ya son resultado de un reflow (p. ej. segmentos de página)."""
+        self._maquetado = True
+        self._lineas_sucias.clear()
+
+    def aplicar_reflow(self, completo: bool = False) -> None:
+        """
+        Reorganiza las palabras en líneas respetando el ancho_linea y sin cortar palabras.
+        Reflow incremental: empieza en la línea anterior a la primera línea sucia y se detiene
+        en cuanto un corte de línea coincide con el maquetado anterior. Con completo=True
+        (o si el párrafo nunca fue maquetado) se reorganiza el párrafo entero.
+        Con un corte no local (CorteOptimo) ver _reflow_global.
+        """
+        local = self.corte.local
+        if completo or not self._maquetado or not self.hijos:
+            if local:
+                self._reflow_desde(0, None)
+            else:
+                self._reflow_global(None, None)
+        elif self._lineas_sucias:
+            indices = []
+            for linea in self._lineas_sucias:
+                try:
+                    indices.append(self.indice_de(linea))
+                except ValueError:
+                    pass # La línea ya no pertenece al párrafo
+            if indices:
+                if local:
+                    self._reflow_desde(max(0, min(indices) - 1), max(indices))
+                else:
+                    self._reflow_global(min(indices), max(indices))
+
+        self._lineas_sucias.clear()
+        self._maquetado = True
+
+    def requiere_reflow_completo(self) -> bool:
+        """El próximo aplicar_reflow reorganiza el párrafo entero (nunca fue maquetado)."""
+        return not self._maquetado or not self.hijos
+
+    def palabras_reflow(self) -> List[Palabra]:
+        """
+        Palabras que ubica un reflow completo, en orden: las que tienen texto y la palabra
+        vacía que es la única de su línea (el cursor). Las demás vacías se descartan.
+        """
+        palabras = [p for linea in self.hijos for p in linea.hijos]
+        if len(palabras) == self._palabras:
+            return palabras # Todas tienen texto: no hay nada que descartar
+        return self._palabras_y_comienzos()[0]
+
+    def _palabras_y_comienzos(self) -> Tuple[List[Palabra], List[int]]:
+        """palabras_reflow() y la posición en esa lista donde empieza cada línea (más el total)."""
+        palabras: List[Palabra] = []
+        comienzos: List[int] = []
+        for linea in self.hijos:
+            comienzos.append(len(palabras))
+            hijos = linea.hijos
+            if len(hijos) == 1 or linea.contar_palabras() == len(hijos):
+                palabras.extend(hijos)
+            else:
+                palabras.extend([p for p in hijos if p.texto])
+        comienzos.append(len(palabras))
+        return palabras, comienzos
+
+    def aplicar_cortes(self, palabras: List[Palabra], cortes: List[int],
+                       conteos: Optional[List[int]] = None) -> None:
+        """
+        Reflow completo con los cortes ya calculados: cortes[i] es la cantidad de palabras
+        de la línea i sobre palabras_reflow() (ver IStrategyCorte.cortes)
+        y conteos[i], si se conoce, cuántas de ellas cuentan como palabra.
+        El resultado es el mismo que el de aplicar_reflow(completo=True).
+        """
+        if len(palabras) != sum(len(linea.hijos) for linea in self.hijos):
+            for linea in self.hijos:
+                if len(linea.hijos) != 1:
+                    for palabra in linea.hijos:
+                        if not palabra.texto:
+                            palabra.parent = None # Se descarta, igual que en el reflow
+        nuevas: List[List[Palabra]] = []
+        inicio = 0
+        for cantidad in cortes:
+            nuevas.append(palabras[inicio:inicio + cantidad])
+            inicio += cantidad
+        self._cerrar_ultima_linea(nuevas)
+        self._volcar(0, len(self.hijos), nuevas, self.alineacion_vigente(), conteos)
+        self._lineas_sucias.clear()
+        self._maquetado = True
+        self._estado_corte = None
+
+    def alineacion_vigente(self) -> IStrategyAlineacion:
+        """Alineación actual (una sola instancia compartida por todas las líneas)."""
         if self.hijos and self.hijos[0].hijos and self.hijos[0].alineacion:
-            alineacion_previa = self.hijos[0].alineacion
-        
-        self.hijos.clear()
-        
-        # Caso inicial de párrafo vacío
-        if not todas:
-            linea_vacia = Linea(ancho=self.ancho_linea)
-            linea_vacia.cambiar_alineacion(alineacion_previa)
-            linea_vacia.agregar_palabra(Palabra(""))
-            self.hijos.append(linea_vacia)
-            return
+            return self.hijos[0].alineacion
+        return AlineacionIzquierda()
+
+    def _cerrar_ultima_linea(self, nuevas: List[List[Palabra]]) -> None:
+        """Asegura que la última línea tenga una palabra vacía para el cursor."""
+        ultima = nuevas[-1]
+        if not ultima or (ultima[-1].texto.strip() and len(ultima) < self.ancho_linea + 1):
+            ultima.append(Palabra(""))
 
-        linea_actual = Linea(ancho=self.ancho_linea)
-        linea_actual.cambiar_alineacion(alineacion_previa)
-        self.hijos.append(linea_actual)
+    def _reflow_desde(self, inicio: int, ultima_sucia: Optional[int]) -> None:
+        """
+        Reconstruye las líneas a partir de self.hijos[inicio] con el algoritmo de primer ajuste.
+        Si ultima_sucia no es None, se detiene al llegar al comienzo de una línea limpia
+        posterior a ultima_sucia, ya que desde ahí el maquetado anterior sigue siendo válido.
+        Los objetos Linea existentes se reutilizan en orden.
+        """
+        ancho = self.ancho_linea
+
+        # 1. Determinar la alineación actual (una sola instancia compartida por todas las líneas).
+        alineacion_previa = self.alineacion_vigente()
+
+        nuevas: List[List[Palabra]] = [[]]
         longitud = 0
-        
-        for i, palabra in enumerate(todas):
-            largo = len(palabra.texto)
-            # Solo añade espacio si hay texto previo y la palabra actual no está vacía
-            espacio = 1 if longitud > 0 and largo > 0 else 0 
-            
-            # Manejo de palabras que exceden el ancho de línea (CRÍTICO)
-            if largo > self.ancho_linea:
-                if longitud > 0:
-                    linea_actual = Linea(ancho=self.ancho_linea)
-                    linea_actual.cambiar_alineacion(alineacion_previa)
-                    self.hijos.append(linea_actual)
+        fin = len(self.hijos)
+        detenido = False
+
+        for k in range(inicio, len(self.hijos)):
+            linea = self.hijos[k]
+            unica = len(linea.hijos) == 1
+            for j, palabra in enumerate(linea.hijos):
+                texto = palabra.texto
+                # Incluye solo palabras con texto, o la ÚNICA palabra vacía de una línea (el cursor)
+                if not texto and not unica:
+                    palabra.parent = None # Se descarta: ya no pertenece a ninguna línea
+                    continue
+                largo = len(texto)
+                # Solo añade espacio si hay texto previo y la palabra actual no está vacía
+                espacio = 1 if longitud > 0 and largo > 0 else 0
+                salta = longitud > 0 and (largo > ancho or longitud + espacio + largo > ancho)
+
+                # Punto de parada: la palabra abre línea y es el inicio de una línea limpia.
+                if (ultima_sucia is not None and j == 0 and k > ultima_sucia
+                        and (salta or not nuevas[-1])):
+                    if not nuevas[-1]:
+                        nuevas.pop()
+                    fin = k
+                    detenido = True
+                    break
+
+                if salta:
+                    nuevas.append([])
+                    longitud = espacio = 0
+
+                nuevas[-1].append(palabra)
+
+                # Manejo de palabras que exceden el ancho de línea (CRÍTICO):
+                # la Strategy la dividirá visualmente y se fuerza una nueva línea después.
+                if largo > ancho:
+                    nuevas.append([])
                     longitud = 0
-                
-                # Agrega la palabra entera, la Strategy la dividirá visualmente
-                linea_actual.agregar_palabra(palabra)
-                longitud = largo
-                
-                # Forzar nueva línea después del desborde
-                linea_actual = Linea(ancho=self.ancho_linea)
-                linea_actual.cambiar_alineacion(alineacion_previa)
-                self.hijos.append(linea_actual)
-                longitud = 0
-                continue
-            
-            # Lógica de Reflow estándar
-            if longitud + espacio + largo > self.ancho_linea:
-                nueva_linea = Linea(ancho=self.ancho_linea)
-                nueva_linea.cambiar_alineacion(linea_actual.alineacion) 
-                
-                self.hijos.append(nueva_linea)
-                linea_actual = nueva_linea
-                
-                linea_actual.agregar_palabra(palabra)
-                longitud = largo
-            else:
-                linea_actual.agregar_palabra(palabra)
-                longitud += espacio + largo
+                else:
+                    longitud += espacio + largo
+            if detenido:
+                break
+
+        if not detenido:
+            self._cerrar_ultima_linea(nuevas)
+        self._volcar(inicio, fin, nuevas, alineacion_previa)
+
+    def _reflow_global(self, primera_sucia: Optional[int], ultima_sucia: Optional[int]) -> None:
+        """
+        Reflow con un corte no local: la Strategy recalcula los cortes del párrafo (reutilizando
+        su estado si solo cambiaron las líneas primera_sucia..ultima_sucia) y se reconstruyen
+        únicamente las líneas que no coinciden con el maquetado anterior.
+        """
+        palabras, comienzos = self._palabras_y_comienzos()
+        if primera_sucia is None:
+            cortes, estado = self.corte.recortar(palabras, self.ancho_linea, None)
+            self.aplicar_cortes(palabras, cortes)
+            self._estado_corte = estado
+            return
+
+        lineas = self.hijos
+        cortes, self._estado_corte = self.corte.recortar(palabras, self.ancho_linea, self._estado_corte,
+                                                         comienzos[primera_sucia], comienzos[ultima_sucia + 1])
+
+        # Líneas que no cambian: prefijo anterior a las sucias y cola posterior (mismas palabras)
+        inicio = 0
+        while inicio < primera_sucia and inicio < len(cortes) and comienzos[inicio + 1] - comienzos[inicio] == cortes[inicio]:
+            inicio += 1
+        fin, fin_nuevas = len(lineas), len(cortes)
+        while (fin - 1 > ultima_sucia and fin_nuevas > inicio
+               and comienzos[fin] - comienzos[fin - 1] == cortes[fin_nuevas - 1]):
+            fin -= 1
+            fin_nuevas -= 1
+        if fin_nuevas == len(cortes) and inicio == fin_nuevas and fin > inicio:
+            inicio -= 1 # Se quitan líneas del final: la nueva última recibe la palabra del cursor
+
+        for linea in lineas[inicio:fin]:
+            if len(linea.hijos) != 1:
+                for palabra in linea.hijos:
+                    if not palabra.texto:
+                        palabra.parent = None # Se descarta, igual que en el reflow
+        nuevas: List[List[Palabra]] = []
+        posicion = comienzos[inicio]
+        for cantidad in cortes[inicio:fin_nuevas]:
+            nuevas.append(palabras[posicion:posicion + cantidad])
+            posicion += cantidad
+        if nuevas and fin_nuevas == len(cortes):
+            self._cerrar_ultima_linea(nuevas)
+        self._volcar(inicio, fin, nuevas, self.alineacion_vigente())
 
-        # Asegurar que la última línea tenga una palabra vacía para el cursor
-        if not linea_actual.hijos or (linea_actual.hijos[-1].texto.strip() and len(linea_actual.hijos) < linea_actual.ancho + 1):
-             linea_actual.agregar_palabra(Palabra(""))
\ No newline at end of file
+    def _volcar(self, inicio: int, fin: int, nuevas: List[List[Palabra]],
+                alineacion_previa: IStrategyAlineacion, conteos: Optional[List[int]] = None) -> None:
+        """
+        Reemplaza self.hijos[inicio:fin] por las líneas 'nuevas', reutilizando los objetos
+        Linea de la región. Los conteos se ajustan por deltas y se propagan al documento una sola vez.
+        """
+        ancho = self.ancho_linea
+        if INSTRUMENTACION.activa:
+            INSTRUMENTACION.contar("lineas_reflow", len(nuevas))
+        palabras_previas, lineas_previas = self._palabras, self.contar_lineas()
+        self._en_reflow = True
+        viejas = self.hijos[inicio:fin]
+        for linea in viejas[len(nuevas):]:
+            self._palabras -= linea.contar_palabras()
+            self._suma_visuales -= linea.contar_lineas_visuales()
+            linea.parent = None
+        lineas: List[Linea] = []
+        for i, contenido in enumerate(nuevas):
+            linea = viejas[i] if i < len(viejas) else Linea(ancho=ancho)
+            linea.parent = self
+            linea.ancho = ancho
+            linea.cambiar_alineacion(alineacion_previa)
+            linea.reemplazar_palabras(contenido, None if conteos is None else conteos[i])
+            lineas.append(linea)
+        self.hijos[inicio:fin] = lineas
+        # Índice de posiciones: si cambió la cantidad de líneas se renumera la cola del párrafo
+        hasta = len(self.hijos) if len(lineas) != fin - inicio else inicio + len(lineas)
+        for i in range(inicio, hasta):
+            self.hijos[i].indice = i
+        self._en_reflow = False
+        self._propagar_conteos(self._palabras - palabras_previas, lineas_previas)
+
+        if self.primera_linea_cambiada is None or inicio < self.primera_linea_cambiada:
+            self.primera_linea_cambiada = inicio
+        if self.parent is not None:
+            self.parent.marcar_parrafo_sucio(self)
+
+
+def parrafo_desde_palabras(palabras: List[str], ancho_linea: int = 40) -> Parrafo:
+    """
+    Crea un párrafo con todas las palabras en una sola línea, pendiente de reflow
+    (el primer aplicar_reflow lo reorganiza completo).
+    """
+    parrafo = Parrafo(ancho_linea=ancho_linea)
+    linea = Linea(ancho=ancho_linea)
+    linea.reemplazar_palabras([Palabra(texto) for texto in palabras])
+    parrafo.agregar_linea(linea)
+    return parrafo
@@ -0,0 +1,42 @@
+from typing import List
+from src.composite.component_main import ComponenteDocumento
+from src.composite.linea import Linea
+from src.composite.parrafo import Parrafo, contar_lineas_visuales
+from src.strategy.alineacion_strategy import IStrategyAlineacion
+
+
+class SegmentoParrafo(ComponenteDocumento):
+    """
+    Tramo de un Parrafo lógico que cae dentro de una Pagina (líneas [inicio, fin)).
+    Patrón de Diseño: Composite (Component) / Proxy (vista sobre las líneas del párrafo).
+    Ítem de Cambio Oculto: Cómo se reparte un párrafo entre páginas sin copiarlo.
+    """
+    __slots__ = ("parrafo", "inicio", "fin")
+    def __init__(self, parrafo: Parrafo, inicio: int, fin: int):
+        self.parrafo = parrafo
+        self.inicio = inicio
+        self.fin = fin
+
+    @property
+    def hijos(self) -> List[Linea]:
+        """Líneas del párrafo lógico que pertenecen a este segmento (vista en vivo)."""
+        return self.parrafo.hijos[self.inicio:self.fin]
+
+    @property
+    def ancho_linea(self) -> int:
+        return self.parrafo.ancho_linea
+
+    def contar_palabras(self) -> int:
+        return sum(l.contar_palabras() for l in self.hijos)
+
+    def contar_lineas(self) -> int:
+        return contar_lineas_visuales(self.hijos)
+
+    def aplicar_reflow(self) -> None:
+        self.parrafo.aplicar_reflow()
+
+    def cambiar_alineacion(self, nueva_alineacion: IStrategyAlineacion):
+        self.parrafo.cambiar_alineacion(nueva_alineacion)
+
+    def mostrar(self) -> str:
+        return "".join(l.mostrar() for l in self.hijos)
@@ -0,0 +1,193 @@
+from array import array, typecodes
+from typing import List, Optional
+
+# Código de array para caracteres Unicode ('w' reemplaza a 'u' desde Python 3.13)
+_CARACTER = "w" if "w" in typecodes else "u"
+
+
+class BufferAgregados:
+    """
+    Búfer de solo-anexado con los caracteres tecleados en una tabla de piezas.
+    Patrón de Diseño: Flyweight (las piezas guardan referencias al búfer, no copias).
+    Ítem de Cambio Oculto: Dónde y cómo se guardan los caracteres tecleados.
+
+    Cada TablaPiezas tiene el suyo (y con ella su documento): al compactar la tabla lo
+    suelta, y la memoria se libera cuando tampoco lo referencian las piezas que guardan los
+    comandos del historial. Los caracteres viven en un array compacto, no en una lista.
+    """
+    __slots__ = ("_caracteres",)
+
+    def __init__(self):
+        self._caracteres = array(_CARACTER)
+
+    def anexar(self, texto: str) -> int:
+        """Agrega el texto al final del búfer y retorna la posición donde comienza."""
+        inicio = len(self._caracteres)
+        self._caracteres.fromunicode(texto)
+        return inicio
+
+    def __len__(self) -> int:
+        return len(self._caracteres)
+
+    def __getitem__(self, tramo: slice) -> str:
+        return self._caracteres[tramo].tounicode()
+
+
+class Pieza:
+    """
+    Referencia inmutable a un tramo [inicio, inicio + longitud) de un búfer fuente.
+    La fuente es el texto original (str) o un BufferAgregados.
+    """
+    __slots__ = ("fuente", "inicio", "longitud")
+
+    def __init__(self, fuente, inicio: int, longitud: int):
+        self.fuente = fuente
+        self.inicio = inicio
+        self.longitud = longitud
+
+    @property
+    def fin(self) -> int:
+        return self.inicio + self.longitud
+
+    def texto(self) -> str:
+        return self.fuente[self.inicio:self.fin]
+
+    def __repr__(self) -> str:
+        return f"Pieza({self.texto()!r})"
+
+
+class TablaPiezas:
+    """
+    Motor de texto (piece table) detrás de Palabra.
+    Patrón de Diseño: Piece Table.
+    Ítem de Cambio Oculto: La representación interna del texto editable.
+
+    Las inserciones y borrados solo reorganizan piezas: el texto se materializa
+    de forma perezosa en texto() y queda cacheado hasta la siguiente edición.
+    Escribir o borrar de forma secuencial en el mismo punto extiende o recorta
+    la pieza tocada en la edición anterior, por lo que cuesta O(1) amortizado.
+    """
+    __slots__ = ("_piezas", "_longitud", "_cache", "_pista_idx", "_pista_pos", "_agregados")
+
+    # A partir de este número de piezas se compacta el texto en una sola pieza.
+    MAX_PIEZAS = 64
+
+    def __init__(self, texto: str = ""):
+        self._piezas: List[Pieza] = []
+        self._longitud = 0
+        self._cache: Optional[str] = None
+        # Pista de localidad: índice de la última pieza tocada y su posición inicial.
+        self._pista_idx = 0
+        self._pista_pos = 0
+        self._agregados: Optional[BufferAgregados] = None
+        self.reemplazar(texto)
+
+    def __len__(self) -> int:
+        return self._longitud
+
+    def texto(self) -> str:
+        """Vista materializada del texto (se reconstruye solo si hubo ediciones)."""
+        if self._cache is None:
+            self._cache = "".join(p.texto() for p in self._piezas)
+        return self._cache
+
+    def reemplazar(self, texto: str) -> None:
+        """Descarta las piezas actuales (y el búfer de agregados) y usa el texto dado como nuevo original."""
+        self._piezas = [Pieza(texto, 0, len(texto))] if texto else []
+        self._agregados = None
+        self._longitud = len(texto)
+        self._cache = texto
+        self._pista_idx = 0
+        self._pista_pos = 0
+
+    def _localizar(self, pos: int):
+        """Retorna (índice de pieza, posición inicial de esa pieza) que contiene pos."""
+        idx, inicio = 0, 0
+        # Se parte de la pista cuando la posición está a la derecha de ella.
+        if self._pista_idx < len(self._piezas) and pos >= self._pista_pos:
+            idx, inicio = self._pista_idx, self._pista_pos
+        while idx < len(self._piezas) and inicio + self._piezas[idx].longitud < pos:
+            inicio += self._piezas[idx].longitud
+            idx += 1
+        return idx, inicio
+
+    def _dividir(self, pos: int) -> int:
+        """Garantiza un límite de pieza en pos y retorna el índice de la pieza que empieza ahí."""
+        idx, inicio = self._localizar(pos)
+        if idx >= len(self._piezas):
+            return len(self._piezas)
+        # La pieza idx sigue empezando en inicio aunque se divida: es una pista válida.
+        self._pista_idx, self._pista_pos = idx, inicio
+        pieza = self._piezas[idx]
+        corte = pos - inicio
+        if corte == 0:
+            return idx
+        if corte == pieza.longitud:
+            return idx + 1
+        self._piezas[idx:idx + 1] = [
+            Pieza(pieza.fuente, pieza.inicio, corte),
+            Pieza(pieza.fuente, pieza.inicio + corte, pieza.longitud - corte),
+        ]
+        return idx + 1
+
+    def insertar(self, pos: int, texto: str) -> Pieza:
+        """Inserta texto en pos y retorna la pieza que lo referencia en el búfer de agregados."""
+        if self._agregados is None:
+            self._agregados = BufferAgregados()
+        pieza = Pieza(self._agregados, self._agregados.anexar(texto), len(texto))
+        self.insertar_piezas(pos, [pieza])
+        return pieza
+
+    def insertar_piezas(self, pos: int, piezas: List[Pieza]) -> None:
+        """Inserta piezas existentes (p. ej. las guardadas por un comando) en pos."""
+        piezas = [p for p in piezas if p.longitud]
+        if not piezas:
+            return
+        pos = max(0, min(pos, self._longitud))
+        total = sum(p.longitud for p in piezas)
+
+        idx, inicio = self._localizar(pos)
+        previa = self._piezas[idx] if idx < len(self._piezas) else None
+        # Caso rápido: se escribe justo al final de la pieza anterior y el texto es contiguo.
+        if (len(piezas) == 1 and previa is not None and inicio + previa.longitud == pos
+                and previa.fuente is piezas[0].fuente and previa.fin == piezas[0].inicio):
+            self._piezas[idx] = Pieza(previa.fuente, previa.inicio, previa.longitud + total)
+            self._pista_idx, self._pista_pos = idx, inicio
+        else:
+            idx = self._dividir(pos)
+            self._piezas[idx:idx] = piezas
+            self._pista_idx = idx + len(piezas) - 1
+            self._pista_pos = pos + total - piezas[-1].longitud
+
+        self._longitud += total
+        self._cache = None
+        self._compactar_si_hace_falta()
+
+    def eliminar(self, pos: int, cantidad: int = 1) -> List[Pieza]:
+        """Elimina cantidad caracteres desde pos y retorna las piezas quitadas (para deshacer)."""
+        if pos < 0 or cantidad <= 0 or pos >= self._longitud:
+            return []
+        cantidad = min(cantidad, self._longitud - pos)
+
+        idx, inicio = self._localizar(pos)
+        pieza = self._piezas[idx] if idx < len(self._piezas) else None
+        # Caso rápido: borrado dentro de una única pieza por su extremo final (backspace).
+        if pieza is not None and pos + cantidad == inicio + pieza.longitud and pos > inicio:
+            corte = pos - inicio
+            self._piezas[idx] = Pieza(pieza.fuente, pieza.inicio, corte)
+            eliminadas = [Pieza(pieza.fuente, pieza.inicio + corte, cantidad)]
+            self._pista_idx, self._pista_pos = idx, inicio
+        else:
+            desde = self._dividir(pos)
+            hasta = self._dividir(pos + cantidad)
+            eliminadas = self._piezas[desde:hasta]
+            del self._piezas[desde:hasta]
+            self._pista_idx, self._pista_pos = 0, 0
+
+        self._longitud -= cantidad
+        self._cache = None
+        return eliminadas
+
+    def _compactar_si_hace_falta(self) -> None:
+        if len(self._piezas) > self.MAX_PIEZAS:
+            self.reemplazar(self.texto())
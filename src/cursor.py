@@ -0,0 +1,64 @@
+from typing import Optional
+from src.composite.palabra import Palabra
+
+
+class Cursor:
+    """
+    Cursor estable anclado a una Palabra y a un desplazamiento dentro de ella.
+    Patrón de Diseño: Memento (los comandos guardan copias del cursor para deshacer/rehacer).
+    Ítem de Cambio Oculto: Cómo se representa la posición de edición.
+
+    Como el ancla es la propia Palabra, el cursor sobrevive al reflow y a la paginación
+    sin buscar en el árbol: las coordenadas (página, párrafo, línea, palabra) se obtienen
+    en O(1) del índice de posiciones que mantienen Linea, Parrafo y Documento.
+    """
+    __slots__ = ("palabra", "offset", "linea", "previa")
+
+    def __init__(self, palabra: Palabra, offset: int = 0):
+        self.mover_a(palabra, offset)
+
+    def mover_a(self, palabra: Palabra, offset: int):
+        self.palabra = palabra
+        self.offset = offset
+        # Vecinos al momento de anclar: si el reflow descarta la palabra (p. ej. una palabra
+        # vacía), el cursor pasa a "la palabra siguiente a previa", como hacía el cursor por índices.
+        # previa puede estar en la línea anterior del párrafo: el reflow puede eliminar la línea.
+        self.linea = palabra.parent
+        self.previa: Optional[Palabra] = None
+        if self.linea is not None:
+            indice = self.linea.indice_de(palabra)
+            if indice > 0:
+                self.previa = self.linea.hijos[indice - 1]
+            elif self.linea.parent is not None:
+                parrafo = self.linea.parent
+                num_linea = parrafo.indice_de(self.linea)
+                if num_linea > 0 and parrafo.hijos[num_linea - 1].hijos:
+                    self.previa = parrafo.hijos[num_linea - 1].hijos[-1]
+
+    def copia(self) -> "Cursor":
+        otro = Cursor.__new__(Cursor)
+        otro.palabra, otro.offset = self.palabra, self.offset
+        otro.linea, otro.previa = self.linea, self.previa
+        return otro
+
+    def resolver(self) -> Optional[Palabra]:
+        """Retorna la palabra anclada, reubicándola si el reflow la dejó fuera del documento."""
+        if self.palabra.parent is None:
+            previa, linea = self.previa, self.linea
+            if previa is not None and _adjunta(previa):
+                linea = previa.parent
+                palabra = linea.get_palabra(linea.indice_de(previa) + 1)
+            elif linea is not None and linea.parent is not None and linea.hijos:
+                palabra = linea.hijos[0]
+            else:
+                return None
+            self.mover_a(palabra, min(self.offset, palabra.longitud()))
+        return self.palabra
+
+    def __repr__(self) -> str:
+        return f"Cursor({self.palabra.texto!r}, {self.offset})"
+
+
+def _adjunta(palabra: Palabra) -> bool:
+    """La palabra sigue colgando de una línea que pertenece a un párrafo."""
+    return palabra.parent is not None and palabra.parent.parent is not None
@@ -0,0 +1,420 @@
+import asyncio
+import glob
+import os
+import struct
+import zlib
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+from src.composite.documento import Documento
+from src.composite.palabra import Palabra
+from src.composite.parrafo import Parrafo, parrafo_desde_palabras
+from src.editor_consola import EditorConsola
+from src.formato_binario import (
+    ALINEACIONES,
+    CORTES,
+    SEPARACION_ESPACIO,
+    FuenteBinaria,
+    InstantaneaBinaria,
+    PosicionGuardada,
+    construir_parrafo,
+    describir_parrafo,
+)
+
+# Diario de recuperación: segmentos "<prefijo>.<generación>", cada uno con los cambios hechos
+# sobre su base: el archivo abierto (o el último guardado con Ctrl+S), que se reconoce por su
+# tamaño y fecha de modificación, o la instantánea "<prefijo>.edb" escrita al compactar,
+# en el formato binario, que se reconoce por llevar la generación del segmento.
+# Segmento: encabezado | ruta de la base (UTF-8) | registros.
+# Registro: crc32 (del tipo y el contenido), largo del contenido, tipo | contenido.
+MAGICO_DIARIO = b"EDTXLOG\x00"
+VERSION_DIARIO = 1
+EXTENSION_INSTANTANEA = ".edb"
+
+# magico, version, largo de la ruta de la base, ancho de línea, generación, tamaño y
+# fecha de modificación (ns) de la base (-1 si es una instantánea): si cambiaron, ya no sirve
+_ENCABEZADO = struct.Struct("<8sHHIqqq")
+_REGISTRO = struct.Struct("<IIB")
+
+# Tipos de registro. Un grupo (los comandos de un intervalo) termina con CONFIRMAR;
+# un grupo sin CONFIRMAR (cortado a mitad de escritura) se descarta al recuperar.
+PARRAFO, INSERTAR, ELIMINAR, CONFIRMAR = 1, 2, 3, 4
+_PARRAFO = struct.Struct("<qIBB") # índice, ancho, alineación, corte | texto (palabras separadas por " ")
+_RANGO = struct.Struct("<qq") # INSERTAR: índice y cantidad; ELIMINAR: [desde, hasta)
+_CURSOR = struct.Struct("<qqq") # CONFIRMAR: posición del cursor (ver formato_binario)
+
+
+def _registro(tipo: int, contenido: bytes) -> bytes:
+    crc = zlib.crc32(contenido, zlib.crc32(bytes((tipo,))))
+    return _REGISTRO.pack(crc, len(contenido), tipo) + contenido
+
+
+def _leer_registros(datos: memoryview, desde: int) -> Iterator[Tuple[int, memoryview, int]]:
+    """(tipo, contenido, posición siguiente) de cada registro íntegro, hasta el primero cortado o dañado."""
+    posicion = desde
+    while posicion + _REGISTRO.size <= len(datos):
+        crc, largo, tipo = _REGISTRO.unpack_from(datos, posicion)
+        inicio = posicion + _REGISTRO.size
+        contenido = datos[inicio:inicio + largo]
+        if len(contenido) < largo or zlib.crc32(contenido, zlib.crc32(bytes((tipo,)))) != crc:
+            return
+        posicion = inicio + largo
+        yield tipo, contenido, posicion
+
+
+_SIN_FIRMA = (-1, -1)
+
+
+def _firma(ruta: str) -> Tuple[int, int]:
+    """(tamaño, fecha de modificación en ns) de la base, o _SIN_FIRMA si no existe."""
+    try:
+        estado = os.stat(ruta)
+    except OSError:
+        return _SIN_FIRMA
+    return estado.st_size, estado.st_mtime_ns
+
+
+class _Segmento:
+    """Encabezado de un segmento en disco."""
+    __slots__ = ("ruta", "generacion", "ancho", "base", "firma", "inicio")
+
+    def __init__(self, ruta: str, datos: bytes):
+        magico, version, largo, self.ancho, self.generacion, tamanio, fecha = _ENCABEZADO.unpack_from(datos, 0)
+        if magico != MAGICO_DIARIO or version > VERSION_DIARIO:
+            raise ValueError(f"{ruta}: no es un diario del editor")
+        self.ruta = ruta
+        self.inicio = _ENCABEZADO.size + largo
+        self.base = datos[_ENCABEZADO.size:self.inicio].decode("utf-8")
+        self.firma = (tamanio, fecha)
+
+    def base_valida(self) -> bool:
+        """La base existe y es la misma de cuando empezó el segmento (una vacía siempre lo es)."""
+        if not self.base:
+            return True
+        if self.firma != _SIN_FIRMA:
+            return _firma(self.base) == self.firma
+        try:
+            fuente = FuenteBinaria(self.base)
+        except (OSError, ValueError):
+            return False
+        fuente.cerrar()
+        return fuente.generacion == self.generacion
+
+
+def _segmentos(prefijo: str) -> List[_Segmento]:
+    """Segmentos del diario ordenados por generación (se ignoran los ilegibles)."""
+    segmentos = []
+    for ruta in glob.glob(glob.escape(prefijo) + ".*"):
+        if not ruta.rsplit(".", 1)[1].isdigit():
+            continue
+        try:
+            with open(ruta, "rb") as archivo:
+                segmentos.append(_Segmento(ruta, archivo.read()))
+        except (OSError, ValueError, struct.error):
+            continue
+    return sorted(segmentos, key=lambda segmento: segmento.generacion)
+
+
+class Diario:
+    """
+    Diario de cambios del documento, solo de agregado, para recuperar la sesión tras un corte.
+    Patrón de Diseño: Observer (el documento avisa qué párrafos cambian y el CommandInvoker
+    cuándo termina cada ejecutar, deshacer o rehacer).
+    Ítem de Cambio Oculto: Cómo y cuándo llegan los cambios al disco.
+
+    Los comandos apuntan a objetos Palabra, así que no se guardan los comandos sino su efecto:
+    las altas y bajas de párrafos en orden y el estado final (texto y formato) de los párrafos
+    tocados. Los comandos de cada intervalo forman un grupo (group commit): se escriben juntos,
+    con un solo fsync, cada 'intervalo' segundos o al juntar 'umbral_comandos', en un ejecutor;
+    teclear nunca espera al disco y un párrafo editado muchas veces se escribe una vez por grupo.
+    Cuando el segmento supera 'umbral_compactacion' se escribe en segundo plano una
+    instantánea del documento y se empieza un segmento nuevo sobre ella.
+    """
+    def __init__(self, documento: Documento, prefijo: str, posicion_cursor: Callable[[], PosicionGuardada],
+                 ancho_linea: int, base: str = "", generacion: int = 0, intervalo: float = 0.2,
+                 umbral_comandos: int = 512, umbral_compactacion: int = 16 * 1024 * 1024):
+        self.documento = documento
+        self.prefijo = prefijo
+        self.posicion_cursor = posicion_cursor
+        self.ancho_linea = ancho_linea
+        self.intervalo = intervalo
+        self.umbral_comandos = umbral_comandos
+        self.umbral_compactacion = umbral_compactacion
+        self.generacion = generacion
+        self._base = base
+        self._firma_base = _firma(base) if base else _SIN_FIRMA
+        # Párrafos editados en el grupo en curso (dict como conjunto ordenado)
+        self._editados: Dict[Parrafo, None] = {}
+        self._grupo = bytearray() # Altas y bajas del grupo en curso
+        self._comandos = 0 # Comandos del grupo en curso
+        self._cursor: PosicionGuardada = posicion_cursor() # Último cursor escrito
+        self._archivo: Optional[BinaryIO] = None
+        self._continuar_en: Optional[int] = None # Tras recuperar: largo íntegro del segmento
+        self._bytes_segmento = 0
+        self._segmento_vacio = True # El segmento actual no tiene grupos: la base ya es el documento
+        self._nueva_base: Optional[Tuple[str, Tuple[int, int], bytes]] = None # Ver guardado()
+        self._despertar: Optional[asyncio.Event] = None
+        self._compactacion: Optional[asyncio.Task] = None
+        self.comandos = 0
+        self.grupos = 0
+        self.compactaciones = 0
+        documento.diario = self
+
+    # --- Observer del documento y del historial (hilo del editor) ---
+
+    def parrafo_editado(self, parrafo: Parrafo) -> None:
+        self._editados[parrafo] = None
+
+    def parrafos_insertados(self, indice: int, parrafos: List[Parrafo]) -> None:
+        self._grupo += _registro(INSERTAR, _RANGO.pack(indice, len(parrafos)))
+        for parrafo in parrafos:
+            self._editados[parrafo] = None
+
+    def parrafos_eliminados(self, desde: int, hasta: int) -> None:
+        self._grupo += _registro(ELIMINAR, _RANGO.pack(desde, hasta))
+
+    def confirmar(self) -> None:
+        """Terminó un comando: sus cambios van en el grupo en curso (se escribe antes si hay muchos)."""
+        self._comandos += 1
+        self.comandos += 1
+        if self._comandos >= self.umbral_comandos and self._despertar is not None:
+            self._despertar.set()
+
+    def guardado(self, ruta: str) -> None:
+        """
+        El documento se acaba de guardar entero en 'ruta': el próximo sincronizar empieza un
+        segmento sobre ese archivo y borra los anteriores (si la base era ese mismo archivo,
+        ya no serviría para recuperar).
+        """
+        self._nueva_base = (ruta, _firma(ruta), self._cerrar_grupo())
+        if self._despertar is not None:
+            self._despertar.set()
+
+    def _cerrar_grupo(self) -> bytes:
+        """
+        Codifica el grupo en curso: altas y bajas, el estado final de los párrafos editados que
+        siguen en el documento (con su índice final, por eso van después) y el cursor.
+        Retorna b"" si no hubo cambios.
+        """
+        cursor = self.posicion_cursor()
+        if not (self._grupo or self._editados or self._comandos or cursor != self._cursor):
+            return b""
+        grupo = self._grupo
+        documento = self.documento
+        for parrafo in self._editados:
+            if parrafo.parent is documento: # Los que salieron del documento ya tienen su ELIMINAR
+                texto, ancho, alineacion, corte = describir_parrafo(parrafo)
+                grupo += _registro(PARRAFO, _PARRAFO.pack(parrafo.indice, ancho, alineacion, corte) + texto)
+        grupo += _registro(CONFIRMAR, _CURSOR.pack(*cursor))
+        self._grupo = bytearray()
+        self._editados.clear()
+        self._comandos = 0
+        self._cursor = cursor
+        return bytes(grupo)
+
+    # --- Escritura (tarea del bucle de eventos; el disco se toca en un ejecutor) ---
+
+    async def ejecutar(self) -> None:
+        """Escribe un grupo cada 'intervalo' segundos o al llegar a 'umbral_comandos'."""
+        self._despertar = asyncio.Event()
+        while True:
+            try:
+                await asyncio.wait_for(self._despertar.wait(), self.intervalo)
+            except asyncio.TimeoutError:
+                pass
+            self._despertar.clear()
+            await self.sincronizar()
+
+    async def sincronizar(self) -> None:
+        """
+        Escribe (con fsync) el grupo en curso, que incluye los cambios hechos fuera de los
+        comandos (p. ej. al cargar) y el cursor, y si el segmento ya es grande, compacta.
+        """
+        loop = asyncio.get_running_loop()
+        if self._nueva_base is not None:
+            nueva_base, self._nueva_base = self._nueva_base, None
+            await loop.run_in_executor(None, self._cambiar_base, *nueva_base)
+        datos = self._cerrar_grupo()
+        if not datos:
+            return
+        await loop.run_in_executor(None, self._escribir, datos)
+        if (self._bytes_segmento >= self.umbral_compactacion and self._compactacion is None
+                and self.documento.indice_completo()):
+            await self._iniciar_compactacion()
+
+    async def cerrar(self) -> None:
+        """
+        Escribe lo pendiente, espera una compactación en curso y cierra el segmento. Si no hubo
+        cambios desde que se abrió o guardó el archivo base, el diario no hace falta y se borra.
+        """
+        await self.sincronizar()
+        if self._compactacion is not None:
+            await self._compactacion
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+        self.documento.diario = None
+        if self._segmento_vacio and self._firma_base != _SIN_FIRMA:
+            self._borrar_anteriores(self.generacion + 1)
+
+    def _escribir(self, datos: bytes) -> None:
+        """En el ejecutor: agrega los datos al segmento actual (creándolo si hace falta) y hace fsync."""
+        if self._archivo is None:
+            self._abrir_segmento()
+        self._archivo.write(datos)
+        self._archivo.flush()
+        os.fsync(self._archivo.fileno())
+        self._bytes_segmento += len(datos)
+        self._segmento_vacio = self._segmento_vacio and not datos
+        self.grupos += bool(datos)
+
+    def _abrir_segmento(self) -> None:
+        ruta = f"{self.prefijo}.{self.generacion}"
+        if self._continuar_en is not None:
+            self._archivo = open(ruta, "r+b")
+            self._archivo.truncate(self._continuar_en) # Descarta un grupo cortado
+            self._archivo.seek(self._continuar_en)
+            self._bytes_segmento = self._continuar_en
+            self._continuar_en = None
+            return
+        base = self._base.encode("utf-8")
+        self._archivo = open(ruta, "wb")
+        self._segmento_vacio = True
+        self._archivo.write(_ENCABEZADO.pack(MAGICO_DIARIO, VERSION_DIARIO, len(base), self.ancho_linea,
+                                             self.generacion, *self._firma_base) + base)
+        self._bytes_segmento = 0
+
+    async def _iniciar_compactacion(self) -> None:
+        """
+        Toma la instantánea y pasa a la generación siguiente sin esperar a que se escriba.
+        Hasta que la instantánea esté en disco, recuperar usa la base anterior con los dos segmentos.
+        """
+        instantanea = InstantaneaBinaria(self.documento, self.posicion_cursor())
+        ruta = self.prefijo + EXTENSION_INSTANTANEA
+        # Lo que cambió desde la última escritura ya está en la instantánea: va al segmento viejo
+        datos = self._cerrar_grupo()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._rotar_segmento, datos, ruta, _SIN_FIRMA)
+        self._compactacion = asyncio.create_task(self._compactar(instantanea, ruta, self.generacion))
+
+    async def _compactar(self, instantanea: InstantaneaBinaria, ruta: str, generacion: int) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, instantanea.escribir, ruta, generacion, True)
+            await loop.run_in_executor(None, self._borrar_anteriores, generacion)
+            self.compactaciones += 1
+        finally:
+            self._compactacion = None
+
+    def _cambiar_base(self, ruta: str, firma: Tuple[int, int], datos: bytes) -> None:
+        """En el ejecutor: empieza un segmento sobre el archivo guardado y borra los anteriores."""
+        self._rotar_segmento(datos, ruta, firma)
+        self._borrar_anteriores(self.generacion)
+
+    def _rotar_segmento(self, datos: bytes, base: str, firma: Tuple[int, int]) -> None:
+        """
+        En el ejecutor: agrega 'datos' al segmento actual, lo cierra y crea (en disco, antes
+        de que la base nueva exista o reemplace a la anterior) el de la generación siguiente.
+        """
+        if datos or self._continuar_en is not None: # Un segmento recuperado se cierra sin su grupo cortado
+            self._escribir(datos)
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+        self.generacion += 1
+        self._base, self._firma_base = base, firma
+        self._escribir(b"")
+
+    def _borrar_anteriores(self, generacion: int) -> None:
+        for segmento in _segmentos(self.prefijo):
+            if segmento.generacion < generacion:
+                try:
+                    os.remove(segmento.ruta)
+                except FileNotFoundError: # Ya lo borró otra compactación o un guardado
+                    pass
+
+
+def _aplicar_grupo(documento: Documento, registros: List[Tuple[int, bytes]], ancho_linea: int) -> None:
+    for tipo, contenido in registros:
+        if tipo == INSERTAR:
+            indice, cantidad = _RANGO.unpack(contenido)
+            documento.asegurar_parrafo(indice - 1)
+            documento.insertar_parrafos(indice, [parrafo_desde_palabras([""], ancho_linea) for _ in range(cantidad)])
+        elif tipo == ELIMINAR:
+            desde, hasta = _RANGO.unpack(contenido)
+            documento.asegurar_parrafo(hasta - 1)
+            documento.eliminar_parrafos(desde, hasta)
+        elif tipo == PARRAFO:
+            indice, ancho, alineacion, corte = _PARRAFO.unpack_from(contenido)
+            texto = bytes(contenido[_PARRAFO.size:]).decode("utf-8")
+            documento.asegurar_parrafo(indice)
+            parrafo = documento.parrafos[indice]
+            if parrafo.ancho_linea != ancho:
+                documento.eliminar_parrafos(indice, indice + 1)
+                documento.insertar_parrafos(indice, [construir_parrafo(texto, SEPARACION_ESPACIO, ancho,
+                                                                       alineacion, corte)])
+                continue
+            parrafo.reemplazar_contenido([Palabra(t) for t in (texto.split(" ") if texto else [""])])
+            if alineacion < len(ALINEACIONES):
+                parrafo.cambiar_alineacion(ALINEACIONES[alineacion])
+            if corte < len(CORTES):
+                parrafo.cambiar_corte(CORTES[corte])
+
+
+def abrir_diario(editor: EditorConsola, ruta: Optional[str], prefijo: str, **opciones) -> Tuple[Diario, int]:
+    """
+    Abre el documento del editor con su diario. Si hay un diario de una sesión anterior con una
+    base válida, abre esa base y vuelve a aplicar los grupos completos (la sesión queda como
+    estaba, salvo el historial de deshacer); si no, abre 'ruta' (si hay) y empieza un diario nuevo.
+    Retorna (diario, grupos recuperados).
+    """
+    segmentos = _segmentos(prefijo)
+    desde = next((i for i in range(len(segmentos) - 1, -1, -1) if segmentos[i].base_valida()), None)
+    if desde is None:
+        for segmento in segmentos:
+            os.remove(segmento.ruta)
+        if ruta is not None:
+            editor.abrir(ruta)
+        diario = Diario(editor.documento, prefijo, editor._posicion_guardada, editor.ancho_linea,
+                        base=ruta or "", **opciones)
+        editor.invoker.diario = diario
+        return diario, 0
+
+    primero = segmentos[desde]
+    if primero.base:
+        editor.abrir(primero.base)
+    documento = editor.documento
+    recuperados, cursor = 0, None
+    ultimo = primero
+    largo_integro = primero.inicio
+    for segmento in segmentos[desde:]:
+        if segmento.generacion != ultimo.generacion + (segmento is not primero):
+            break # Falta un segmento: lo que sigue no se puede aplicar
+        ultimo = segmento
+        with open(segmento.ruta, "rb") as archivo:
+            datos = memoryview(archivo.read())
+        largo_integro = segmento.inicio
+        grupo: List[Tuple[int, bytes]] = []
+        for tipo, contenido, siguiente in _leer_registros(datos, segmento.inicio):
+            if tipo != CONFIRMAR:
+                grupo.append((tipo, bytes(contenido)))
+                continue
+            _aplicar_grupo(documento, grupo, segmento.ancho)
+            cursor = _CURSOR.unpack(contenido)
+            grupo = []
+            largo_integro = siguiente
+            recuperados += 1
+        if largo_integro < len(datos):
+            break # Grupo cortado: el diario termina acá
+    documento.actualizar_paginas()
+    if cursor is not None:
+        editor._restaurar_cursor(cursor)
+
+    diario = Diario(documento, prefijo, editor._posicion_guardada, editor.ancho_linea, base=ultimo.base,
+                    generacion=ultimo.generacion, **opciones)
+    diario._firma_base = ultimo.firma
+    diario._continuar_en = diario._bytes_segmento = largo_integro
+    diario._segmento_vacio = largo_integro == ultimo.inicio
+    for segmento in segmentos:
+        if segmento.generacion > ultimo.generacion:
+            os.remove(segmento.ruta)
+    editor.invoker.diario = diario
+    return diario, recuperados
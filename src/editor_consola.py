@@ -3,9 +3,22 @@ from src.composite.pagina import Pagina
 from src.composite.parrafo import Parrafo
 from src.composite.linea import Linea
 from src.composite.palabra import Palabra
+from src.composite.fuente_archivo import FuenteArchivo
 from src.command.invoke import CommandInvoker
 from src.command.add_char_command import AgregarCaracterCommand
 from src.command.delete_char_command import EliminarCaracterCommand
+from src.command.insert_text_command import InsertarTextoCommand, tokenizar_bloque
+from src.command.replace_range_command import ReemplazarRangoCommand
+from src.command.delete_range_command import EliminarRangoCommand
+from src.command.align_range_command import AlinearRangoCommand
+from src.command.replace_words_command import ReemplazarPalabrasCommand
+from src.cursor import Cursor
+from src.exportacion import exportar
+from src.strategy.exportacion_strategy import FORMATOS_EXPORTACION
+from src.formato_binario import FuenteBinaria, PosicionGuardada, es_documento_binario, guardar_documento
+from src.render.viewport import Viewport
+from src.indice_palabras import normalizar, tramo_forma
+from src.instrumentacion import INSTRUMENTACION
 from src.strategy.alineacion_strategy import (
     IStrategyAlineacion,
     AlineacionIzquierda,
@@ -13,7 +26,25 @@ from src.strategy.alineacion_strategy import (
     AlineacionCentrada,
     AlineacionJustificada
 )
-from typing import Tuple, List, Optional
+from src.strategy.corte_strategy import CortePrimerAjuste, CorteOptimo
+from typing import Callable, Tuple, List, Optional
+
+# Las estrategias son singletons: el diccionario no crea instancias nuevas
+ESTRATEGIAS_ALINEACION = {
+    "izquierda": AlineacionIzquierda(), "derecha": AlineacionDerecha(),
+    "centrada": AlineacionCentrada(), "justificada": AlineacionJustificada()
+}
+# Orden en que Ctrl+L recorre las alineaciones
+CICLO_ALINEACION = ["izquierda", "centrada", "derecha", "justificada"]
+# Criterios de corte de líneas (también singletons); Ctrl+K alterna entre ambos
+ESTRATEGIAS_CORTE = {"primer_ajuste": CortePrimerAjuste(), "optimo": CorteOptimo()}
+
+
+def _clave_posicion(palabra: Palabra, offset: int) -> Tuple[int, int, int, int]:
+    """Orden de una posición en el documento: (párrafo, línea, palabra, offset)."""
+    linea = palabra.parent
+    parrafo = linea.parent
+    return (parrafo.indice, parrafo.indice_de(linea), linea.indice_de(palabra), offset)
 
 
 class EditorConsola:
@@ -32,57 +63,227 @@ class EditorConsola:
         linea.agregar_palabra(Palabra("")) 
         parrafo = Parrafo(ancho_linea=ancho_linea)
         parrafo.agregar_linea(linea)
-        pagina = Pagina()
-        pagina.agregar_parrafo(parrafo)
-        self.documento.agregar_pagina(pagina)
+        self.documento.agregar_parrafo(parrafo)
+        self.documento.actualizar_paginas() 
 
-        self.cursor: Tuple[int, int, int, int, int] = (0, 0, 0, 0, 0) 
+        self.cursor = Cursor(linea.get_palabra(0), 0)
+        # Con maquetado diferido las ediciones solo marcan párrafos sucios: el reflow y la
+        # paginación se hacen una vez, al pedir la vista (ver PlanificadorFrames)
+        self.maquetado_diferido = False
+        # Selección: va del ancla al cursor (None: no hay selección)
+        self.ancla: Optional[Cursor] = None
+        self.viewport = Viewport(self.documento)
         self.alineacion_actual: IStrategyAlineacion = AlineacionIzquierda() 
         self.current_parrafo().cambiar_alineacion(self.alineacion_actual)
-        self.documento.actualizar_paginas() 
 
-    def current_linea(self) -> Linea:
-        p_idx, par_idx, lin_idx, _, _ = self.cursor
-        return self.documento.hijos[p_idx].hijos[par_idx].hijos[lin_idx]
+    def abrir(self, ruta: str) -> bool:
+        """
+        Abre un archivo de texto (párrafos separados por una línea en blanco) o un documento
+        binario (ver formato_binario), que además trae el formato, las líneas y el cursor.
+        El archivo se mapea en memoria y solo se construyen los párrafos de las páginas que
+        se visitan. Retorna False si el archivo no tiene texto (se conserva el documento actual).
+        """
+        binario = es_documento_binario(ruta)
+        fuente = FuenteBinaria(ruta) if binario else FuenteArchivo(ruta)
+        documento = Documento()
+        documento.abrir_fuente(fuente, self.ancho_linea)
+        documento.asegurar_paginas(0)
+        if not documento.hijos:
+            fuente.cerrar()
+            return False
+        self.usar_documento(documento)
+        if binario:
+            self._restaurar_cursor(fuente.cursor)
+        return True
 
-    def current_parrafo(self) -> Parrafo:
-        p_idx, par_idx, _, _, _ = self.cursor
-        return self.documento.hijos[p_idx].hijos[par_idx]
+    def guardar(self, ruta: str, con_cortes: bool = True) -> int:
+        """
+        Guarda el documento y el cursor en el formato binario (el historial de deshacer
+        no se guarda). Lo que no se cargó se copia del archivo de origen sin construirlo.
+        Retorna los bytes escritos.
+        """
+        with INSTRUMENTACION.medir("guardado"):
+            return guardar_documento(ruta, self.documento, self._posicion_guardada(), con_cortes)
+
+    def exportar(self, ruta: str, formato: str = "html") -> int:
+        """
+        Exporta el documento ("texto", "markdown" o "html") escribiendo de a bloques; lo que
+        no se cargó se recorre desde el archivo de origen sin quedar en memoria.
+        Retorna los bytes escritos (ver exportacion.exportar_en_segundo_plano para no bloquear).
+        """
+        return exportar(self.documento, ruta, FORMATOS_EXPORTACION[formato])
+
+    def _posicion_guardada(self) -> PosicionGuardada:
+        """Cursor como (párrafo, palabra con texto dentro del párrafo, offset): sobrevive al reflow al abrir."""
+        palabra = self.current_palabra()
+        parrafo = palabra.parent.parent
+        indice, offset = 0, 0
+        for otra in parrafo.palabras():
+            if otra is palabra:
+                if otra.texto:
+                    offset = self.cursor.offset
+                else:
+                    indice = max(0, indice - 1) # Una palabra vacía: al final de la anterior
+                break
+            if otra.texto:
+                indice += 1
+                offset = otra.longitud()
+        return parrafo.indice, indice, offset
+
+    def _restaurar_cursor(self, posicion: PosicionGuardada):
+        num_parrafo, num_palabra, offset = posicion
+        self.documento.asegurar_parrafo(num_parrafo)
+        if num_parrafo >= len(self.documento.parrafos):
+            return
+        parrafo = self.documento.parrafos[num_parrafo]
+        palabras = [p for p in parrafo.palabras() if p.texto]
+        if palabras:
+            palabra = palabras[min(num_palabra, len(palabras) - 1)]
+            self.cursor.mover_a(palabra, min(offset, palabra.longitud()))
+        else:
+            self.cursor.mover_a(parrafo.hijos[0].get_palabra(0), 0)
+        self.alineacion_actual = parrafo.alineacion_vigente()
+
+    def usar_documento(self, documento: Documento):
+        """Reemplaza el documento (ya paginado) y reinicia historial, vista, cursor y selección."""
+        self.documento = documento
+        self.invoker = CommandInvoker()
+        self.viewport = Viewport(self.documento)
+        self.cursor = Cursor(self.documento.palabra_en(0, 0, 0, 0), 0)
+        self.ancla = None
+        self.alineacion_actual = AlineacionIzquierda()
+
+    def _maquetar(self):
+        """Reflow del párrafo del cursor y paginación, salvo con el maquetado diferido."""
+        if self.maquetado_diferido:
+            return
+        with INSTRUMENTACION.medir("reflow"):
+            self.current_parrafo().aplicar_reflow()
+        with INSTRUMENTACION.medir("paginacion"):
+            self.documento.actualizar_paginas()
+
+    def _ejecutar(self, cmd):
+        """Ejecuta el comando en el historial. Retorna la entrada (puede ser una fusionada)."""
+        with INSTRUMENTACION.medir("comando"):
+            return self.invoker.ejecutar(cmd)
 
     def current_palabra(self) -> Palabra:
-        _, _, _, palabra_idx, _ = self.cursor
-        return self.current_linea().get_palabra(palabra_idx)
+        palabra = self.cursor.resolver()
+        if palabra is None:
+            # El ancla quedó fuera del documento: se vuelve al inicio (como antes con (0,0,0,0,0))
+            palabra = self.documento.palabra_en(0, 0, 0, 0)
+            self.cursor.mover_a(palabra, 0)
+        return palabra
+
+    def current_linea(self) -> Linea:
+        return self.current_palabra().parent
+
+    def current_parrafo(self) -> Parrafo:
+        """Párrafo lógico bajo el cursor."""
+        return self.current_linea().parent
 
     def current_pagina(self) -> Pagina:
-        p_idx, _, _, _, _ = self.cursor
-        return self.documento.hijos[p_idx]
+        return self.documento.hijos[self.posicion_cursor()[0]]
+
+    def posicion_cursor(self) -> Tuple[int, int, int, int, int]:
+        """Coordenadas (página, párrafo, línea, palabra, offset) del cursor, en O(1)."""
+        posicion = self.documento.posicion_de(self.current_palabra())
+        if posicion is None:
+            return (0, 0, 0, 0, 0)
+        return posicion + (self.cursor.offset,)
 
     def set_cursor(self, palabra_idx: int, char_offset: int) -> None:
-        p_idx, par_idx, lin_idx, _, _ = self.cursor
-        self.cursor = (p_idx, par_idx, lin_idx, palabra_idx, char_offset)
+        self.cursor.mover_a(self.current_linea().get_palabra(palabra_idx), char_offset)
         
     def ensure_word_exists(self, palabra_idx: int):
         linea = self.current_linea()
         linea.get_palabra(palabra_idx)
 
+    def iniciar_seleccion(self):
+        """Fija el ancla en la posición del cursor: la selección sigue al cursor desde ahí."""
+        self.current_palabra()
+        self.ancla = self.cursor.copia()
 
-    def _recalcular_cursor_post_reflow(self, palabra_ref: Palabra, offset: int):
-        
-        for p_idx, pagina in enumerate(self.documento.hijos):
-            for par_idx, parrafo in enumerate(pagina.hijos):
-                for lin_idx, linea in enumerate(parrafo.hijos):
-                    for w_idx, palabra in enumerate(linea.hijos):
-                        if palabra is palabra_ref:
-                            self.cursor = (p_idx, par_idx, lin_idx, w_idx, offset)
-                            return
-        
-        self.cursor = (0, 0, 0, 0, 0)
+    def cancelar_seleccion(self):
+        self.ancla = None
+
+    def hay_seleccion(self) -> bool:
+        return self.rango_seleccion() is not None
+
+    def rango_seleccion(self) -> Optional[Tuple[Palabra, int, Palabra, int]]:
+        """
+        Retorna (palabra_inicio, offset_inicio, palabra_fin, offset_fin) con el inicio antes
+        que el fin, o None si no hay selección (o está vacía). Se ordena en O(1) con el índice
+        de posiciones (párrafo, línea, palabra) que mantienen el reflow y la paginación.
+        """
+        if self.ancla is None:
+            return None
+        ancla = self.ancla.resolver()
+        if ancla is None:
+            self.ancla = None
+            return None
+        cursor = self.current_palabra()
+        inicio, fin = (ancla, self.ancla.offset), (cursor, self.cursor.offset)
+        if _clave_posicion(*fin) < _clave_posicion(*inicio):
+            inicio, fin = fin, inicio
+        if inicio == fin:
+            return None
+        return inicio + fin
+
+    def eliminar_seleccion(self) -> bool:
+        """Elimina el texto seleccionado como un solo comando. Retorna si había selección."""
+        return self.reemplazar_seleccion("")
+
+    def reemplazar_seleccion(self, texto: str) -> bool:
+        """
+        Reemplaza el texto seleccionado por 'texto' (vacío: elimina) como un solo comando:
+        solo se reorganizan los párrafos afectados y se pagina una vez.
+        Retorna si había selección.
+        """
+        rango = self.rango_seleccion()
+        self.ancla = None
+        if rango is None:
+            return False
+
+        if texto:
+            cmd = ReemplazarRangoCommand(self.documento, *rango, texto)
+        else:
+            cmd = EliminarRangoCommand(self.documento, *rango)
+        cmd.cursor_pos_antes = self.cursor.copia()
+        cmd = self._ejecutar(cmd)
+
+        self.cursor.mover_a(cmd.palabra_final, cmd.offset_final)
+        cmd.cursor_pos_despues = self.cursor.copia()
+
+        self._maquetar()
+        return True
+
+    def alinear_seleccion(self, nombre: str) -> bool:
+        """
+        Cambia la alineación de los párrafos que toca la selección (se puede deshacer).
+        Retorna si había selección.
+        """
+        rango = self.rango_seleccion()
+        est = ESTRATEGIAS_ALINEACION.get(nombre.lower())
+        if rango is None or est is None:
+            return False
+
+        desde, hasta = rango[0].parent.parent.indice, rango[2].parent.parent.indice
+        cmd = AlinearRangoCommand(self.documento.parrafos[desde:hasta + 1], est)
+        cmd.cursor_pos_antes = self.cursor.copia()
+        cmd.cursor_pos_despues = self.cursor.copia()
+        self._ejecutar(cmd)
+        self.alineacion_actual = est
+        return True
 
     def insertar_caracter(self, caracter: str):
-        p_idx, par_idx, lin_idx, palabra_idx, char_offset = self.cursor
-        cursor_ant = self.cursor
-        linea = self.current_linea()
+        if self.ancla is not None and self.reemplazar_seleccion(caracter):
+            return
         palabra_mod = self.current_palabra()
+        linea = palabra_mod.parent
+        palabra_idx = linea.indice_de(palabra_mod)
+        char_offset = self.cursor.offset
+        cursor_ant = self.cursor.copia()
         
 
         if caracter == ' ' or caracter == '\n':
@@ -93,108 +294,268 @@ class EditorConsola:
             if caracter == ' ': 
                 if palabra_mod.texto.strip():
                     nueva_palabra = Palabra("", parent=linea)
-                    linea.hijos.insert(palabra_idx + 1, nueva_palabra)
-                    self.cursor = (p_idx, par_idx, lin_idx, palabra_idx + 1, 0)
+                    linea.insertar_palabra(palabra_idx + 1, nueva_palabra)
+                    self.cursor.mover_a(nueva_palabra, 0)
                 
-                self.current_parrafo().aplicar_reflow()
-                self.documento.actualizar_paginas()
+                self._maquetar()
                 return 
 
         
         cmd = AgregarCaracterCommand(linea, palabra_idx, char_offset, caracter)
         cmd.cursor_pos_antes = cursor_ant
 
-        self.invoker.ejecutar(cmd)
+        # Si se fusionó con el comando anterior, el historial retorna esa entrada
+        cmd = self._ejecutar(cmd)
         
-        nuevo_offset = char_offset + 1
-        
-        self.current_parrafo().aplicar_reflow()
-        self.documento.actualizar_paginas() 
+        self._maquetar()
         
-        self._recalcular_cursor_post_reflow(palabra_mod, nuevo_offset)
-        cmd.cursor_pos_despues = self.cursor
+        # El cursor está anclado a la palabra: el reflow no obliga a buscarla en el árbol
+        self.cursor.mover_a(palabra_mod, char_offset + 1)
+        cmd.cursor_pos_despues = self.cursor.copia()
+
+    def insertar_texto(self, texto: str):
+        """
+        Inserta un bloque de texto en el cursor como una sola operación: un comando,
+        un reflow y una paginación. Una línea en blanco en el bloque separa párrafos.
+        """
+        if not texto:
+            return
+        if self.ancla is not None and self.reemplazar_seleccion(texto):
+            return
+        if len(texto) == 1:
+            self.insertar_caracter(texto)
+            return
+        parrafos, _, _ = tokenizar_bloque(texto)
+        if len(parrafos) == 1 and not parrafos[0]:
+            # Solo espacios: separan la palabra actual como un espacio tipeado
+            self.insertar_caracter(' ')
+            return
+
+        cmd = InsertarTextoCommand(self.documento, self.current_palabra(), self.cursor.offset, texto)
+        cmd.cursor_pos_antes = self.cursor.copia()
+        cmd = self._ejecutar(cmd)
+
+        # Se ancla antes del reflow: si este descarta la palabra vacía final, el cursor
+        # pasa a la siguiente de su vecina previa (igual que al tipear un espacio)
+        self.cursor.mover_a(cmd.palabra_final, cmd.offset_final)
+        cmd.cursor_pos_despues = self.cursor.copia()
+
+        self._maquetar()
 
     def eliminar_caracter(self):
-        cursor_ant = self.cursor
-        _, _, _, palabra_idx, char_offset = self.cursor
+        if self.ancla is not None and self.eliminar_seleccion():
+            return
+        cursor_ant = self.cursor.copia()
+        char_offset = self.cursor.offset
         if char_offset == 0: return
 
         borrar_pos = char_offset - 1
-        linea = self.current_linea()
         palabra_mod = self.current_palabra()
+        linea = palabra_mod.parent
 
-        cmd = EliminarCaracterCommand(linea, palabra_idx, borrar_pos)
+        cmd = EliminarCaracterCommand(linea, linea.indice_de(palabra_mod), borrar_pos)
         cmd.cursor_pos_antes = cursor_ant
 
-        self.invoker.ejecutar(cmd)
+        # Si se fusionó con el comando anterior, el historial retorna esa entrada
+        cmd = self._ejecutar(cmd)
         
-        self.current_parrafo().aplicar_reflow()
-        self.documento.actualizar_paginas() 
-        
-        self._recalcular_cursor_post_reflow(palabra_mod, borrar_pos)
-        cmd.cursor_pos_despues = self.cursor
+        # Se ancla antes del reflow: si la palabra quedó vacía y el reflow la descarta, el
+        # cursor sigue a su vecina previa (antes volvía al inicio del documento)
+        self.cursor.mover_a(palabra_mod, borrar_pos)
+        cmd.cursor_pos_despues = self.cursor.copia()
+
+        self._maquetar()
 
     def deshacer(self):
-        cmd = self.invoker.deshacer()
+        with INSTRUMENTACION.medir("comando"):
+            cmd = self.invoker.deshacer()
         if cmd and hasattr(cmd, 'cursor_pos_antes'):
-            self.current_parrafo().aplicar_reflow()
-            self.documento.actualizar_paginas()
+            self._maquetar()
             
-            self.cursor = cmd.cursor_pos_antes
+            self.cursor = cmd.cursor_pos_antes.copia()
 
     def rehacer(self):
-        cmd = self.invoker.rehacer()
+        with INSTRUMENTACION.medir("comando"):
+            cmd = self.invoker.rehacer()
         if cmd and hasattr(cmd, 'cursor_pos_despues'):
-            self.current_parrafo().aplicar_reflow()
-            self.documento.actualizar_paginas()
+            self._maquetar()
             
-            self.cursor = cmd.cursor_pos_despues
+            self.cursor = cmd.cursor_pos_despues.copia()
 
     def cambiar_alineacion(self, nombre: str):
-        estrategias = {
-             "izquierda": AlineacionIzquierda(), "derecha": AlineacionDerecha(), 
-             "centrada": AlineacionCentrada(), "justificada": AlineacionJustificada()
-        }
-        est = estrategias.get(nombre.lower())
+        if self.ancla is not None and self.alinear_seleccion(nombre):
+            return
+        est = ESTRATEGIAS_ALINEACION.get(nombre.lower())
         if est:
             self.alineacion_actual = est
             self.current_parrafo().cambiar_alineacion(est)
-            self.current_parrafo().aplicar_reflow() 
-            self.documento.actualizar_paginas()
+            self._maquetar()
 
 
-    def mostrar_documento(self):
-        self.documento.actualizar_paginas() 
-        
-        
-        p_idx, par_idx, lin_idx, palabra_idx, char_offset = self.cursor
-        documento_str = ""
-        
+    def ciclar_alineacion(self):
+        """Pasa a la alineación siguiente de CICLO_ALINEACION (Ctrl+L)."""
+        actual = next((nombre for nombre in CICLO_ALINEACION
+                       if type(ESTRATEGIAS_ALINEACION[nombre]) is type(self.alineacion_actual)), CICLO_ALINEACION[0])
+        self.cambiar_alineacion(CICLO_ALINEACION[(CICLO_ALINEACION.index(actual) + 1) % len(CICLO_ALINEACION)])
+
+    def cambiar_corte(self, nombre: str):
+        """Cambia el criterio de corte de líneas del párrafo del cursor."""
+        corte = ESTRATEGIAS_CORTE.get(nombre.lower())
+        if corte:
+            self.current_parrafo().cambiar_corte(corte)
+            self._maquetar()
+
+    def alternar_corte(self):
+        """Alterna el párrafo del cursor entre el primer ajuste y el corte óptimo (Ctrl+K)."""
+        optimo = self.current_parrafo().corte is ESTRATEGIAS_CORTE["optimo"]
+        self.cambiar_corte("primer_ajuste" if optimo else "optimo")
+
+    def buscar(self, consulta: str, prefijo: bool = False, ignorar_mayusculas: bool = False,
+               hacia_atras: bool = False) -> bool:
+        """
+        Mueve el cursor a la próxima coincidencia de la consulta (o a la anterior), dando la
+        vuelta al documento, y la deja seleccionada. Usa el índice invertido del documento:
+        no recorre las palabras. Retorna si hubo alguna coincidencia.
+        """
+        desde = self.current_palabra()
+        with INSTRUMENTACION.medir("busqueda"):
+            palabra = self.documento.indice_palabras().siguiente(desde, consulta, prefijo,
+                                                                 ignorar_mayusculas, hacia_atras)
+        if palabra is None:
+            return False
+        inicio, fin = tramo_forma(palabra.texto)
+        if prefijo:
+            fin = inicio + len(normalizar(consulta))
+        self.cursor.mover_a(palabra, inicio)
+        self.iniciar_seleccion()
+        self.cursor.mover_a(palabra, fin)
+        return True
+
+    def buscar_palabra_cursor(self, hacia_atras: bool = False) -> bool:
+        """Busca la siguiente (o anterior) aparición de la palabra del cursor, sin mayúsculas (Ctrl+F / Ctrl+B)."""
+        consulta = normalizar(self.current_palabra().texto)
+        return bool(consulta) and self.buscar(consulta, ignorar_mayusculas=True, hacia_atras=hacia_atras)
+
+    def reemplazar_todo(self, consulta: str, reemplazo: str, prefijo: bool = False,
+                        ignorar_mayusculas: bool = False) -> int:
+        """
+        Reemplaza todas las coincidencias de la consulta por 'reemplazo' (una palabra, o vacío
+        para borrarlas) como un solo comando: los signos que rodean a cada palabra se conservan
+        y con prefijo solo se reemplaza el prefijo. Hay un único reflow de los párrafos tocados
+        y una única paginación. Retorna la cantidad de palabras cambiadas.
+        """
+        if any(caracter.isspace() for caracter in reemplazo):
+            raise ValueError("El reemplazo debe ser una sola palabra")
+        palabras = self.documento.indice_palabras().ocurrencias(consulta, prefijo, ignorar_mayusculas)
+        largo = len(normalizar(consulta))
+        cambios: List[Tuple[Palabra, str]] = []
+        for palabra in palabras:
+            texto = palabra.texto
+            inicio, fin = tramo_forma(texto)
+            if prefijo:
+                fin = inicio + largo
+            nuevo = texto[:inicio] + reemplazo + texto[fin:]
+            if nuevo != texto:
+                cambios.append((palabra, nuevo))
+        if not cambios:
+            return 0
+
+        self.ancla = None
+        palabra_cursor = self.current_palabra()
+        cmd = ReemplazarPalabrasCommand(cambios)
+        cmd.cursor_pos_antes = self.cursor.copia()
+        self._ejecutar(cmd)
+        self.cursor.mover_a(palabra_cursor, min(self.cursor.offset, palabra_cursor.longitud()))
+        cmd.cursor_pos_despues = self.cursor.copia()
+
+        self._maquetar()
+        return len(cambios)
+
+    def aplicar_acciones(self, acciones: List[Tuple[str, str]],
+                         otras: Optional[Callable[[str], None]] = None):
+        """
+        Aplica un lote de acciones de entrada (tipo, dato): "texto", "borrar", "deshacer",
+        "rehacer", "alinear", "corte", "buscar" y "buscar_atras"; los demás tipos se pasan
+        a 'otras' (o se ignoran).
+        El reflow y la paginación quedan diferidos hasta la próxima vista; los caracteres
+        consecutivos se insertan juntos con insertar_texto (uno solo va por insertar_caracter).
+        """
+        INSTRUMENTACION.contar("acciones_por_frame", len(acciones))
+        self.maquetado_diferido = True
         try:
-            palabra_cursor: Palabra = self.current_palabra()
-            texto_original = palabra_cursor.texto
-            palabra_cursor.texto = (
-                texto_original[:char_offset] + "|" + texto_original[char_offset:]
-            )
-            
-            documento_str = self.documento.mostrar()
-            palabra_cursor.texto = texto_original
-            
-        except IndexError:
-            
-            documento_str = self.documento.mostrar()
+            with INSTRUMENTACION.medir("aplicar"):
+                texto: List[str] = []
+                for tipo, dato in acciones:
+                    if tipo == "texto":
+                        texto.append(dato)
+                        continue
+                    self._insertar_tecleado("".join(texto))
+                    texto.clear()
+                    with INSTRUMENTACION.medir(tipo):
+                        self._aplicar_accion(tipo, otras)
+                self._insertar_tecleado("".join(texto))
+        finally:
+            self.maquetado_diferido = False
+
+    def _insertar_tecleado(self, texto: str):
+        if not texto:
+            return
+        with INSTRUMENTACION.medir("texto"):
+            if len(texto) == 1:
+                self.insertar_caracter(texto)
+            else:
+                self.insertar_texto(texto)
 
+    def _aplicar_accion(self, tipo: str, otras: Optional[Callable[[str], None]]):
+        if tipo == "borrar":
+            self.eliminar_caracter()
+        elif tipo == "deshacer":
+            self.deshacer()
+        elif tipo == "rehacer":
+            self.rehacer()
+        elif tipo == "alinear":
+            self.ciclar_alineacion()
+        elif tipo == "corte":
+            self.alternar_corte()
+        elif tipo == "buscar":
+            self.buscar_palabra_cursor()
+        elif tipo == "buscar_atras":
+            self.buscar_palabra_cursor(hacia_atras=True)
+        elif otras is not None:
+            otras(tipo)
 
+    def lineas_documento(self, alto: Optional[int] = None) -> List[str]:
+        """
+        Filas de la vista del documento (estadísticas + contenido), sin imprimir.
+        Con alto se muestran solo esas filas del documento, alrededor de la página del cursor.
+        """
+        with INSTRUMENTACION.medir("paginacion"):
+            self.documento.actualizar_paginas()
+
+        with INSTRUMENTACION.medir("cursor"):
+            self.current_palabra() # Reubica el cursor si el reflow descartó su palabra
+            self.viewport.alto = alto
+            self.viewport.seguir(self.posicion_cursor()[0])
+        with INSTRUMENTACION.medir("viewport"):
+            filas_documento = self.viewport.filas(self.cursor)
         
         parrafos = self.documento.contar_parrafos()
         palabras = self.documento.contar_palabras()
         paginas = self.documento.contar_paginas()
         lineas = self.documento.contar_lineas()
         
-        print("=" * self.ancho_linea)
-        print(f"📊 Palabras: {palabras} | Párrafos: {parrafos} | Líneas: {lineas} | Páginas: {paginas}")
-        print(f"📌 Cursor: {self.cursor} | Alineación: {self.alineacion_actual.__class__.__name__}")
-        print("=" * self.ancho_linea)
-        print(documento_str)
-        print("=" * self.ancho_linea)
-        print()
\ No newline at end of file
+        # Con un archivo parcialmente cargado los totales son mínimos ("+")
+        mas = "" if self.documento.cargado_completo() else "+"
+        # Los párrafos son exactos apenas se termina de indexar el archivo (aunque no estén cargados)
+        mas_parrafos = "" if self.documento.indice_completo() else "+"
+        filas = ["=" * self.ancho_linea]
+        filas.append(f"📊 Palabras: {palabras}{mas} | Párrafos: {parrafos}{mas_parrafos} | Líneas: {lineas}{mas} | Páginas: {paginas}{mas}")
+        filas.append(f"📌 Cursor: {self.posicion_cursor()} | Alineación: {self.alineacion_actual.__class__.__name__}")
+        filas.append("=" * self.ancho_linea)
+        filas.extend(filas_documento)
+        filas.append("=" * self.ancho_linea)
+        filas.append("")
+        return filas
+
+    def mostrar_documento(self):
+        print("\n".join(self.lineas_documento()))
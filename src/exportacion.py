@@ -0,0 +1,194 @@
+import argparse
+import asyncio
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+from src.composite.documento import Documento
+from src.composite.fuente_archivo import FuenteArchivo
+from src.composite.linea import Linea
+from src.composite.pagina import Pagina
+from src.formato_binario import FuenteBinaria, InstantaneaBinaria, es_documento_binario
+from src.instrumentacion import INSTRUMENTACION
+from src.strategy.exportacion_strategy import FORMATOS_EXPORTACION, IStrategyExportacion
+
+# Caracteres que el sumidero junta antes de cada escritura
+TAMANIO_BLOQUE = 1 << 20
+
+
+class SumideroArchivo:
+    """
+    Archivo de salida que junta los textos y los escribe en bloques de 'tamanio_bloque' caracteres.
+    Patrón de Diseño: Buffer (pocas escrituras grandes en lugar de una por línea).
+    Ítem de Cambio Oculto: Cuándo y cómo llega la salida al disco.
+
+    Escribe a un archivo temporal que recién al cerrar reemplaza al destino: una exportación
+    interrumpida (o que falla) no deja un archivo a medias.
+    """
+    def __init__(self, ruta: str, tamanio_bloque: int = TAMANIO_BLOQUE):
+        self.ruta = ruta
+        self.tamanio_bloque = tamanio_bloque
+        self._temporal = ruta + ".tmp"
+        self._archivo: BinaryIO = open(self._temporal, "wb", buffering=0)
+        self._partes: List[str] = []
+        self._pendientes = 0
+        self.bytes_escritos = 0
+        self.bloques = 0
+
+    def __enter__(self) -> "SumideroArchivo":
+        return self
+
+    def __exit__(self, tipo, *_) -> None:
+        if tipo is None:
+            self.cerrar()
+        else:
+            self.descartar()
+
+    def escribir(self, texto: str) -> None:
+        self._partes.append(texto)
+        self._pendientes += len(texto)
+        if self._pendientes >= self.tamanio_bloque:
+            self._vaciar()
+
+    def _vaciar(self) -> None:
+        if self._partes:
+            self.bytes_escritos += self._archivo.write("".join(self._partes).encode("utf-8"))
+            self.bloques += 1
+            self._partes.clear()
+            self._pendientes = 0
+
+    def cerrar(self) -> None:
+        """Escribe lo pendiente y reemplaza el destino por el archivo completo."""
+        self._vaciar()
+        self._archivo.close()
+        os.replace(self._temporal, self.ruta)
+
+    def descartar(self) -> None:
+        self._archivo.close()
+        os.remove(self._temporal)
+
+
+def recorrer_segmentos(documento: Documento) -> Iterator[Tuple[int, int, List[Linea]]]:
+    """
+    Recorre el documento como lo pagina Documento.actualizar_paginas: produce
+    (página, posición del tramo en la página, líneas del tramo). Las páginas ya armadas se
+    recorren tal cual; los párrafos que siguen sin cargar se construyen de a uno desde el
+    archivo de origen, se paginan acá y se descartan: el documento no crece al exportar.
+    """
+    documento.actualizar_paginas()
+    maximo = Pagina.MAX_LINEAS_POR_PAGINA
+    num_pagina, num_segmento, lineas_en_pagina = -1, 0, maximo
+    for num_pagina in range(len(documento.hijos)):
+        lineas_en_pagina = 0
+        for num_segmento, segmento in enumerate(documento.hijos[num_pagina].hijos):
+            lineas = segmento.hijos
+            lineas_en_pagina += len(lineas)
+            yield num_pagina, num_segmento, lineas
+        num_segmento += 1
+
+    pendientes = documento.parrafos_pendientes()
+    if pendientes is None:
+        return
+    fuente, indice, ancho = pendientes
+    while fuente.indexar_hasta(indice + 1):
+        parrafo = fuente.parrafo(indice, ancho)
+        parrafo.aplicar_reflow()
+        indice += 1
+        lineas, desde = parrafo.hijos, 0
+        while desde < len(lineas):
+            if lineas_en_pagina == maximo:
+                num_pagina, num_segmento, lineas_en_pagina = num_pagina + 1, 0, 0
+            toma = min(len(lineas) - desde, maximo - lineas_en_pagina)
+            yield num_pagina, num_segmento, lineas[desde:desde + toma]
+            num_segmento += 1
+            lineas_en_pagina += toma
+            desde += toma
+
+
+def exportar_textos(documento: Documento, escritor: IStrategyExportacion, titulo: str = "") -> Iterator[str]:
+    """Textos de la exportación en orden, de a un tramo de párrafo: concatenados forman el archivo."""
+    yield escritor.inicio(titulo)
+    pagina_actual: Optional[int] = None
+    for num_pagina, num_segmento, lineas in recorrer_segmentos(documento):
+        if num_pagina != pagina_actual:
+            if pagina_actual is not None:
+                yield escritor.fin_pagina(pagina_actual)
+            yield escritor.inicio_pagina(num_pagina)
+            pagina_actual = num_pagina
+        yield escritor.segmento(num_segmento, lineas)
+    if pagina_actual is not None:
+        yield escritor.fin_pagina(pagina_actual)
+    yield escritor.fin()
+
+
+def exportar(documento: Documento, destino: str, escritor: IStrategyExportacion, titulo: Optional[str] = None,
+             tamanio_bloque: int = TAMANIO_BLOQUE) -> int:
+    """
+    Exporta el documento a 'destino' con la memoria acotada por un tramo de párrafo y el
+    bloque del sumidero, sin importar el tamaño del documento. Retorna los bytes escritos.
+    """
+    if titulo is None:
+        titulo = os.path.splitext(os.path.basename(destino))[0]
+    with INSTRUMENTACION.medir("exportar"):
+        with SumideroArchivo(destino, tamanio_bloque) as sumidero:
+            for texto in exportar_textos(documento, escritor, titulo):
+                sumidero.escribir(texto)
+        return sumidero.bytes_escritos
+
+
+def exportar_archivo(origen: str, destino: str, formato: str, ancho_linea: int) -> int:
+    """
+    Exporta un archivo de texto o un documento binario sin cargarlo: cada párrafo se construye,
+    se escribe y se descarta. Es la tarea del proceso de exportar_en_segundo_plano.
+    """
+    fuente = FuenteBinaria(origen) if es_documento_binario(origen) else FuenteArchivo(origen)
+    documento = Documento()
+    documento.abrir_fuente(fuente, ancho_linea)
+    try:
+        return exportar(documento, destino, FORMATOS_EXPORTACION[formato])
+    finally:
+        fuente.cerrar()
+
+
+async def exportar_en_segundo_plano(documento: Documento, destino: str, formato: str, ancho_linea: int,
+                                    ejecutor: Optional[Executor] = None) -> int:
+    """
+    Exporta el estado actual del documento mientras se sigue editando. En el hilo del editor
+    solo se toma una InstantaneaBinaria (las modificaciones posteriores no la afectan); se
+    escribe en un hilo y se exporta desde ese archivo en 'ejecutor' (por defecto un proceso
+    aparte, que no compite con el editor por el GIL). Retorna los bytes exportados.
+    """
+    instantanea = InstantaneaBinaria(documento)
+    temporal = destino + ".instantanea.edb"
+    loop = asyncio.get_running_loop()
+    propio = ejecutor is None
+    if propio:
+        ejecutor = ProcessPoolExecutor(max_workers=1)
+    try:
+        await loop.run_in_executor(None, instantanea.escribir, temporal)
+        return await loop.run_in_executor(ejecutor, exportar_archivo, temporal, destino, formato, ancho_linea)
+    finally:
+        if propio:
+            ejecutor.shutdown(wait=False)
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+def main_exportar(argumentos: List[str]) -> int:
+    """Subcomando 'exportar': python -m src exportar archivo [--formato html] [--salida ruta] [--ancho N]."""
+    analizador = argparse.ArgumentParser(prog="python -m src exportar",
+                                         description="Exporta un archivo de texto o un documento binario (.edb).")
+    analizador.add_argument("archivo", help="archivo de texto o documento binario (.edb)")
+    analizador.add_argument("--formato", choices=list(FORMATOS_EXPORTACION), default="html")
+    analizador.add_argument("--salida", help="archivo de salida (por defecto, el de entrada con la extensión del formato)")
+    analizador.add_argument("--ancho", type=int, default=80, help="ancho de línea (por defecto 80)")
+    opciones = analizador.parse_args(argumentos)
+
+    escritor = FORMATOS_EXPORTACION[opciones.formato]
+    destino = opciones.salida or os.path.splitext(opciones.archivo)[0] + escritor.extension
+    if os.path.abspath(destino) == os.path.abspath(opciones.archivo):
+        print("La salida no puede ser el archivo de entrada.", file=sys.stderr)
+        return 1
+    escritos = exportar_archivo(opciones.archivo, destino, opciones.formato, opciones.ancho)
+    print(f"📄 {destino} ({escritos} bytes)", file=sys.stderr)
+    return 0
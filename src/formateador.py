@@ -0,0 +1,195 @@
+import argparse
+import codecs
+import re
+import sys
+import time
+from typing import BinaryIO, Iterable, Iterator, List, Optional, TextIO, Tuple
+from src.composite.pagina import Pagina
+from src.composite.parrafo import parrafo_desde_palabras
+from src.strategy.alineacion_strategy import (
+    IStrategyAlineacion,
+    AlineacionIzquierda,
+    AlineacionDerecha,
+    AlineacionCentrada,
+    AlineacionJustificada
+)
+
+# Bytes que se leen de la entrada por vez
+TAMANIO_BLOQUE = 1 << 16
+# Palabras y saltos de línea (los que delimitan las líneas en blanco entre párrafos)
+_TOKENS = re.compile(r"[^\s]+|\n")
+
+
+class Medidor:
+    """Acumula bytes leídos y escritos para informar el rendimiento (MB/s)."""
+    def __init__(self):
+        self.bytes_leidos = 0
+        self.bytes_escritos = 0
+        self.parrafos = 0
+        self.paginas = 0
+        self._inicio = time.perf_counter()
+
+    def segundos(self) -> float:
+        return time.perf_counter() - self._inicio
+
+    def mb_por_segundo(self) -> float:
+        return self.bytes_leidos / (1024 * 1024) / max(self.segundos(), 1e-9)
+
+    def resumen(self) -> str:
+        return (f"📊 {self.bytes_leidos / (1024 * 1024):.2f} MB leídos | Párrafos: {self.parrafos} | "
+                f"Páginas: {self.paginas} | {self.segundos():.2f} s | {self.mb_por_segundo():.2f} MB/s")
+
+
+def leer_bloques(entrada: BinaryIO, medidor: Medidor, tamanio_bloque: int = TAMANIO_BLOQUE) -> Iterator[str]:
+    """
+    Etapa 1: el flujo de entrada en bloques de tamanio_bloque bytes, decodificados. No se
+    lee por líneas: una entrada sin saltos de línea tampoco se carga entera.
+    """
+    decodificador = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while True:
+        bruto = entrada.read(tamanio_bloque)
+        if not bruto:
+            break
+        medidor.bytes_leidos += len(bruto)
+        yield decodificador.decode(bruto)
+    yield decodificador.decode(b"", final=True)
+
+
+def tokenizar(bloques: Iterable[str]) -> Iterator[Optional[str]]:
+    """
+    Etapa 2: palabras del texto; None marca el fin de un párrafo (una línea en blanco o con
+    solo espacios entre dos palabras). La palabra cortada al final de un bloque se completa
+    con el siguiente.
+    """
+    resto = ""
+    saltos = 0 # Saltos de línea desde la última palabra
+    for bloque in bloques:
+        texto = resto + bloque
+        fin = len(texto)
+        while fin and not texto[fin - 1].isspace():
+            fin -= 1
+        resto = texto[fin:]
+        for token in _TOKENS.findall(texto, 0, fin):
+            if token == "\n":
+                saltos += 1
+                continue
+            if saltos >= 2:
+                yield None
+            saltos = 0
+            yield token
+    if resto:
+        if saltos >= 2:
+            yield None
+        yield resto
+    yield None
+
+
+def agrupar_parrafos(tokens: Iterable[Optional[str]], max_palabras: int) -> Iterator[Tuple[List[str], bool]]:
+    """
+    Etapa 3: bloques de a lo sumo max_palabras palabras de un mismo párrafo.
+    Retorna (palabras, fin_de_parrafo); un párrafo enorme se entrega en varios bloques.
+    """
+    bloque: List[str] = []
+    abierto = False # Ya se entregó algún bloque del párrafo actual
+    for token in tokens:
+        if token is None:
+            if bloque or abierto:
+                yield bloque, True
+                bloque = []
+                abierto = False
+            continue
+        bloque.append(token)
+        if len(bloque) >= max_palabras:
+            yield bloque, False
+            bloque = []
+            abierto = True
+
+
+def maquetar(bloques: Iterable[Tuple[List[str], bool]], ancho: int) -> Iterator[Tuple[List[str], bool]]:
+    """
+    Etapa 4: reflow de cada párrafo con Parrafo.aplicar_reflow. Retorna (palabras de la línea,
+    es_primera_del_parrafo). Cuando un párrafo llega en varios bloques, la última línea de
+    cada bloque se reprocesa con el siguiente: el reflow de primer ajuste solo depende del
+    comienzo de la línea, así que el resultado es el mismo que con el párrafo completo.
+    """
+    pendiente: List[str] = []
+    primera = True
+    for palabras, fin_de_parrafo in bloques:
+        parrafo = parrafo_desde_palabras(pendiente + palabras, ancho)
+        parrafo.aplicar_reflow(completo=True)
+
+        # Las líneas tal como las deja el editor, incluida la línea vacía del cursor que sigue a
+        # una última palabra más ancha que la línea (Documento.mostrar() también la muestra)
+        lineas = [[p.texto for p in l.hijos if p.texto] for l in parrafo.hijos]
+        pendiente = [] if fin_de_parrafo else lineas.pop()
+        for contenido in lineas:
+            yield contenido, primera
+            primera = False
+        if fin_de_parrafo:
+            primera = True
+
+
+def paginar(lineas: Iterable[Tuple[List[str], bool]], ancho: int, alineacion: IStrategyAlineacion,
+            medidor: Medidor) -> Iterator[str]:
+    """
+    Etapa 5: texto formateado con el mismo esquema que Documento.mostrar(): páginas de
+    Pagina.MAX_LINEAS_POR_PAGINA líneas y párrafos de una misma página separados por una línea en blanco.
+    """
+    separador = "=" * 40
+    maximo = Pagina.MAX_LINEAS_POR_PAGINA
+    lineas_en_pagina = maximo
+    for palabras, primera in lineas:
+        if primera:
+            medidor.parrafos += 1
+        if lineas_en_pagina == maximo:
+            prefijo = "\n\n" if medidor.paginas > 0 else ""
+            medidor.paginas += 1
+            lineas_en_pagina = 0
+            yield f"{prefijo}{separador}\n📄 Página {medidor.paginas}\n{separador}\n"
+        elif primera:
+            yield "\n\n"
+        lineas_en_pagina += 1
+        yield alineacion.aplicar_alineacion(palabras, ancho)
+
+
+def formatear(entrada: BinaryIO, salida: TextIO, ancho: int = 80,
+              alineacion: Optional[IStrategyAlineacion] = None, max_palabras: int = 4096) -> Medidor:
+    """
+    Formatea un flujo de texto sin construir el Documento: la memoria queda acotada por el
+    bloque de lectura, max_palabras y el búfer de salida, sin importar el tamaño de la entrada
+    ni la longitud de sus líneas.
+    """
+    medidor = Medidor()
+    alineacion = alineacion or AlineacionIzquierda()
+    tokens = tokenizar(leer_bloques(entrada, medidor))
+    lineas = maquetar(agrupar_parrafos(tokens, max_palabras), ancho)
+    for texto in paginar(lineas, ancho, alineacion, medidor):
+        salida.write(texto)
+        medidor.bytes_escritos += len(texto.encode("utf-8"))
+    salida.flush()
+    return medidor
+
+
+def main_formatear(argumentos: List[str]) -> int:
+    """Subcomando 'formatear': python -m src formatear [archivo] [--ancho N] [--alineacion nombre]."""
+    estrategias = {
+        "izquierda": AlineacionIzquierda(), "derecha": AlineacionDerecha(),
+        "centrada": AlineacionCentrada(), "justificada": AlineacionJustificada()
+    }
+    analizador = argparse.ArgumentParser(prog="python -m src formatear",
+                                         description="Formatea texto en páginas sin abrir el editor.")
+    analizador.add_argument("archivo", nargs="?", help="archivo de entrada (por defecto, la entrada estándar)")
+    analizador.add_argument("--ancho", type=int, default=80, help="ancho de línea (por defecto 80)")
+    analizador.add_argument("--alineacion", choices=list(estrategias), default="izquierda")
+    opciones = analizador.parse_args(argumentos)
+
+    alineacion = estrategias[opciones.alineacion]
+    if opciones.archivo:
+        with open(opciones.archivo, "rb") as entrada:
+            medidor = formatear(entrada, sys.stdout, opciones.ancho, alineacion)
+    else:
+        medidor = formatear(sys.stdin.buffer, sys.stdout, opciones.ancho, alineacion)
+
+    # El resumen va a stderr para no mezclarse con el texto formateado
+    print(medidor.resumen(), file=sys.stderr)
+    return 0
@@ -0,0 +1,295 @@
+import os
+import struct
+import sys
+from array import array
+from typing import BinaryIO, List, Optional, Tuple
+from src.composite.documento import Documento
+from src.composite.fuente_archivo import FuenteArchivo
+from src.composite.parrafo import Parrafo, parrafo_desde_palabras
+from src.strategy.alineacion_strategy import (
+    AlineacionCentrada,
+    AlineacionDerecha,
+    AlineacionIzquierda,
+    AlineacionJustificada,
+    IStrategyAlineacion,
+)
+from src.strategy.corte_strategy import CorteOptimo, CortePrimerAjuste, IStrategyCorte
+
+# Formato de documento binario (little-endian):
+#   encabezado | texto UTF-8 de los párrafos | secciones
+# El texto es el mismo que el del archivo de texto plano (palabras separadas por un espacio,
+# párrafos por una línea en blanco): se lee del mapa de memoria sin copiarlo, como un .txt.
+# Las palabras no tienen espacios pero sí pueden tener saltos de línea: se separan solo
+# por " " y los límites de cada párrafo los dan sus secciones, no el separador. Los párrafos
+# copiados tal cual de un archivo de texto se separan por cualquier blanco (SEPARACION_TEXTO).
+# Secciones, en orden: inicios y fines de cada párrafo (q, bytes desde el comienzo del archivo),
+# ancho de línea (I), alineación (B), corte (B) y separación (B) de cada párrafo y, con CON_CORTES,
+# la primera línea de cada párrafo (q, una entrada más que párrafos) y las palabras de
+# cada línea (I). Un párrafo sin líneas se maqueta al cargarlo.
+MAGICO = b"EDTXBIN\x00"
+VERSION_FORMATO = 1
+EXTENSION = ".edb"
+CON_CORTES = 1
+SEPARACION_ESPACIO, SEPARACION_TEXTO = 0, 1
+
+# magico, version, banderas, generación (ver diario), parrafos, lineas, inicio y fin del texto,
+# inicio de las secciones, cursor (párrafo, palabra con texto dentro del párrafo, offset)
+_ENCABEZADO = struct.Struct("<8sHHIqqqqqqqq")
+
+# El código de cada estrategia es su posición en la tupla: no reordenar, solo agregar al final
+ALINEACIONES: Tuple[IStrategyAlineacion, ...] = (
+    AlineacionIzquierda(), AlineacionDerecha(), AlineacionCentrada(), AlineacionJustificada(),
+)
+CORTES: Tuple[IStrategyCorte, ...] = (CortePrimerAjuste(), CorteOptimo())
+_CODIGO_ALINEACION = {type(estrategia): codigo for codigo, estrategia in enumerate(ALINEACIONES)}
+_CODIGO_CORTE = {type(estrategia): codigo for codigo, estrategia in enumerate(CORTES)}
+
+# Posición del cursor: (párrafo, palabra con texto dentro del párrafo, offset)
+PosicionGuardada = Tuple[int, int, int]
+
+
+def es_documento_binario(ruta: str) -> bool:
+    """Si el archivo empieza con la marca del formato binario."""
+    try:
+        with open(ruta, "rb") as archivo:
+            return archivo.read(len(MAGICO)) == MAGICO
+    except OSError:
+        return False
+
+
+def ruta_binaria(ruta: Optional[str]) -> str:
+    """Dónde guardar en binario un documento abierto desde 'ruta' (un .txt no se pisa)."""
+    if ruta is None:
+        return "documento" + EXTENSION
+    if es_documento_binario(ruta):
+        return ruta
+    return os.path.splitext(ruta)[0] + EXTENSION
+
+
+def _escribir_arreglo(salida: BinaryIO, arreglo: array) -> None:
+    if sys.byteorder == "big":
+        arreglo = array(arreglo.typecode, arreglo)
+        arreglo.byteswap()
+    salida.write(arreglo)
+
+
+def _leer_arreglo(mapa, tipo: str, cantidad: int, posicion: int) -> Tuple[array, int]:
+    """Arreglo de 'cantidad' elementos leído del mapa en 'posicion'. Retorna (arreglo, posición siguiente)."""
+    arreglo = array(tipo)
+    fin = posicion + cantidad * arreglo.itemsize
+    if fin > len(mapa):
+        raise ValueError("documento binario truncado")
+    arreglo.frombytes(mapa[posicion:fin])
+    if sys.byteorder == "big":
+        arreglo.byteswap()
+    return arreglo, fin
+
+
+def describir_parrafo(parrafo: Parrafo) -> Tuple[bytes, int, int, int]:
+    """(texto UTF-8, ancho de línea, código de alineación, código de corte) de un párrafo."""
+    texto = " ".join([p.texto for p in parrafo.palabras() if p.texto]).encode("utf-8")
+    return (texto, parrafo.ancho_linea, _CODIGO_ALINEACION.get(type(parrafo.alineacion_vigente()), 0),
+            _CODIGO_CORTE.get(type(parrafo.corte), 0))
+
+
+def construir_parrafo(texto: str, separacion: int, ancho_linea: int, alineacion: int, corte: int,
+                      lineas: Optional[array] = None) -> Parrafo:
+    """Párrafo a partir de su descripción guardada; con 'lineas' (palabras por línea) no requiere reflow."""
+    palabras = texto.split() if separacion == SEPARACION_TEXTO else texto.split(" ")
+    parrafo = parrafo_desde_palabras(palabras if texto else [""], ancho_linea)
+    if alineacion < len(ALINEACIONES):
+        parrafo.cambiar_alineacion(ALINEACIONES[alineacion])
+    if corte < len(CORTES):
+        parrafo.cambiar_corte(CORTES[corte])
+    if lineas:
+        palabras_reflow = parrafo.palabras_reflow()
+        if sum(lineas) == len(palabras_reflow):
+            parrafo.aplicar_cortes(palabras_reflow, list(lineas))
+    return parrafo
+
+
+class InstantaneaBinaria:
+    """
+    Lo que se escribe al guardar, tomado del documento de una vez.
+    Patrón de Diseño: Memento (se toma en el hilo del editor y se puede escribir en otro).
+    Ítem de Cambio Oculto: Qué parte del documento se copia en memoria y qué se lee del archivo.
+
+    Los párrafos cargados quedan codificados; de los que siguen sin cargar solo se guardan
+    sus posiciones en el archivo de origen, cuyo texto se copia recién al escribir.
+    """
+    __slots__ = ("textos", "anchos", "alineaciones", "cortes", "separaciones", "primeras_lineas",
+                 "palabras_por_linea", "pendientes", "cursor")
+
+    def __init__(self, documento: Documento, cursor: PosicionGuardada = (0, 0, 0), con_cortes: bool = True):
+        documento.actualizar_paginas()
+        self.cursor = cursor
+        self.textos: List[bytes] = []
+        self.anchos, self.alineaciones, self.cortes = array("I"), array("B"), array("B")
+        self.separaciones = array("B")
+        self.primeras_lineas: Optional[array] = array("q", [0]) if con_cortes else None
+        self.palabras_por_linea: Optional[array] = array("I") if con_cortes else None
+        for parrafo in documento.parrafos:
+            texto, ancho, alineacion, corte = describir_parrafo(parrafo)
+            self.textos.append(texto)
+            self.anchos.append(ancho)
+            self.alineaciones.append(alineacion)
+            self.cortes.append(corte)
+            if con_cortes:
+                palabras_por_linea = self.palabras_por_linea
+                for linea in parrafo.hijos:
+                    hijos = linea.hijos
+                    cantidad = len(hijos)
+                    if linea.contar_palabras() != cantidad:
+                        cantidad = sum(1 for p in hijos if p.texto)
+                    if cantidad:
+                        palabras_por_linea.append(cantidad)
+                self.primeras_lineas.append(len(palabras_por_linea))
+        self.separaciones.extend(bytes(len(self.textos)))
+
+        # Párrafos sin cargar: (archivo de origen, sus inicios y fines en ese archivo)
+        self.pendientes: Optional[Tuple[FuenteArchivo, array, array]] = None
+        pendientes = documento.parrafos_pendientes()
+        if pendientes is None:
+            return
+        fuente, desde, ancho = pendientes
+        fuente.indexar_todo()
+        cantidad = len(fuente) - desde
+        if cantidad <= 0:
+            return
+        self.pendientes = (fuente, *fuente.limites(desde))
+        if isinstance(fuente, FuenteBinaria):
+            fuente.copiar_metadatos(desde, self.anchos, self.alineaciones, self.cortes, self.separaciones,
+                                    self.primeras_lineas, self.palabras_por_linea)
+        else:
+            self.anchos.extend([ancho] * cantidad)
+            self.alineaciones.extend(bytes(cantidad))
+            self.cortes.extend(bytes(cantidad))
+            self.separaciones.extend(bytes([SEPARACION_TEXTO]) * cantidad)
+            if con_cortes:
+                self.primeras_lineas.extend([len(self.palabras_por_linea)] * cantidad)
+
+    def escribir(self, ruta: str, generacion: int = 0, sincronizar: bool = False) -> int:
+        """
+        Escribe el documento binario a un archivo temporal y lo renombra (con 'sincronizar',
+        además espera a que llegue al disco). Retorna los bytes escritos.
+        """
+        inicios, fines = array("q"), array("q")
+        temporal = ruta + ".tmp"
+        with open(temporal, "wb", buffering=1 << 20) as salida:
+            salida.write(bytes(_ENCABEZADO.size))
+            posicion = _ENCABEZADO.size
+            for texto in self.textos:
+                if inicios:
+                    posicion += salida.write(FuenteArchivo.SEPARADOR)
+                inicios.append(posicion)
+                posicion += salida.write(texto)
+                fines.append(posicion)
+            if self.pendientes is not None:
+                fuente, inicios_fuente, fines_fuente = self.pendientes
+                if inicios:
+                    posicion += salida.write(FuenteArchivo.SEPARADOR)
+                corrimiento = posicion - inicios_fuente[0]
+                posicion += fuente.copiar(inicios_fuente[0], fines_fuente[-1], salida)
+                inicios.extend([inicio + corrimiento for inicio in inicios_fuente])
+                fines.extend([fin + corrimiento for fin in fines_fuente])
+
+            fin_texto = posicion
+            for arreglo in (inicios, fines, self.anchos, self.alineaciones, self.cortes, self.separaciones):
+                _escribir_arreglo(salida, arreglo)
+            banderas, lineas = 0, 0
+            if self.primeras_lineas is not None:
+                _escribir_arreglo(salida, self.primeras_lineas)
+                _escribir_arreglo(salida, self.palabras_por_linea)
+                banderas, lineas = CON_CORTES, len(self.palabras_por_linea)
+            escritos = salida.tell()
+            salida.seek(0)
+            salida.write(_ENCABEZADO.pack(MAGICO, VERSION_FORMATO, banderas, generacion, len(inicios), lineas,
+                                          _ENCABEZADO.size, fin_texto, fin_texto, *self.cursor))
+            if sincronizar:
+                salida.flush()
+                os.fsync(salida.fileno())
+        os.replace(temporal, ruta)
+        return escritos
+
+
+def guardar_documento(ruta: str, documento: Documento, cursor: PosicionGuardada = (0, 0, 0),
+                      con_cortes: bool = True) -> int:
+    """
+    Guarda el documento en el formato binario. Los párrafos cargados se escriben desde
+    los objetos; los que siguen sin cargar se copian en un solo bloque desde el mapa del
+    archivo de origen (sin pasar por str) y solo se corren sus posiciones.
+    Con 'con_cortes' se guardan las líneas de cada párrafo para no maquetar al abrir.
+    Escribe a un archivo temporal y lo renombra. Retorna los bytes escritos.
+    """
+    return InstantaneaBinaria(documento, cursor, con_cortes).escribir(ruta)
+
+
+class FuenteBinaria(FuenteArchivo):
+    """
+    Documento binario abierto con mmap: el índice de párrafos viene hecho en el archivo.
+    Patrón de Diseño: Virtual Proxy (igual que FuenteArchivo: cada párrafo se construye al pedirlo).
+    Ítem de Cambio Oculto: Cómo se guardan en disco el formato y las líneas de cada párrafo.
+
+    Abrir lee solo el encabezado y las secciones (unos bytes por párrafo y por línea); el
+    texto se decodifica párrafo a párrafo desde el mapa. Si se guardaron las líneas, cada
+    párrafo se arma con sus cortes (aplicar_cortes) y no pasa por el reflow.
+    """
+    def __init__(self, ruta: str):
+        super().__init__(ruta)
+        try:
+            self._leer_secciones()
+        except (ValueError, struct.error):
+            self.cerrar()
+            raise
+
+    def _leer_secciones(self) -> None:
+        if self.tamanio < _ENCABEZADO.size:
+            raise ValueError(f"{self.ruta}: no es un documento binario del editor")
+        (magico, version, banderas, generacion, parrafos, lineas, _, fin_texto, secciones,
+         *cursor) = _ENCABEZADO.unpack_from(self._mapa, 0)
+        if magico != MAGICO:
+            raise ValueError(f"{self.ruta}: no es un documento binario del editor")
+        if version > VERSION_FORMATO:
+            raise ValueError(f"{self.ruta}: versión {version} no soportada (máximo {VERSION_FORMATO})")
+        mapa, posicion = self._mapa, secciones
+        self._inicios, posicion = _leer_arreglo(mapa, "q", parrafos, posicion)
+        self._fines, posicion = _leer_arreglo(mapa, "q", parrafos, posicion)
+        self.anchos, posicion = _leer_arreglo(mapa, "I", parrafos, posicion)
+        self.alineaciones, posicion = _leer_arreglo(mapa, "B", parrafos, posicion)
+        self.cortes, posicion = _leer_arreglo(mapa, "B", parrafos, posicion)
+        self.separaciones, posicion = _leer_arreglo(mapa, "B", parrafos, posicion)
+        self.primeras_lineas: Optional[array] = None
+        self.palabras_por_linea: Optional[array] = None
+        if banderas & CON_CORTES:
+            self.primeras_lineas, posicion = _leer_arreglo(mapa, "q", parrafos + 1, posicion)
+            self.palabras_por_linea, posicion = _leer_arreglo(mapa, "I", lineas, posicion)
+        self._escaneado = self.tamanio # El índice ya está completo
+        self.fin_texto = fin_texto
+        self.generacion = generacion
+        self.cursor: PosicionGuardada = tuple(cursor)
+
+    def parrafo(self, indice: int, ancho_linea: int) -> Parrafo:
+        """Construye el párrafo con su formato guardado y, si están, con sus líneas guardadas."""
+        lineas = None
+        if self.primeras_lineas is not None:
+            lineas = self.palabras_por_linea[self.primeras_lineas[indice]:self.primeras_lineas[indice + 1]]
+        return construir_parrafo(self.texto(indice), self.separaciones[indice], self.anchos[indice] or ancho_linea,
+                                 self.alineaciones[indice], self.cortes[indice], lineas)
+
+    def copiar_metadatos(self, desde: int, anchos: array, alineaciones: array, cortes: array,
+                         separaciones: array, primeras_lineas: Optional[array],
+                         palabras_por_linea: Optional[array]) -> None:
+        """Agrega el formato (y las líneas) de los párrafos desde 'desde' a las secciones de otro archivo."""
+        anchos.extend(self.anchos[desde:])
+        alineaciones.extend(self.alineaciones[desde:])
+        cortes.extend(self.cortes[desde:])
+        separaciones.extend(self.separaciones[desde:])
+        if primeras_lineas is None:
+            return
+        if self.primeras_lineas is None:
+            primeras_lineas.extend([len(palabras_por_linea)] * (len(self) - desde))
+            return
+        primera = self.primeras_lineas[desde]
+        corrimiento = len(palabras_por_linea) - primera
+        palabras_por_linea.extend(self.palabras_por_linea[primera:])
+        primeras_lineas.extend([linea + corrimiento for linea in self.primeras_lineas[desde + 1:]])
@@ -0,0 +1,275 @@
+import string
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
+from src.composite.linea import indice_en
+from src.composite.palabra import Palabra
+
+if TYPE_CHECKING:
+    from src.composite.documento import Documento
+
+# Signos que rodean a una palabra sin formar parte de ella: "¿Hola," se indexa como "Hola"
+_BORDES = string.whitespace + string.punctuation + "¿¡«»“”‘’…—–"
+# Por encima de estos cambios de claves se reordena la lista entera en vez de insertar una a una
+_MAX_CLAVES_INCREMENTAL = 32
+
+# Palabras con una misma forma (dict como conjunto ordenado)
+Grupo = Dict[Palabra, None]
+
+
+def normalizar(texto: str) -> str:
+    """Forma con la que se indexa un texto: sin espacios ni signos de puntuación en los bordes."""
+    return texto.strip(_BORDES)
+
+
+def tramo_forma(texto: str) -> Tuple[int, int]:
+    """Posición [inicio, fin) de la forma normalizada dentro del texto de la palabra."""
+    inicio = len(texto) - len(texto.lstrip(_BORDES))
+    return inicio, max(inicio, len(texto.rstrip(_BORDES)))
+
+
+def _posicion(palabra: Palabra) -> Tuple[int, int, int]:
+    """Orden de una palabra en el documento: (párrafo, línea, palabra)."""
+    linea = palabra.parent
+    parrafo = linea.parent
+    return (parrafo.indice, parrafo.indice_de(linea), linea.indice_de(palabra))
+
+
+class IndicePalabras:
+    """
+    Índice invertido del documento: forma de cada palabra -> palabras que la tienen.
+    Patrón de Diseño: Observer (el documento le avisa qué palabras pueden haber cambiado).
+    Ítem de Cambio Oculto: Cómo se encuentran las palabras sin recorrer el documento.
+
+    Las formas se agrupan por clave (la forma con casefold): la búsqueda exacta es una
+    consulta a dos diccionarios, la que ignora mayúsculas une los grupos de una clave y la de
+    prefijo recorre, con bisect, la lista ordenada de claves desde el prefijo.
+    Las ediciones, los comandos y el cambio de párrafos solo anotan palabras pendientes;
+    antes de cada consulta se concilian comparando la forma con la que cada una quedó
+    indexada (Palabra._indexada) con su texto y su pertenencia al documento actuales.
+    El reflow no cambia ninguna de las dos (solo mueve palabras entre líneas del párrafo y
+    descarta palabras vacías, que no se indexan), así que no le cuesta nada al índice.
+    """
+    def __init__(self, documento: 'Documento'):
+        self.documento = documento
+        self._grupos: Dict[str, Dict[str, Grupo]] = {}
+        self._claves: List[str] = [] # Claves de _grupos, ordenadas (búsqueda por prefijo)
+        self._claves_cambiadas: Set[str] = set()
+        self._pendientes: Set[Palabra] = set()
+        self._total = 0
+        # Un texto se normaliza una sola vez: las palabras frecuentes van directo a su grupo
+        por_texto: Dict[str, Tuple[str, Optional[Grupo]]] = {}
+        for parrafo in documento.parrafos:
+            for linea in parrafo.hijos:
+                for palabra in linea.hijos:
+                    texto = palabra.texto
+                    entrada = por_texto.get(texto)
+                    if entrada is None:
+                        entrada = por_texto[texto] = self._grupo_nuevo(texto)
+                    forma, grupo = entrada
+                    if grupo is not None:
+                        grupo[palabra] = None
+                        palabra._indexada = forma
+                        self._total += 1
+        self._claves = sorted(self._grupos)
+        self._claves_cambiadas.clear()
+
+    def _grupo_nuevo(self, texto: str) -> Tuple[str, Optional[Grupo]]:
+        """(forma, grupo) de un texto, creando el grupo si hace falta (None si no se indexa)."""
+        forma = normalizar(texto)
+        if not forma:
+            return forma, None
+        formas = self._grupos.setdefault(forma.casefold(), {})
+        return forma, formas.setdefault(forma, {})
+
+    def __len__(self) -> int:
+        """Cantidad de palabras indexadas."""
+        self.actualizar()
+        return self._total
+
+    def marcar(self, palabra: Palabra) -> None:
+        """Anota una palabra cuyo texto o pertenencia al documento pudo cambiar."""
+        self._pendientes.add(palabra)
+
+    def marcar_todas(self, palabras: Iterable[Palabra]) -> None:
+        self._pendientes.update(palabras)
+
+    def actualizar(self) -> None:
+        """Concilia las palabras pendientes: O(pendientes), no O(documento)."""
+        if not self._pendientes:
+            return
+        pendientes, self._pendientes = self._pendientes, set()
+        documento = self.documento
+        for palabra in pendientes:
+            linea = palabra.parent
+            parrafo = linea.parent if linea is not None else None
+            forma = normalizar(palabra.texto) if parrafo is not None and parrafo.parent is documento else ""
+            previa = palabra._indexada
+            if forma == (previa or ""):
+                continue
+            if previa is not None:
+                self._quitar(palabra, previa)
+            if forma:
+                self._agregar(palabra, forma)
+        self._ordenar_claves()
+
+    def _agregar(self, palabra: Palabra, forma: str) -> None:
+        clave = forma.casefold()
+        formas = self._grupos.get(clave)
+        if formas is None:
+            formas = self._grupos[clave] = {}
+            self._claves_cambiadas.add(clave)
+        grupo = formas.get(forma)
+        if grupo is None:
+            grupo = formas[forma] = {}
+        grupo[palabra] = None
+        palabra._indexada = forma
+        self._total += 1
+
+    def _quitar(self, palabra: Palabra, forma: str) -> None:
+        clave = forma.casefold()
+        formas = self._grupos[clave]
+        grupo = formas[forma]
+        del grupo[palabra]
+        if not grupo:
+            del formas[forma]
+            if not formas:
+                del self._grupos[clave]
+                self._claves_cambiadas.add(clave)
+        palabra._indexada = None
+        self._total -= 1
+
+    def _ordenar_claves(self) -> None:
+        """Refleja en la lista ordenada las claves que aparecieron o desaparecieron."""
+        cambiadas = self._claves_cambiadas
+        if not cambiadas:
+            return
+        if len(cambiadas) > _MAX_CLAVES_INCREMENTAL:
+            self._claves = sorted(self._grupos)
+        else:
+            claves = self._claves
+            for clave in cambiadas:
+                i = bisect_left(claves, clave)
+                listada = i < len(claves) and claves[i] == clave
+                if clave in self._grupos:
+                    if not listada:
+                        claves.insert(i, clave)
+                elif listada:
+                    del claves[i]
+        cambiadas.clear()
+
+    def _grupos_de(self, consulta: str, prefijo: bool, ignorar_mayusculas: bool) -> List[Grupo]:
+        """Grupos de palabras que coinciden con la consulta."""
+        self.actualizar()
+        forma = normalizar(consulta)
+        if not forma:
+            return []
+        clave = forma.casefold()
+        if not prefijo:
+            formas = self._grupos.get(clave)
+            if formas is None:
+                return []
+            if ignorar_mayusculas:
+                return list(formas.values())
+            grupo = formas.get(forma)
+            return [grupo] if grupo is not None else []
+
+        grupos: List[Grupo] = []
+        claves = self._claves
+        i = bisect_left(claves, clave)
+        while i < len(claves) and claves[i].startswith(clave):
+            for indexada, grupo in self._grupos[claves[i]].items():
+                if ignorar_mayusculas or indexada.startswith(forma):
+                    grupos.append(grupo)
+            i += 1
+        return grupos
+
+    def contar(self, consulta: str, prefijo: bool = False, ignorar_mayusculas: bool = False) -> int:
+        """Cantidad de palabras que coinciden con la consulta (exacta, por prefijo y/o sin mayúsculas)."""
+        return sum(len(grupo) for grupo in self._grupos_de(consulta, prefijo, ignorar_mayusculas))
+
+    def ocurrencias(self, consulta: str, prefijo: bool = False,
+                    ignorar_mayusculas: bool = False) -> List[Palabra]:
+        """Palabras que coinciden con la consulta, sin un orden en particular."""
+        palabras: List[Palabra] = []
+        for grupo in self._grupos_de(consulta, prefijo, ignorar_mayusculas):
+            palabras.extend(grupo)
+        return palabras
+
+    def siguiente(self, desde: Palabra, consulta: str, prefijo: bool = False,
+                  ignorar_mayusculas: bool = False, hacia_atras: bool = False) -> Optional[Palabra]:
+        """
+        Próxima palabra que coincide después de 'desde' (o antes, hacia atrás), dando la vuelta
+        al documento; 'desde' solo se retorna si es la única coincidencia. Primero se recorre el
+        documento a partir de 'desde' hasta tantas palabras como coincidencias haya (una consulta
+        frecuente aparece enseguida); si no alcanza, se ordenan las coincidencias por posición.
+        Costo: O(min(palabras hasta la siguiente, coincidencias)).
+        """
+        grupos = self._grupos_de(consulta, prefijo, ignorar_mayusculas)
+        cantidad = sum(len(grupo) for grupo in grupos)
+        if cantidad == 0:
+            return None
+        coincide = self._coincide(consulta, prefijo, ignorar_mayusculas)
+        recorridas = 0
+        for palabra in self._palabras_desde(desde, hacia_atras):
+            if recorridas >= cantidad:
+                break
+            recorridas += 1
+            indexada = palabra._indexada
+            if indexada is not None and coincide(indexada):
+                return palabra
+
+        origen = _posicion(desde)
+        mejor: Optional[Palabra] = None
+        mejor_posicion: Optional[Tuple[int, int, int]] = None
+        extremo: Optional[Palabra] = None # La primera (o la última) del documento: para dar la vuelta
+        extremo_posicion: Optional[Tuple[int, int, int]] = None
+        for grupo in grupos:
+            for palabra in grupo:
+                posicion = _posicion(palabra)
+                if hacia_atras:
+                    if posicion < origen and (mejor_posicion is None or posicion > mejor_posicion):
+                        mejor, mejor_posicion = palabra, posicion
+                    if extremo_posicion is None or posicion > extremo_posicion:
+                        extremo, extremo_posicion = palabra, posicion
+                else:
+                    if posicion > origen and (mejor_posicion is None or posicion < mejor_posicion):
+                        mejor, mejor_posicion = palabra, posicion
+                    if extremo_posicion is None or posicion < extremo_posicion:
+                        extremo, extremo_posicion = palabra, posicion
+        return mejor if mejor is not None else extremo
+
+    @staticmethod
+    def _coincide(consulta: str, prefijo: bool, ignorar_mayusculas: bool) -> Callable[[str], bool]:
+        """Predicado sobre la forma indexada equivalente a _grupos_de."""
+        forma = normalizar(consulta)
+        if ignorar_mayusculas:
+            clave = forma.casefold()
+            if prefijo:
+                return lambda indexada: indexada.casefold().startswith(clave)
+            return lambda indexada: indexada.casefold() == clave
+        if prefijo:
+            return lambda indexada: indexada.startswith(forma)
+        return lambda indexada: indexada == forma
+
+    def _palabras_desde(self, palabra: Palabra, hacia_atras: bool) -> Iterator[Palabra]:
+        """Palabras del documento que siguen a 'palabra' (o la preceden), dando la vuelta."""
+        parrafos = self.documento.parrafos
+        linea = palabra.parent
+        parrafo = linea.parent
+        num_parrafo = indice_en(parrafos, parrafo)
+        num_linea, num_palabra = parrafo.indice_de(linea), linea.indice_de(palabra)
+        paso = -1 if hacia_atras else 1
+        for vuelta in range(len(parrafos) + 1):
+            lineas = parrafos[(num_parrafo + paso * vuelta) % len(parrafos)].hijos
+            if vuelta == 0:
+                desde_linea = num_linea
+            else:
+                desde_linea = len(lineas) - 1 if hacia_atras else 0
+            for i in range(desde_linea, -1 if hacia_atras else len(lineas), paso):
+                palabras = lineas[i].hijos
+                if vuelta == 0 and i == num_linea:
+                    desde_palabra = num_palabra + paso
+                else:
+                    desde_palabra = len(palabras) - 1 if hacia_atras else 0
+                for j in range(desde_palabra, -1 if hacia_atras else len(palabras), paso):
+                    yield palabras[j]
@@ -0,0 +1,189 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+def _en_percentil(ordenadas: List[float], percentil: float) -> float:
+    if not ordenadas:
+        return 0.0
+    return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * percentil / 100.0))]
+
+
+class Histograma:
+    """Ventana de las últimas muestras de una métrica, con percentiles, más totales acumulados."""
+    __slots__ = ("_muestras", "cantidad", "total", "maximo")
+
+    def __init__(self, ventana: int):
+        self._muestras: Deque[float] = deque(maxlen=ventana)
+        self.cantidad = 0
+        self.total = 0.0
+        self.maximo = 0.0
+
+    def agregar(self, valor: float) -> None:
+        self._muestras.append(valor)
+        self.cantidad += 1
+        self.total += valor
+        if valor > self.maximo:
+            self.maximo = valor
+
+    def percentil(self, percentil: float) -> float:
+        return _en_percentil(sorted(self._muestras), percentil)
+
+    def resumen(self) -> Dict[str, float]:
+        ordenadas = sorted(self._muestras)
+        return {"cantidad": self.cantidad, "total": self.total, "maximo": self.maximo,
+                "p50": _en_percentil(ordenadas, 50), "p95": _en_percentil(ordenadas, 95),
+                "p99": _en_percentil(ordenadas, 99)}
+
+
+class _SpanNulo:
+    """Span de la instrumentación desactivada: no mide nada."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+
+_SPAN_NULO = _SpanNulo()
+
+
+class _Span:
+    """Mide el tiempo de un bloque 'with' y lo registra al salir."""
+    __slots__ = ("_instrumentacion", "_nombre", "_inicio")
+
+    def __init__(self, instrumentacion: "Instrumentacion", nombre: str):
+        self._instrumentacion = instrumentacion
+        self._nombre = nombre
+        self._inicio = 0
+
+    def __enter__(self):
+        self._inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *_):
+        self._instrumentacion._registrar(self._nombre, self._inicio, time.perf_counter_ns())
+        return False
+
+
+class Instrumentacion:
+    """
+    Mediciones por fase del editor (spans con nombre) y contadores por evento.
+    Patrón de Diseño: Null Object (desactivada, medir() retorna un span que no hace nada).
+    Ítem de Cambio Oculto: Qué se mide, cómo se resume y en qué formato se exporta.
+
+    Los spans pueden anidarse (p. ej. "reflow" dentro de "paginacion") y sus tiempos son
+    inclusivos. Cada span y cada contador alimenta un histograma de las últimas muestras (p50/p95/p99).
+    Los spans también se guardan como eventos (acotados) para exportarlos en el formato
+    de trazas de Chrome (chrome://tracing o Perfetto). Desactivada, el costo es una
+    llamada que retorna un objeto compartido; los contadores en bucles internos se
+    protegen con 'if INSTRUMENTACION.activa'.
+    """
+    # Muestras por histograma usadas para los percentiles
+    VENTANA = 1000
+    # Eventos guardados para la traza (los más viejos se descartan)
+    MAX_EVENTOS = 100_000
+    # Métricas que muestra la fila de estado (en ese orden)
+    RESUMEN_ESTADO = ("reflow", "paginacion", "vista", "terminal", "frame")
+
+    def __init__(self):
+        self.activa = False
+        self.histogramas: Dict[str, Histograma] = {}
+        self.contadores: Dict[str, Histograma] = {}
+        # (nombre, inicio_ns, duración_ns o None si es un contador, valor, hilo)
+        self._eventos: Deque[Tuple[str, int, Optional[int], float, int]] = deque(maxlen=self.MAX_EVENTOS)
+        self._origen = time.perf_counter_ns()
+
+    def activar(self, activa: bool = True) -> None:
+        self.activa = activa
+
+    def alternar(self) -> bool:
+        """Activa o desactiva la instrumentación. Retorna el nuevo estado."""
+        self.activa = not self.activa
+        return self.activa
+
+    def reiniciar(self) -> None:
+        self.histogramas.clear()
+        self.contadores.clear()
+        self._eventos.clear()
+        self._origen = time.perf_counter_ns()
+
+    def hay_datos(self) -> bool:
+        return bool(self.histogramas or self.contadores)
+
+    def medir(self, nombre: str):
+        """Context manager que mide el bloque como el span 'nombre' (milisegundos)."""
+        if not self.activa:
+            return _SPAN_NULO
+        return _Span(self, nombre)
+
+    def _registrar(self, nombre: str, inicio: int, fin: int) -> None:
+        histograma = self.histogramas.get(nombre)
+        if histograma is None:
+            histograma = self.histogramas[nombre] = Histograma(self.VENTANA)
+        duracion = fin - inicio
+        histograma.agregar(duracion / 1e6)
+        self._eventos.append((nombre, inicio, duracion, 0.0, threading.get_ident()))
+
+    def contar(self, nombre: str, valor: float = 1) -> None:
+        """Registra el valor de un contador por evento (p. ej. líneas reorganizadas en un reflow)."""
+        if not self.activa:
+            return
+        histograma = self.contadores.get(nombre)
+        if histograma is None:
+            histograma = self.contadores[nombre] = Histograma(self.VENTANA)
+        histograma.agregar(valor)
+        self._eventos.append((nombre, time.perf_counter_ns(), None, valor, threading.get_ident()))
+
+    def resumen(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Percentiles de cada span (ms) y de cada contador (valor por evento)."""
+        return {
+            "spans_ms": {nombre: h.resumen() for nombre, h in sorted(self.histogramas.items())},
+            "contadores": {nombre: h.resumen() for nombre, h in sorted(self.contadores.items())},
+        }
+
+    def fila_estado(self) -> str:
+        """Resumen de una fila para la pantalla: p95 de las fases principales y líneas por reflow."""
+        partes = []
+        for nombre in self.RESUMEN_ESTADO:
+            histograma = self.histogramas.get(nombre)
+            if histograma is not None:
+                partes.append(f"{nombre} {histograma.percentil(95):.2f}")
+        lineas = self.contadores.get("lineas_reflow")
+        if lineas is not None:
+            partes.append(f"líneas/reflow {lineas.percentil(95):.0f}")
+        return " ⏱ p95 ms: " + (" | ".join(partes) if partes else "sin datos todavía")
+
+    def exportar_json(self, ruta: str) -> None:
+        with open(ruta, "w", encoding="utf-8") as salida:
+            json.dump(self.resumen(), salida, indent=2, ensure_ascii=False)
+
+    def eventos_chrome(self) -> List[Dict[str, Any]]:
+        """Eventos en el formato de trazas de Chrome: spans completos ('X') y contadores ('C')."""
+        pid = os.getpid()
+        eventos = []
+        for nombre, inicio, duracion, valor, hilo in self._eventos:
+            ts = (inicio - self._origen) / 1000 # Microsegundos desde el origen
+            if duracion is None:
+                eventos.append({"name": nombre, "ph": "C", "ts": ts, "pid": pid, "tid": hilo,
+                                "args": {nombre: valor}})
+            else:
+                eventos.append({"name": nombre, "cat": "editor", "ph": "X", "ts": ts,
+                                "dur": duracion / 1000, "pid": pid, "tid": hilo})
+        return eventos
+
+    def exportar_chrome(self, ruta: str) -> int:
+        """Escribe la traza (chrome://tracing, Perfetto). Retorna la cantidad de eventos."""
+        eventos = self.eventos_chrome()
+        with open(ruta, "w", encoding="utf-8") as salida:
+            json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, salida)
+        return len(eventos)
+
+
+# Instancia compartida por el editor, el documento y el bucle interactivo
+INSTRUMENTACION = Instrumentacion()
@@ -0,0 +1,126 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from src.composite.palabra import Palabra
+from src.composite.parrafo import Parrafo
+from src.render.cache_lineas import CACHE_RENDER
+from src.strategy.alineacion_strategy import (
+    IStrategyAlineacion,
+    AlineacionIzquierda,
+    AlineacionDerecha,
+    AlineacionCentrada,
+    AlineacionJustificada
+)
+from src.strategy.corte_strategy import IStrategyCorte, CortePrimerAjuste, CorteOptimo
+
+# Separa las palabras de un párrafo serializado (no aparece dentro de una palabra)
+SEPARADOR = "\x1f"
+
+# Estrategias que se pueden ejecutar en otro proceso, por nombre de clase
+_ESTRATEGIAS: Dict[str, IStrategyAlineacion] = {
+    type(e).__name__: e for e in (AlineacionIzquierda(), AlineacionDerecha(),
+                                  AlineacionCentrada(), AlineacionJustificada())
+}
+_CORTES: Dict[str, IStrategyCorte] = {type(c).__name__: c for c in (CortePrimerAjuste(), CorteOptimo())}
+
+# Párrafo serializado: (palabras unidas por SEPARADOR, ancho, corte, estrategia o None para no renderizar)
+ParrafoSerializado = Tuple[str, int, str, Optional[str]]
+# Resultado: (palabras por línea, palabras que cuentan por línea, texto alineado de cada línea o None)
+ParrafoMaquetado = Tuple[List[int], List[int], Optional[List[str]]]
+
+
+def maquetar_serializados(parrafos: List[ParrafoSerializado]) -> List[ParrafoMaquetado]:
+    """Tarea de un proceso del pool: cortes, conteos y render de un tramo de párrafos."""
+    resultados: List[ParrafoMaquetado] = []
+    for texto, ancho, corte, nombre in parrafos:
+        textos = texto.split(SEPARADOR)
+        cortes = _CORTES[corte].cortes(textos, ancho)
+        estrategia = _ESTRATEGIAS[nombre] if nombre is not None else None
+        conteos: List[int] = []
+        renders: Optional[List[str]] = [] if estrategia is not None else None
+        inicio = 0
+        for cantidad in cortes:
+            linea = [t for t in textos[inicio:inicio + cantidad] if t]
+            conteos.append(sum(1 for t in linea if t.strip())) # Mismo criterio que Palabra.contar_palabras
+            if estrategia is not None:
+                renders.append(estrategia.aplicar_alineacion(linea, ancho))
+            inicio += cantidad
+        resultados.append((cortes, conteos, renders))
+    return resultados
+
+
+class MaquetadorParalelo:
+    """
+    Reflow completo (y render de las líneas) de muchos párrafos repartidos en un pool de procesos.
+    Patrón de Diseño: Master-Worker (este proceso serializa y aplica; los procesos calculan).
+    Ítem de Cambio Oculto: Cómo se reparte el maquetado masivo y cuándo conviene hacerlo.
+
+    Los párrafos son independientes: cada uno viaja como un texto compacto (sus palabras,
+    el ancho y los nombres de sus estrategias de corte y alineación) y vuelve como la cantidad de palabras por línea
+    más el texto alineado de cada línea, que se guarda en la caché de render de la línea.
+    Los resultados se aplican en orden con Parrafo.aplicar_cortes. Por debajo de
+    'umbral' palabras (o con un solo proceso) se usa aplicar_reflow en este proceso.
+    """
+    UMBRAL_PALABRAS = 100_000
+    # Palabras por tarea del pool (tareas chicas reparten mejor; grandes serializan menos)
+    PALABRAS_POR_TAREA = 20_000
+
+    def __init__(self, procesos: Optional[int] = None, umbral: int = UMBRAL_PALABRAS,
+                 renderizar: bool = True):
+        self.procesos = procesos or os.cpu_count() or 1
+        self.umbral = umbral
+        self.renderizar = renderizar
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "MaquetadorParalelo":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.cerrar()
+
+    def cerrar(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def maquetar(self, parrafos: List[Parrafo]) -> None:
+        """Reflow completo de los párrafos (el mismo resultado que aplicar_reflow(completo=True))."""
+        trabajo: List[Tuple[Parrafo, List[Palabra]]] = []
+        total = 0
+        for parrafo in parrafos:
+            palabras = parrafo.palabras_reflow()
+            if not palabras or type(parrafo.corte).__name__ not in _CORTES:
+                parrafo.aplicar_reflow(completo=True) # Vacío o con un corte propio: en este proceso
+                continue
+            trabajo.append((parrafo, palabras))
+            total += len(palabras)
+
+        if self.procesos <= 1 or total < self.umbral:
+            for parrafo, _ in trabajo:
+                parrafo.aplicar_reflow(completo=True)
+            return
+
+        tareas: List[List[ParrafoSerializado]] = [[]]
+        en_tarea = 0
+        for parrafo, palabras in trabajo:
+            if en_tarea >= self.PALABRAS_POR_TAREA:
+                tareas.append([])
+                en_tarea = 0
+            tareas[-1].append(self._serializar(parrafo, palabras))
+            en_tarea += len(palabras)
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.procesos)
+        resultados = (resultado for tramo in self._pool.map(maquetar_serializados, tareas)
+                      for resultado in tramo)
+        for (parrafo, palabras), (cortes, conteos, renders) in zip(trabajo, resultados):
+            parrafo.aplicar_cortes(palabras, cortes, conteos)
+            if renders is not None:
+                for linea, texto in zip(parrafo.hijos, renders):
+                    CACHE_RENDER.precargar(linea, texto)
+
+    def _serializar(self, parrafo: Parrafo, palabras: List[Palabra]) -> ParrafoSerializado:
+        nombre = type(parrafo.alineacion_vigente()).__name__ if self.renderizar else None
+        if nombre not in _ESTRATEGIAS:
+            nombre = None # Estrategia propia: se renderiza en este proceso cuando haga falta
+        return (SEPARADOR.join([p.texto for p in palabras]), parrafo.ancho_linea, type(parrafo.corte).__name__, nombre)
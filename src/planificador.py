@@ -0,0 +1,120 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+
+class PlanificadorFrames:
+    """
+    Cola de entrada y planificador de frames del editor interactivo.
+    Patrón de Diseño: Producer-Consumer (el hook de teclado encola, el bucle de eventos consume).
+    Ítem de Cambio Oculto: Cuándo se aplican las ediciones y cuándo se dibuja.
+
+    El hook de teclado solo encola acciones en una asyncio.Queue. En cada frame se aplican
+    todas las acciones encoladas hasta ese momento y se dibuja una sola vez, por lo que el
+    reflow y la paginación también se hacen una sola vez por frame. Los frames se separan
+    por 1/fps segundos o por el costo medio de un frame si dibujar es más lento que eso,
+    de modo que la cola nunca crece más rápido de lo que se vacía.
+    """
+    # Peso del último frame en el promedio móvil de su costo
+    SUAVIZADO = 0.2
+    # Frames recientes considerados para el percentil de latencia
+    VENTANA_LATENCIAS = 120
+
+    def __init__(self, aplicar: Callable[[List[Any]], None], dibujar: Callable[[], None],
+                 fps: float = 60.0, reloj: Callable[[], float] = time.perf_counter,
+                 observador: Optional[Callable[[List[float], float], None]] = None):
+        self._aplicar = aplicar
+        self._dibujar = dibujar
+        # Recibe, por frame, los instantes de llegada de sus acciones y el fin del frame
+        self._observador = observador
+        self._reloj = reloj
+        self.intervalo_minimo = 1.0 / fps
+        # Acciones pendientes con el instante en que llegaron (se crea en conectar())
+        self._cola: Optional["asyncio.Queue[Tuple[float, Any]]"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._proximo_frame = 0.0
+        # Estadísticas
+        self.frames = 0
+        self.acciones = 0
+        self.costo_medio = 0.0 # Segundos por frame (aplicar + dibujar), promedio móvil
+        self.latencia_maxima = 0.0 # Peor demora entre una tecla y el frame que la muestra
+        self._latencias: Deque[float] = deque(maxlen=self.VENTANA_LATENCIAS)
+
+    def conectar(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Asocia el planificador al bucle de eventos que aplicará las acciones."""
+        self._loop = loop
+        self._cola = asyncio.Queue()
+
+    def encolar(self, accion: Any) -> None:
+        """
+        Registra una acción desde cualquier hilo (p. ej. el hook de teclado): la cola solo
+        se toca desde el bucle de eventos, al que se le pasa la acción de forma segura.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return # El editor ya se cerró: la tecla se descarta
+        loop.call_soon_threadsafe(self._cola.put_nowait, (self._reloj(), accion))
+
+    def pendientes(self) -> int:
+        return self._cola.qsize() if self._cola is not None else 0
+
+    def intervalo(self) -> float:
+        """Separación entre frames: 1/fps, o el costo de un frame si es mayor (se adapta)."""
+        return max(self.intervalo_minimo, self.costo_medio)
+
+    async def ejecutar(self) -> None:
+        """
+        Tarea del bucle de eventos: espera entrada sin sondear, respeta la separación entre
+        frames (las acciones que siguen llegando entran en el mismo lote) y procesa el lote.
+        """
+        if self._cola is None:
+            self.conectar(asyncio.get_running_loop())
+        cola = self._cola
+        while True:
+            lote = [await cola.get()]
+            demora = self._proximo_frame - self._reloj()
+            if demora > 0:
+                await asyncio.sleep(demora)
+            while not cola.empty():
+                lote.append(cola.get_nowait())
+            self.procesar(lote)
+
+    def procesar(self, lote: List[Tuple[float, Any]]) -> None:
+        """Aplica un lote de acciones (con su instante de llegada) y dibuja un frame."""
+        inicio = self._reloj()
+        self._aplicar([accion for _, accion in lote])
+        self._dibujar()
+        fin = self._reloj()
+
+        costo = fin - inicio
+        self.costo_medio = costo if not self.frames else (
+            self.SUAVIZADO * costo + (1 - self.SUAVIZADO) * self.costo_medio)
+        latencia = fin - lote[0][0] # La acción más vieja del lote es la que más esperó
+        self._latencias.append(latencia)
+        self.latencia_maxima = max(self.latencia_maxima, latencia)
+        self.frames += 1
+        self.acciones += len(lote)
+        self._proximo_frame = inicio + self.intervalo()
+        if self._observador is not None:
+            self._observador([llegada for llegada, _ in lote], fin)
+
+    def latencia_percentil(self, percentil: float = 95.0) -> float:
+        """Latencia (segundos) entrada -> pantalla en el percentil indicado de los últimos frames."""
+        if not self._latencias:
+            return 0.0
+        ordenadas = sorted(self._latencias)
+        indice = min(len(ordenadas) - 1, int(len(ordenadas) * percentil / 100.0))
+        return ordenadas[indice]
+
+    def cota_latencia(self) -> float:
+        """
+        Peor latencia esperable con la carga actual: una acción que llega justo después de
+        que empezó un frame espera ese frame y el siguiente (2 intervalos).
+        """
+        return 2 * self.intervalo()
+
+    def estadisticas(self) -> str:
+        return (f"Frames: {self.frames} | Acciones: {self.acciones} | "
+                f"Latencia p95: {self.latencia_percentil() * 1000:.1f} ms "
+                f"(máx. {self.latencia_maxima * 1000:.1f} ms) | Frame: {self.costo_medio * 1000:.1f} ms")
@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    from src.composite.linea import Linea
+
+
+class CacheRender:
+    """
+    Caché LRU acotada de líneas ya alineadas.
+    Patrón de Diseño: Proxy de caché delante de la Strategy de alineación.
+    Ítem de Cambio Oculto: Cuándo se vuelve a ejecutar el algoritmo de alineación.
+
+    Cada Linea guarda su último render junto con la versión con la que se generó; si la
+    versión no cambió se reutiliza sin armar la clave. Si cambió, se busca por
+    (textos de las palabras, ancho, tipo de estrategia), de modo que volver a un contenido
+    ya visto (p. ej. deshacer) tampoco ejecuta la estrategia.
+    """
+    def __init__(self, capacidad: int = 4096):
+        self.capacidad = capacidad
+        self._entradas: "OrderedDict[Tuple, str]" = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def render(self, linea: 'Linea') -> str:
+        """Retorna el texto alineado de la línea, ejecutando la estrategia solo si hace falta."""
+        if linea._render_version == linea.version:
+            self.aciertos += 1
+            return linea._render
+
+        palabras_texto = tuple(p.texto for p in linea.hijos if p.texto)
+        clave = (palabras_texto, linea.ancho, type(linea.alineacion))
+        texto = self._entradas.get(clave)
+        if texto is not None:
+            self.aciertos += 1
+            self._entradas.move_to_end(clave)
+        else:
+            self.fallos += 1
+            texto = linea.alineacion.aplicar_alineacion(list(palabras_texto), linea.ancho)
+            self._entradas[clave] = texto
+            if len(self._entradas) > self.capacidad:
+                self._entradas.popitem(last=False)
+
+        linea._render = texto
+        linea._render_version = linea.version
+        return texto
+
+    def render_de_paso(self, linea: 'Linea') -> str:
+        """
+        Texto alineado de la línea sin guardarlo en ella ni en la LRU: para recorridos de todo
+        el documento (p. ej. exportar), que no deben dejar un render por línea en memoria.
+        """
+        if linea._render_version == linea.version:
+            return linea._render
+        return linea.alineacion.aplicar_alineacion([p.texto for p in linea.hijos if p.texto], linea.ancho)
+
+    def precargar(self, linea: 'Linea', texto: str) -> None:
+        """
+        Guarda en la línea un render calculado por fuera (p. ej. en otro proceso) para su
+        versión actual. No pasa por la LRU: es válido hasta que la línea cambie.
+        """
+        linea._render = texto
+        linea._render_version = linea.version
+
+    def limpiar(self) -> None:
+        self._entradas.clear()
+        self.aciertos = 0
+        self.fallos = 0
+
+
+# Caché de render compartida por todas las líneas del proceso.
+CACHE_RENDER = CacheRender()
@@ -0,0 +1,119 @@
+import os
+import shutil
+import sys
+import unicodedata
+from typing import BinaryIO, List, Optional
+
+# Secuencias ANSI usadas por el renderizador
+_LIMPIAR_PANTALLA = "\x1b[2J\x1b[H"
+_BORRAR_HASTA_FIN = "\x1b[K"
+
+
+def _ir_a(fila: int) -> str:
+    """Posiciona el cursor de la terminal al comienzo de la fila (base 1)."""
+    return f"\x1b[{fila};1H"
+
+
+# Selector de variación que pide la presentación emoji (⚠️, ♻️): el símbolo pasa a ocupar 2 columnas
+_SELECTOR_EMOJI = "\ufe0f"
+
+
+def ancho_visible(caracter: str) -> int:
+    """Columnas que ocupa el carácter en la terminal: 2 los anchos (emoji, CJK), 0 los combinantes."""
+    if caracter.isascii():
+        return 1 if caracter.isprintable() else 0
+    if caracter == _SELECTOR_EMOJI:
+        return 1 # La columna que le suma al símbolo anterior
+    if unicodedata.combining(caracter) or unicodedata.category(caracter) in ("Mn", "Me", "Cf"):
+        return 0
+    return 2 if unicodedata.east_asian_width(caracter) in ("W", "F") else 1
+
+
+def recortar_fila(fila: str, columnas: int) -> str:
+    """
+    Recorta la fila para que ocupe a lo sumo 'columnas' columnas de la terminal. Una fila más
+    ancha pasaría a la fila física siguiente y las posiciones de las filas de abajo se correrían.
+    """
+    if fila.isascii() and len(fila) <= columnas:
+        return fila
+    ocupadas = 0
+    for posicion, caracter in enumerate(fila):
+        ocupadas += ancho_visible(caracter)
+        if ocupadas > columnas:
+            return fila[:posicion]
+    return fila
+
+
+class RenderizadorDiferencial:
+    """
+    Renderizador de pantalla con búfer: guarda el último frame dibujado y en el siguiente
+    reescribe solo las filas que cambiaron, usando secuencias ANSI de posicionamiento.
+    Todo el frame se envía en una única escritura al flujo de salida. Cada fila se recorta
+    al ancho de la terminal (en columnas visibles): así ocupa exactamente una fila física y
+    el posicionamiento por número de fila sigue siendo válido.
+    Patrón de Diseño: Double Buffering.
+    Ítem de Cambio Oculto: Cómo se lleva el frame a la terminal (limpieza, diff, escritura).
+    """
+    def __init__(self, salida: Optional[BinaryIO] = None, alto: Optional[int] = None,
+                 ancho: Optional[int] = None):
+        self._salida = salida if salida is not None else sys.stdout.buffer
+        self._alto = alto
+        self._ancho = ancho
+        self._ultimo_frame: Optional[List[str]] = None
+        # Estadísticas de escritura
+        self.frames = 0
+        self.bytes_ultimo_frame = 0
+        self.bytes_totales = 0
+        self.bytes_sin_diff = 0 # Lo que hubiera costado redibujar todo cada vez
+        if os.name == 'nt':
+            os.system('') # Habilita el procesamiento de secuencias ANSI en la consola de Windows
+
+    def alto_terminal(self) -> int:
+        if self._alto is not None:
+            return self._alto
+        return shutil.get_terminal_size().lines
+
+    def ancho_terminal(self) -> int:
+        if self._ancho is not None:
+            return self._ancho
+        return shutil.get_terminal_size().columns
+
+    def invalidar(self) -> None:
+        """Fuerza un redibujado completo en el próximo frame (p. ej. tras escribir por fuera)."""
+        self._ultimo_frame = None
+
+    def dibujar(self, filas: List[str]) -> int:
+        """Dibuja el frame y retorna la cantidad de bytes escritos."""
+        columnas = self.ancho_terminal()
+        filas = [recortar_fila(fila, columnas) for fila in filas]
+        previo = self._ultimo_frame
+        partes: List[str] = []
+
+        # Si el frame no entra en la pantalla la terminal hace scroll y las filas
+        # dejan de ser direccionables: en ese caso se redibuja completo.
+        if previo is None or len(filas) >= self.alto_terminal():
+            partes.append(_LIMPIAR_PANTALLA)
+            partes.append("\n".join(filas))
+            partes.append("\n")
+        else:
+            for num, fila in enumerate(filas):
+                if num >= len(previo) or previo[num] != fila:
+                    # Se borra antes de escribir: una fila que llena todas las columnas deja a
+                    # la terminal esperando el salto de línea, y borrar ahí se come el último carácter
+                    partes.append(_ir_a(num + 1) + _BORRAR_HASTA_FIN + fila)
+            # Limpiar las filas sobrantes del frame anterior
+            for num in range(len(filas), len(previo)):
+                partes.append(_ir_a(num + 1) + _BORRAR_HASTA_FIN)
+            # Dejar el cursor de la terminal debajo del frame
+            partes.append(_ir_a(len(filas) + 1))
+
+        datos = "".join(partes).encode("utf-8")
+        self._salida.write(datos)
+        self._salida.flush()
+
+        self._ultimo_frame = list(filas)
+        self.frames += 1
+        self.bytes_ultimo_frame = len(datos)
+        self.bytes_totales += len(datos)
+        self.bytes_sin_diff += len((_LIMPIAR_PANTALLA + "\n".join(filas) + "\n").encode("utf-8"))
+        return len(datos)
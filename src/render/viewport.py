@@ -0,0 +1,73 @@
+from typing import Iterator, List, Optional
+from src.composite.documento import Documento
+from src.cursor import Cursor
+
+
+class Viewport:
+    """
+    Ventana visible del documento: a partir de qué página se dibuja y cuántas filas entran.
+    Patrón de Diseño: Virtual Proxy (solo se materializan las filas visibles).
+    Ítem de Cambio Oculto: Qué parte del documento se muestra y cómo se superpone el cursor.
+
+    Las filas se piden a Documento.iterar_lineas, que es perezoso: el costo de redibujar
+    depende del alto de la ventana y no del tamaño del documento.
+    """
+    def __init__(self, documento: Documento, alto: Optional[int] = None):
+        self.documento = documento
+        self.alto = alto # None: sin límite (todo el documento)
+        self.pagina_inicial = 0
+        # Última página con filas visibles en el último render
+        self.pagina_final = 0
+        self._alto_previo: Optional[int] = None # Alto usado en el último render
+
+    def seguir(self, num_pagina: int) -> None:
+        """Desplaza la ventana lo mínimo (por páginas) para que num_pagina quede visible."""
+        if self.alto is None:
+            self.pagina_inicial = 0
+        elif num_pagina < self.pagina_inicial:
+            self.pagina_inicial = num_pagina
+        elif num_pagina > self.pagina_final or self.alto != self._alto_previo:
+            # Se avanza (o cambió el alto de la terminal) dejando la página del cursor
+            # como la última que entra en la ventana
+            inicio, usadas = num_pagina, self._alto_pagina(num_pagina)
+            while inicio > 0 and usadas + self._alto_pagina(inicio - 1) <= self.alto:
+                inicio -= 1
+                usadas += self._alto_pagina(inicio)
+            self.pagina_inicial = inicio
+        self.pagina_inicial = max(0, min(self.pagina_inicial, self.documento.contar_paginas() - 1))
+
+    def _alto_pagina(self, num_pagina: int) -> int:
+        """Filas que ocupa una página: encabezado, líneas renderizadas y separación entre segmentos."""
+        segmentos = self.documento.hijos[num_pagina].hijos
+        filas = 5 + 2 * max(0, len(segmentos) - 1)
+        for segmento in segmentos:
+            filas += sum(l.mostrar().count("\n") for l in segmento.hijos)
+        return filas
+
+    def filas(self, cursor: Optional[Cursor] = None) -> List[str]:
+        """Filas visibles, con el cursor dibujado sobre su línea si se indica."""
+        filas: List[str] = []
+        self.pagina_final = self.pagina_inicial
+        self._alto_previo = self.alto
+        for num_pagina, fila in self._filas(cursor):
+            if self.alto is not None and len(filas) >= self.alto:
+                break
+            filas.append(fila)
+            self.pagina_final = num_pagina
+        return filas
+
+    def _filas(self, cursor: Optional[Cursor]) -> Iterator:
+        """Parte en filas los textos del iterador del documento (equivale a str.split('\\n'))."""
+        palabra_cursor = cursor.palabra if cursor is not None else None
+        linea_cursor = palabra_cursor.parent if palabra_cursor is not None else None
+        pendiente = ""
+        num_pagina = self.pagina_inicial
+        for num_pagina, linea, texto in self.documento.iterar_lineas(self.pagina_inicial):
+            if linea is not None and linea is linea_cursor:
+                texto = linea.mostrar_con_cursor(palabra_cursor, cursor.offset)
+            partes = texto.split("\n")
+            pendiente += partes[0]
+            for parte in partes[1:]:
+                yield num_pagina, pendiente
+                pendiente = parte
+        yield num_pagina, pendiente
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List
 
 class IStrategyAlineacion(ABC):
     """
@@ -8,7 +8,20 @@ class IStrategyAlineacion(ABC):
                      soportados por el editor (Izquierda, Derecha, Centrada, Justificada).
     ÍTEM DE CAMBIO OCULTO: Permite añadir nuevas estrategias de alineación sin modificar
                           las clases Linea o Parrafo.
+    SINGLETON: Las estrategias no tienen estado, así que cada clase concreta tiene una única
+               instancia compartida por todas las líneas (AlineacionIzquierda() siempre
+               retorna el mismo objeto).
     """
+    __slots__ = ()
+    _instancias: Dict[type, "IStrategyAlineacion"] = {}
+
+    def __new__(cls):
+        instancia = IStrategyAlineacion._instancias.get(cls)
+        if instancia is None:
+            instancia = super().__new__(cls)
+            IStrategyAlineacion._instancias[cls] = instancia
+        return instancia
+
     @abstractmethod
     def aplicar_alineacion(self, palabras: List[str], ancho: int) -> str:
         pass
@@ -114,11 +127,13 @@ class AlineacionJustificada(IStrategyAlineacion):
         # divmod(a, b) retorna (a // b, a % b) -> (base, extra)
         base, extra = divmod(espacios, huecos)
         
-        linea = palabras[0]
+        partes = [palabras[0]]
         # Se itera sobre las palabras desde la segunda (índice 1) hasta el final
         for i, palabra in enumerate(palabras[1:], 1):
             # Agrega la cantidad base de espacios + 1 extra para los primeros 'extra' huecos
             num_espacios = base + (1 if i <= extra else 0)
-            linea += " " * num_espacios + palabra
+            partes.append(" " * num_espacios)
+            partes.append(palabra)
+        partes.append("\n")
             
-        return linea + "\n"
\ No newline at end of file
+        return "".join(partes)
\ No newline at end of file
@@ -0,0 +1,316 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from itertools import repeat
+from operator import add
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.composite.palabra import Palabra
+
+# Penalización por cada caracter que una línea excede el ancho: supera el costo de cualquier
+# maquetado que entra, así que solo se excede cuando no hay alternativa (palabra más larga
+# que el ancho, que de todos modos queda sola en su línea)
+_EXCESO = 1 << 62
+
+
+def cortes_primer_ajuste(textos: List[str], ancho: int) -> List[int]:
+    """
+    Cantidad de palabras de cada línea con el reflow de primer ajuste de Parrafo, para las
+    palabras de palabras_reflow(). Sin cortar palabras: una más larga que el ancho ocupa su
+    propia línea (la Strategy de alineación la divide visualmente).
+    """
+    cortes = [0]
+    longitud = 0
+    for texto in textos:
+        largo = len(texto)
+        espacio = 1 if longitud > 0 and largo > 0 else 0
+        if longitud > 0 and (largo > ancho or longitud + espacio + largo > ancho):
+            cortes.append(0)
+            longitud = espacio = 0
+        cortes[-1] += 1
+        if largo > ancho:
+            cortes.append(0)
+            longitud = 0
+        else:
+            longitud += espacio + largo
+    return cortes
+
+
+def _acumular(acumulados: List[int], largos) -> List[int]:
+    """
+    Extiende 'acumulados' (acumulados[k]: ancho de las primeras k palabras más un espacio
+    detrás de cada una con texto). El ancho de una línea con las palabras i..j-1 es
+    acumulados[j] - acumulados[i] - 1, igual que en el primer ajuste (las vacías no suman espacio).
+    """
+    total = acumulados[-1]
+    for largo in largos:
+        if largo:
+            total += largo + 1
+        acumulados.append(total)
+    return acumulados
+
+
+def _sumar(valores: List[int], constante: int) -> List[int]:
+    """valores + constante, elemento a elemento (sin un bucle de Python: el tramo puede ser todo el párrafo)."""
+    return valores if constante == 0 else list(map(add, valores, repeat(constante)))
+
+
+class EstadoCorteOptimo:
+    """
+    Programa dinámico del último corte óptimo de un párrafo, para recalcular solo lo que
+    cambió. costos[j] es el costo mínimo de maquetar las primeras j palabras terminando una
+    línea antes de la palabra j, y previos[j] dónde empieza esa línea (solo para las posiciones
+    que pueden abrir línea: la 0 y las palabras con texto). 'ultima' es el comienzo de la última línea.
+    """
+    __slots__ = ("palabras", "ancho", "acumulados", "costos", "previos", "ultima")
+
+    def __init__(self, palabras: List['Palabra'], ancho: int, acumulados: List[int],
+                 costos: List[int], previos: List[int], ultima: int):
+        self.palabras = palabras
+        self.ancho = ancho
+        self.acumulados = acumulados
+        self.costos = costos
+        self.previos = previos
+        self.ultima = ultima
+
+
+class IStrategyCorte(ABC):
+    """
+    ROL: Strategy (Interfaz).
+    RESPONSABILIDAD: Decidir dónde se corta cada línea de un párrafo (qué palabras van juntas),
+                     sin cortar palabras.
+    ÍTEM DE CAMBIO OCULTO: El criterio de corte (primer ajuste, mínima irregularidad, ...).
+    SINGLETON: Igual que las alineaciones, cada clase concreta tiene una única instancia;
+               el estado de un corte incremental lo guarda el párrafo.
+    """
+    __slots__ = ()
+    _instancias: Dict[type, "IStrategyCorte"] = {}
+    # True si el corte de una línea depende solo de las palabras previas de esa línea: el
+    # párrafo puede reflujar desde la línea sucia y detenerse en un corte que coincide
+    local = True
+
+    def __new__(cls):
+        instancia = IStrategyCorte._instancias.get(cls)
+        if instancia is None:
+            instancia = super().__new__(cls)
+            IStrategyCorte._instancias[cls] = instancia
+        return instancia
+
+    @abstractmethod
+    def cortes(self, textos: List[str], ancho: int) -> List[int]:
+        """Cantidad de palabras de cada línea (la suma es len(textos); [0] si no hay palabras)."""
+
+    def recortar(self, palabras: List['Palabra'], ancho: int, estado: Optional[EstadoCorteOptimo],
+                 desde: Optional[int] = None, hasta: Optional[int] = None
+                 ) -> Tuple[List[int], Optional[EstadoCorteOptimo]]:
+        """
+        Cortes de las palabras de un párrafo cuyo texto solo cambió en palabras[desde:hasta]
+        respecto del último corte (el que dejó 'estado'). Retorna los cortes y el estado para
+        el próximo llamado. Por defecto se recalcula todo.
+        """
+        return self.cortes([p.texto for p in palabras], ancho), None
+
+
+class CortePrimerAjuste(IStrategyCorte):
+    """
+    ROL: Concrete Strategy.
+    RESPONSABILIDAD: Cada línea toma todas las palabras que entran (greedy). Es el corte por
+                     defecto y el que Parrafo aplica de forma incremental en _reflow_desde.
+    ÍTEM DE CAMBIO OCULTO: El algoritmo de primer ajuste.
+    """
+    def cortes(self, textos: List[str], ancho: int) -> List[int]:
+        return cortes_primer_ajuste(textos, ancho)
+
+
+class CorteOptimo(IStrategyCorte):
+    """
+    ROL: Concrete Strategy.
+    RESPONSABILIDAD: Cortes de mínima irregularidad (al estilo de Knuth-Plass): minimiza la
+                     suma de los cuadrados del espacio libre de cada línea, salvo la última.
+                     Con la alineación justificada reparte el espacio de forma pareja en vez
+                     de dejar que el divmod de una línea absorba toda la holgura.
+    ÍTEM DE CAMBIO OCULTO: El programa dinámico y su reutilización entre reflows.
+
+    El costo de una línea es una función convexa de la diferencia de anchos acumulados, así
+    que los mejores comienzos de línea son monótonos: una cola de candidatos (donde cada uno
+    es el mejor a partir de cierta posición) da O(n log w), con w las palabras por línea.
+    Una palabra más larga que el ancho queda sola en su línea (el exceso se penaliza).
+
+    Incremental: los costos de las posiciones anteriores a la primera palabra cambiada siguen
+    valiendo, y después del cambio el programa se detiene en cuanto sus costos difieren de los
+    anteriores en una constante a lo largo de más de una línea: desde ahí los cortes previos
+    siguen siendo óptimos. Una tecla cuesta entonces O(palabras afectadas), no O(párrafo).
+    """
+    local = False
+
+    def cortes(self, textos: List[str], ancho: int) -> List[int]:
+        return self._completo([len(t) for t in textos], ancho)[0]
+
+    def recortar(self, palabras: List['Palabra'], ancho: int, estado: Optional[EstadoCorteOptimo],
+                 desde: Optional[int] = None, hasta: Optional[int] = None
+                 ) -> Tuple[List[int], Optional[EstadoCorteOptimo]]:
+        n = len(palabras)
+        viejas = None if estado is None else estado.palabras
+        if (viejas is None or desde is None or hasta is None or estado.ancho != ancho
+                or not 0 <= desde <= hasta <= n or len(viejas) - (n - hasta) < desde
+                or (desde > 0 and viejas[desde - 1] is not palabras[desde - 1])
+                or (hasta < n and viejas[hasta - n] is not palabras[hasta])):
+            cortes, acumulados, costos, previos, ultima = self._completo([p.longitud() for p in palabras], ancho)
+            return cortes, EstadoCorteOptimo(palabras, ancho, acumulados, costos, previos, ultima)
+
+        # Posiciones >= hasta: las mismas palabras que antes en posición - delta
+        delta = n - len(viejas)
+        acumulados = _acumular(estado.acumulados[:desde + 1],
+                               [p.longitud() for p in palabras[desde:hasta]])
+        corrimiento = acumulados[hasta] - estado.acumulados[hasta - delta]
+        acumulados.extend(_sumar(estado.acumulados[hasta - delta + 1:], corrimiento))
+
+        costos = estado.costos[:desde] + [0] * (n - desde)
+        previos = estado.previos[:desde] + [0] * (n - desde)
+        # Candidatos anteriores al cambio: desde el primero que ya no entra en una línea
+        # hasta la anterior a 'desde' (los anteriores a él nunca pueden ganar)
+        candidatos = [0] if desde == 0 else []
+        for i in range(desde - 1, -1, -1):
+            if i == 0 or acumulados[i + 1] > acumulados[i]:
+                candidatos.append(i)
+                if acumulados[desde] - acumulados[i] - 1 > ancho and acumulados[i] > 0:
+                    break
+        candidatos.reverse()
+        convergencia = self._programar(acumulados, ancho, costos, previos, max(desde, 1), candidatos,
+                                       estado, hasta, delta)
+        if convergencia is None:
+            ultima = self._ultima(acumulados, ancho, costos)
+        else:
+            j, constante = convergencia
+            costos[j + 1:] = _sumar(estado.costos[j + 1 - delta:], constante)
+            previos[j + 1:] = _sumar(estado.previos[j + 1 - delta:], delta)
+            ultima = estado.ultima + delta
+        return (_lineas(previos, ultima, n),
+                EstadoCorteOptimo(palabras, ancho, acumulados, costos, previos, ultima))
+
+    def _completo(self, largos: List[int], ancho: int) -> Tuple[List[int], List[int], List[int], List[int], int]:
+        """Programa completo: (cortes, acumulados, costos, previos, comienzo de la última línea)."""
+        acumulados = _acumular([0], largos)
+        n = len(largos)
+        costos, previos = [0] * n, [0] * n
+        self._programar(acumulados, ancho, costos, previos, 1, [0])
+        ultima = self._ultima(acumulados, ancho, costos)
+        return _lineas(previos, ultima, n), acumulados, costos, previos, ultima
+
+    @staticmethod
+    def _programar(acumulados: List[int], ancho: int, costos: List[int], previos: List[int],
+                   inicio: int, candidatos: List[int], estado: Optional[EstadoCorteOptimo] = None,
+                   hasta: int = 0, delta: int = 0) -> Optional[Tuple[int, int]]:
+        """
+        Completa costos[j] y previos[j] para j >= inicio (costos de 'candidatos' ya calculados).
+        Con 'estado', a partir de 'hasta' compara con los costos anteriores: retorna (j, constante)
+        si convergió en j (las posiciones posteriores son las viejas más la constante) o None.
+        """
+        n = len(costos)
+        if n == 0:
+            return None
+        limite = n - 1 # La última línea no tiene costo: se elige aparte (ver _ultima)
+        holgura_maxima = ancho + 1 # Holgura de una línea vacía más el espacio que se descuenta
+
+        # Cola monótona: cola[k] es el mejor comienzo de línea para j en [desde_cola[k], desde_cola[k+1])
+        cola: List[int] = []
+        desde_cola: List[int] = []
+        frente = 0
+
+        def agregar(c: int):
+            """
+            Suma el candidato c (posterior a todos los de la cola). Mientras el último de la
+            cola entra en la línea, la diferencia de costos es lineal en acumulados[j]: c gana
+            desde un umbral que se calcula directo; cuando el último ya no entra, c gana seguro.
+            """
+            ancho_c, costo_c = acumulados[c], costos[c]
+            while len(cola) > frente:
+                ultimo = cola[-1]
+                diferencia = ancho_c - acumulados[ultimo]
+                if diferencia == 0:
+                    # Entre ambos solo hay palabras vacías: el que cuesta menos gana siempre
+                    if costo_c > costos[ultimo]:
+                        return
+                    cola.pop()
+                    desde_cola.pop()
+                    continue
+                numerador = (costo_c - costos[ultimo]
+                             + diferencia * (2 * holgura_maxima + ancho_c + acumulados[ultimo]))
+                umbral = -(-numerador // (2 * diferencia)) # Techo de la división
+                excedido = acumulados[ultimo] + holgura_maxima + 1 # Desde ahí el último no entra
+                if excedido < umbral:
+                    umbral = excedido
+                x = desde_cola[-1] if desde_cola[-1] > c else c + 1
+                if x <= limite and acumulados[x] >= umbral:
+                    cola.pop() # c le gana desde donde empieza a ser el mejor: no sirve más
+                    desde_cola.pop()
+                    continue
+                j = bisect_left(acumulados, umbral, x + 1, limite + 1)
+                if j <= limite:
+                    cola.append(c)
+                    desde_cola.append(j)
+                return
+            cola.append(c)
+            desde_cola.append(c + 1)
+
+        for c in candidatos:
+            agregar(c)
+        viejos = estado.costos if estado is not None else None
+        corrida = -1
+        constante = 0
+        for j in range(inicio, n):
+            ancho_j = acumulados[j]
+            if acumulados[j + 1] == ancho_j:
+                continue # Palabra vacía: no abre línea
+            while frente + 1 < len(cola) and desde_cola[frente + 1] <= j:
+                frente += 1
+            mejor = cola[frente]
+            holgura = holgura_maxima - ancho_j + acumulados[mejor]
+            if holgura > ancho:
+                holgura = ancho # Línea con solo palabras vacías
+            if holgura >= 0:
+                costos[j] = costos[mejor] + holgura * holgura
+            else:
+                costos[j] = costos[mejor] + holgura * holgura - holgura * _EXCESO
+            previos[j] = mejor
+            if viejos is not None and j >= hasta:
+                diferencia = costos[j] - viejos[j - delta]
+                if corrida < 0 or diferencia != constante:
+                    corrida, constante = j, diferencia
+                elif ancho_j - acumulados[corrida] - 1 > ancho and acumulados[corrida] > 0:
+                    # Toda línea que termine después de j empieza en la corrida o la supera
+                    return j, constante
+            agregar(j)
+        return None
+
+    @staticmethod
+    def _ultima(acumulados: List[int], ancho: int, costos: List[int]) -> int:
+        """Comienzo de la última línea: la que no paga espacio libre."""
+        n = len(costos)
+        if n == 0:
+            return 0
+        mejor, mejor_costo = 0, None
+        for i in range(n - 1, -1, -1):
+            if i and acumulados[i + 1] == acumulados[i]:
+                continue
+            exceso = acumulados[n] - acumulados[i] - 1 - ancho
+            total = costos[i] + (exceso * exceso + exceso * _EXCESO if exceso > 0 else 0)
+            if mejor_costo is None or total < mejor_costo:
+                mejor, mejor_costo = i, total
+            if exceso > 0 and acumulados[i] > 0:
+                break # Los comienzos anteriores son peores (salvo solo vacías antes de i)
+        return mejor
+
+
+def _lineas(previos: List[int], ultima: int, n: int) -> List[int]:
+    """Cantidad de palabras por línea siguiendo los comienzos de línea desde el final."""
+    if n == 0:
+        return [0]
+    comienzos = [n]
+    k = ultima
+    while k > 0:
+        comienzos.append(k)
+        k = previos[k]
+    comienzos.append(0)
+    comienzos.reverse()
+    return [comienzos[i + 1] - comienzos[i] for i in range(len(comienzos) - 1)]
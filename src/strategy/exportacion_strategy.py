@@ -0,0 +1,174 @@
+import html
+import re
+from abc import ABC, abstractmethod
+from itertools import groupby
+from typing import Dict, Iterator, List, Tuple, TYPE_CHECKING
+from src.render.cache_lineas import CACHE_RENDER
+from src.strategy.alineacion_strategy import (
+    IStrategyAlineacion,
+    AlineacionIzquierda,
+    AlineacionDerecha,
+    AlineacionCentrada,
+    AlineacionJustificada
+)
+
+if TYPE_CHECKING:
+    from src.composite.linea import Linea
+
+
+def tramos_por_alineacion(lineas: List['Linea']) -> Iterator[Tuple[IStrategyAlineacion, List[str]]]:
+    """
+    Líneas consecutivas con la misma alineación: (estrategia, texto de cada línea con sus
+    palabras separadas por un espacio). Las líneas sin texto (la del cursor) se omiten.
+    """
+    for alineacion, grupo in groupby(lineas, key=lambda linea: linea.alineacion):
+        textos = [" ".join(p.texto for p in linea.hijos if p.texto) for linea in grupo]
+        textos = [texto for texto in textos if texto]
+        if textos:
+            yield alineacion, textos
+
+
+class IStrategyExportacion(ABC):
+    """
+    ROL: Strategy (Interfaz).
+    RESPONSABILIDAD: Traducir el recorrido del documento (páginas, tramos de párrafo dentro
+                     de cada página y sus líneas) a un formato de salida, de a un tramo por vez:
+                     nunca recibe ni arma el documento entero.
+    ÍTEM DE CAMBIO OCULTO: El formato de salida y cómo representa cada IStrategyAlineacion.
+    SINGLETON: Igual que las alineaciones, cada clase concreta tiene una única instancia.
+    """
+    __slots__ = ()
+    _instancias: Dict[type, "IStrategyExportacion"] = {}
+    extension = ".txt"
+
+    def __new__(cls):
+        instancia = IStrategyExportacion._instancias.get(cls)
+        if instancia is None:
+            instancia = super().__new__(cls)
+            IStrategyExportacion._instancias[cls] = instancia
+        return instancia
+
+    def inicio(self, titulo: str) -> str:
+        return ""
+
+    @abstractmethod
+    def inicio_pagina(self, num_pagina: int) -> str:
+        pass
+
+    @abstractmethod
+    def segmento(self, num_segmento: int, lineas: List['Linea']) -> str:
+        """Un tramo de párrafo (a lo sumo una página de líneas); num_segmento es su posición en la página."""
+
+    def fin_pagina(self, num_pagina: int) -> str:
+        return ""
+
+    def fin(self) -> str:
+        return ""
+
+
+class ExportacionTexto(IStrategyExportacion):
+    """
+    ROL: Concrete Strategy.
+    RESPONSABILIDAD: Texto plano paginado, idéntico a Documento.mostrar(): cada línea con el
+                     render de su propia estrategia de alineación (relleno con espacios).
+    ÍTEM DE CAMBIO OCULTO: El encabezado de página y los separadores entre párrafos.
+    """
+    extension = ".txt"
+
+    def inicio_pagina(self, num_pagina: int) -> str:
+        separador = "=" * 40
+        prefijo = "\n\n" if num_pagina > 0 else ""
+        return f"{prefijo}{separador}\n📄 Página {num_pagina + 1}\n{separador}\n"
+
+    def segmento(self, num_segmento: int, lineas: List['Linea']) -> str:
+        texto = "".join(CACHE_RENDER.render_de_paso(linea) for linea in lineas)
+        return "\n\n" + texto if num_segmento > 0 else texto
+
+
+# Caracteres con significado en línea para Markdown y marcas que solo cuentan al inicio de una línea
+_MARKDOWN_EN_LINEA = re.compile(r"([\\`*_\[\]<>|~])")
+_MARKDOWN_INICIO = re.compile(r"^(\s*)([#>+\-=])", re.MULTILINE)
+_MARKDOWN_LISTA = re.compile(r"^(\s*\d+)([.)])", re.MULTILINE)
+
+
+def escapar_markdown(texto: str) -> str:
+    texto = _MARKDOWN_EN_LINEA.sub(r"\\\1", texto)
+    return _MARKDOWN_LISTA.sub(r"\1\\\2", _MARKDOWN_INICIO.sub(r"\1\\\2", texto))
+
+
+class ExportacionMarkdown(IStrategyExportacion):
+    """
+    ROL: Concrete Strategy.
+    RESPONSABILIDAD: Markdown (CommonMark). Las líneas a la izquierda y justificadas forman
+                     párrafos comunes (Markdown no justifica: el visor reparte el texto); las
+                     centradas y a la derecha van en un bloque HTML <p align>, que es la forma
+                     de alinear que aceptan los visores. Cada página se separa con una regla.
+    ÍTEM DE CAMBIO OCULTO: El escapado de Markdown y la construcción para cada alineación.
+    """
+    extension = ".md"
+    _BLOQUES_HTML: Dict[type, str] = {AlineacionCentrada: "center", AlineacionDerecha: "right"}
+
+    def inicio(self, titulo: str) -> str:
+        return f"# {escapar_markdown(titulo)}\n\n" if titulo else ""
+
+    def inicio_pagina(self, num_pagina: int) -> str:
+        regla = "---\n\n" if num_pagina > 0 else ""
+        return f"{regla}<!-- Página {num_pagina + 1} -->\n\n"
+
+    def segmento(self, num_segmento: int, lineas: List['Linea']) -> str:
+        partes: List[str] = []
+        for alineacion, textos in tramos_por_alineacion(lineas):
+            bloque = self._BLOQUES_HTML.get(type(alineacion))
+            if bloque is None:
+                # Un salto de línea dentro de una palabra es un salto forzado ("\" al final)
+                partes.append("\n".join(escapar_markdown(t).replace("\n", "\\\n") for t in textos))
+            else:
+                contenido = "<br>\n".join(html.escape(t).replace("\n", "<br>\n") for t in textos)
+                partes.append(f'<p align="{bloque}">\n{contenido}\n</p>')
+        return "".join(parte + "\n\n" for parte in partes)
+
+
+class ExportacionHtml(IStrategyExportacion):
+    """
+    ROL: Concrete Strategy.
+    RESPONSABILIDAD: Documento HTML con una <section> por página (se imprime una por hoja) y
+                     un <p> con text-align para cada tramo de líneas con la misma alineación.
+                     Las líneas del editor no fuerzan saltos: el navegador reparte el texto
+                     (así se puede justificar); un salto dentro de una palabra es un <br>.
+    ÍTEM DE CAMBIO OCULTO: El marcado y el estilo de la página.
+    """
+    extension = ".html"
+    _TEXT_ALIGN: Dict[type, str] = {
+        AlineacionIzquierda: "left", AlineacionDerecha: "right",
+        AlineacionCentrada: "center", AlineacionJustificada: "justify"
+    }
+    _ESTILO = (".pagina { break-after: page; margin-bottom: 2em; }\n"
+               ".numero-pagina { color: #888; font-size: 0.8em; border-bottom: 1px solid #ccc; }\n")
+
+    def inicio(self, titulo: str) -> str:
+        return (f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+                f"<title>{html.escape(titulo)}</title>\n<style>\n{self._ESTILO}</style>\n</head>\n<body>\n")
+
+    def inicio_pagina(self, num_pagina: int) -> str:
+        return (f'<section class="pagina" id="pagina-{num_pagina + 1}">\n'
+                f'<div class="numero-pagina">Página {num_pagina + 1}</div>\n')
+
+    def segmento(self, num_segmento: int, lineas: List['Linea']) -> str:
+        partes: List[str] = []
+        for alineacion, textos in tramos_por_alineacion(lineas):
+            alinear = self._TEXT_ALIGN.get(type(alineacion), "left")
+            contenido = "\n".join(html.escape(t).replace("\n", "<br>\n") for t in textos)
+            partes.append(f'<p style="text-align: {alinear}">{contenido}</p>\n')
+        return "".join(partes)
+
+    def fin_pagina(self, num_pagina: int) -> str:
+        return "</section>\n"
+
+    def fin(self) -> str:
+        return "</body>\n</html>\n"
+
+
+# Formatos de exportación por nombre (para la línea de comandos y el editor)
+FORMATOS_EXPORTACION: Dict[str, IStrategyExportacion] = {
+    "texto": ExportacionTexto(), "markdown": ExportacionMarkdown(), "html": ExportacionHtml()
+}
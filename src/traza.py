@@ -0,0 +1,81 @@
+import json
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, TextIO, Tuple
+
+# Un evento de la traza: (segundos desde el inicio de la grabación, tipo, dato), con los
+# mismos tipos de acción que produce traducir_tecla ("texto", "borrar", "deshacer", ...)
+EventoTraza = Tuple[float, str, str]
+
+FORMATO_TRAZA = "traza-teclado"
+VERSION_TRAZA = 1
+
+
+def _encabezado() -> str:
+    return json.dumps({"formato": FORMATO_TRAZA, "version": VERSION_TRAZA}) + "\n"
+
+
+def _linea_evento(instante: float, tipo: str, dato: str) -> str:
+    return json.dumps({"t": round(instante, 6), "tipo": tipo, "dato": dato}, ensure_ascii=False) + "\n"
+
+
+def escribir_traza(ruta: str, eventos: Iterable[EventoTraza]) -> int:
+    """Escribe una traza completa (JSON Lines: un encabezado y un evento por línea). Retorna los eventos."""
+    cantidad = 0
+    with open(ruta, "w", encoding="utf-8") as salida:
+        salida.write(_encabezado())
+        for instante, tipo, dato in eventos:
+            salida.write(_linea_evento(instante, tipo, dato))
+            cantidad += 1
+    return cantidad
+
+
+def leer_traza(ruta: str) -> List[EventoTraza]:
+    """Lee una traza grabada o generada. Las líneas que no son eventos (encabezado) se omiten."""
+    eventos: List[EventoTraza] = []
+    with open(ruta, encoding="utf-8") as entrada:
+        for linea in entrada:
+            if not linea.strip():
+                continue
+            registro = json.loads(linea)
+            if "tipo" not in registro:
+                if registro.get("formato") != FORMATO_TRAZA:
+                    raise ValueError(f"{ruta} no es una traza de teclado")
+                continue
+            eventos.append((float(registro["t"]), registro["tipo"], registro.get("dato", "")))
+    return eventos
+
+
+class GrabadorTraza:
+    """
+    Graba las acciones de entrada con el instante en que se pulsaron.
+    Patrón de Diseño: Observer del hook de teclado (recibe cada acción antes de encolarla).
+    Ítem de Cambio Oculto: Formato y destino de la traza.
+
+    Cada acción se escribe apenas llega (con búfer de línea), así que una sesión que
+    termina mal deja igual una traza utilizable hasta la última tecla.
+    registrar() corre en el hilo del hook de teclado y cerrar() en el bucle principal: un
+    candado serializa ambos, y tras cerrar() las acciones que lleguen se ignoran.
+    """
+    def __init__(self, ruta: str, reloj: Callable[[], float] = time.perf_counter):
+        self.ruta = ruta
+        self._reloj = reloj
+        self._inicio = reloj()
+        self._archivo: Optional[TextIO] = open(ruta, "w", encoding="utf-8", buffering=1)
+        self._archivo.write(_encabezado())
+        self._candado = threading.Lock()
+        self.eventos = 0
+
+    def registrar(self, accion: Tuple[str, str]) -> None:
+        tipo, dato = accion
+        with self._candado:
+            if self._archivo is None:
+                return
+            self._archivo.write(_linea_evento(self._reloj() - self._inicio, tipo, dato))
+            self.eventos += 1
+
+    def cerrar(self) -> None:
+        with self._candado:
+            if self._archivo is not None:
+                self._archivo.close()
+                self._archivo = None